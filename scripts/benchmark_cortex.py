@@ -36,6 +36,7 @@ import synapse.telepath as s_telepath
 import synapse.lib.base as s_base
 import synapse.lib.json as s_json
 import synapse.lib.time as s_time
+import synapse.lib.logging as s_logging
 import synapse.lib.lmdbslab as s_lmdbslab
 
 import synapse.tests.utils as s_t_utils
@@ -50,6 +51,9 @@ DefaultConf = {**MapAsyncConf, 'layers:lockmemory': True}
 DefaultNoBuidConf = {**MapAsyncConf, 'layers:lockmemory': True, 'buid:prefetch': False}
 DedicatedAsyncLogConf = {**DefaultConf, 'nexslog:en': True, 'layers:logedits': True}
 
+# The number of forked views stacked on top of the benchmark layer for the *Forked benchmarks
+ForkDepth = 8
+
 Configs: Dict[str, Dict] = {
     'simple': SimpleConf,
     'mapasync': MapAsyncConf,
@@ -70,7 +74,7 @@ logger = logging.getLogger(__name__)
 if __debug__:
     logger.warning('Running benchmark without -O.  Performance will be slower.')
 
-s_common.setlogging(logger, 'ERROR')
+s_logging.setup(level=logging.ERROR)
 
 async def acount(genr):
     '''
@@ -313,10 +317,29 @@ class Benchmarker:
 
             await prox.dyncall(layeriden, s_common.todo('waitForHot'))
 
+            # a stack of forks on top of the data layer which each tag the inet:ipv4 nodes
+            # to measure the per-layer storage node overhead of lifts
+            forks = []
+            forkiden = self.viewiden
+            for depth in range(ForkDepth):
+                forkiden = await prox.callStorm('return($lib.view.get($view).fork().iden)',
+                                                opts={'vars': {'view': forkiden}})
+                await prox.callStorm('inet:ipv4 [ +#fork.$depth ]', opts={'view': forkiden, 'vars': {'depth': depth}})
+                forks.append(forkiden)
+            self.forkopts = {'view': forkiden}
+
             try:
                 yield core, prox
 
             finally:
+                for forkiden in reversed(forks):
+                    await prox.callStorm('''
+                        $view = $lib.view.get($fork)
+                        $layr = $view.layers.0.iden
+                        $lib.view.del($fork)
+                        $lib.layer.del($layr)
+                    ''', opts={'vars': {'fork': forkiden}})
+
                 await prox.callStorm('''
                     $lib.view.del($view)
                     $lib.layer.del($layer)
@@ -350,6 +373,18 @@ class Benchmarker:
         assert count == self.workfactor
         return count
 
+    @benchmark({'official', 'remote'})
+    async def do02LiftSimpleForked(self, core: s_cortex.Cortex, prox: s_telepath.Proxy) -> int:
+        count = await acountPodes(prox.storm('inet:ipv4', opts=self.forkopts))
+        assert count == self.workfactor
+        return count
+
+    @benchmark({'official', 'remote'})
+    async def do02LiftByTagForked(self, core: s_cortex.Cortex, prox: s_telepath.Proxy) -> int:
+        count = await acountPodes(prox.storm('inet:ipv4#even', opts=self.forkopts))
+        assert count == self.workfactor // 2
+        return count
+
     @benchmark({'official', 'remote'})
     async def do02LiftFilterAbsent(self, core: s_cortex.Cortex, prox: s_telepath.Proxy) -> int:
         count = await acountPodes(prox.storm('inet:ipv4 | +#newp', opts=self.opts))
@@ -0,0 +1,129 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+
+import synapse.common as s_common
+import synapse.cortex as s_cortex
+
+import synapse.lib.layer as s_layer
+import synapse.lib.logging as s_logging
+
+'''
+Benchmark geo:latlong near= lifts using the z-order geo index vs the longitude band scan.
+
+Example:
+    python -O scripts/benchmark_geo.py --count 2000000
+'''
+
+logger = logging.getLogger(__name__)
+if __debug__:
+    logger.warning('Running benchmark without -O.  Performance will be slower.')
+
+s_logging.setup(level=logging.ERROR)
+
+Conf = {'layers:lockmemory': False, 'layer:lmdb:map_async': True, 'nexslog:en': False, 'layers:logedits': False}
+
+# radii in geo:dist base units (mm)
+Dists = (
+    ('1km', 1_000_000),
+    ('10km', 10_000_000),
+    ('100km', 100_000_000),
+    ('1000km', 1_000_000_000),
+)
+
+async def addPoints(layr, count, rand, chunksize=10_000):
+
+    meta = {'time': s_common.now(), 'user': layr.core.auth.rootuser.iden}
+
+    done = 0
+    while done < count:
+
+        edits = []
+        for _ in range(min(chunksize, count - done)):
+            guid = s_common.guid()
+            buid = s_common.buid(('geo:place', guid))
+            latlong = (rand.uniform(-90, 90), rand.uniform(-180, 180))
+            edits.append((buid, 'geo:place', (
+                (s_layer.EDIT_NODE_ADD, (guid, s_layer.STOR_TYPE_GUID), ()),
+                (s_layer.EDIT_PROP_SET, ('latlong', latlong, None, s_layer.STOR_TYPE_LATLONG), ()),
+            )))
+
+        await layr.storNodeEditsNoLift(edits, meta)
+        done += len(edits)
+
+async def timeLift(func, indxby, valu, reps):
+
+    count = 0
+    tick = time.perf_counter()
+    for _ in range(reps):
+        count = 0
+        async for _ in func(indxby, valu):
+            count += 1
+
+    return count, (time.perf_counter() - tick) / reps
+
+async def benchmark(opts):
+
+    rand = random.Random(opts.seed)
+
+    with tempfile.TemporaryDirectory() as dirn:
+
+        async with await s_cortex.Cortex.anit(dirn, conf=Conf) as core:
+
+            layr = core.getLayer()
+            stor = layr.stortypes[s_layer.STOR_TYPE_LATLONG]
+
+            print(f'Adding {opts.count} random geo:place:latlong values...')
+            tick = time.perf_counter()
+            await addPoints(layr, opts.count, rand)
+            await layr._saveDirtySodes()
+            print(f'    took {time.perf_counter() - tick:.1f}s')
+
+            indxby = s_layer.IndxByProp(layr, 'geo:place', 'latlong')
+
+            # the band scan does not support boxes which wrap around the antimeridian
+            centers = [(rand.uniform(-60, 60), rand.uniform(-160, 160)) for _ in range(opts.queries)]
+
+            print(f'{"radius":>8} {"avg hits":>10} {"band scan":>12} {"geo index":>12} {"speedup":>8}')
+            for name, dist in Dists:
+
+                hits = 0
+                scantime = 0.0
+                indxtime = 0.0
+
+                for center in centers:
+
+                    valu = (center, dist)
+
+                    scancount, took = await timeLift(stor._liftLatLonNearScan, indxby, valu, opts.reps)
+                    scantime += took
+
+                    indxcount, took = await timeLift(stor._liftLatLonNear, indxby, valu, opts.reps)
+                    indxtime += took
+
+                    if scancount != indxcount:  # pragma: no cover
+                        print(f'MISMATCH at {center} {name}: scan={scancount} indx={indxcount}')
+
+                    hits += indxcount
+
+                queries = len(centers)
+                scanms = scantime / queries * 1000
+                indxms = indxtime / queries * 1000
+
+                print(f'{name:>8} {hits / queries:>10.1f} {scanms:>10.2f}ms {indxms:>10.2f}ms {scanms / indxms:>7.1f}x')
+
+def getParser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=2_000_000, help='The number of random points to add.')
+    parser.add_argument('--queries', type=int, default=20, help='The number of random search centers.')
+    parser.add_argument('--reps', type=int, default=3, help='The number of times to repeat each lift.')
+    parser.add_argument('--seed', type=int, default=4)
+    return parser
+
+if __name__ == '__main__':
+    opts = getParser().parse_args()
+    sys.exit(asyncio.run(benchmark(opts)))
@@ -0,0 +1,119 @@
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+import synapse.common as s_common
+
+import synapse.lib.link as s_link
+import synapse.lib.const as s_const
+import synapse.lib.logging as s_logging
+
+'''
+Microbenchmark the Link send and receive path over a loopback connection.
+
+Example:
+    python -O scripts/benchmark_link.py --mebibytes 512
+'''
+
+logger = logging.getLogger(__name__)
+if __debug__:
+    logger.warning('Running benchmark without -O.  Performance will be slower.')
+
+s_logging.setup(level=logging.ERROR)
+
+def getMesgs():
+
+    # a node edit shaped message similar to those sent by syncNodeEdits()
+    edit = ('t2:yield', {'retn': (True, (
+        (s_common.buid(), 'inet:ipv4', (
+            (0, (0x01020304, 4), ()),
+            (2, ('asn', 1234, None, 9), ()),
+            (20, ('rep.vtx', (None, None), None), ()),
+        )),
+    ))})
+
+    return (
+        ('node edit', edit),
+        ('4 KiB', ('t2:yield', {'retn': (True, b'V' * 4 * s_const.kibibyte)})),
+        ('1 MiB', ('t2:yield', {'retn': (True, b'V' * s_const.mebibyte)})),
+        ('16 MiB', ('t2:yield', {'retn': (True, b'V' * 16 * s_const.mebibyte)})),
+    )
+
+async def getLinks(unix):
+
+    if unix:
+        link0, sock1 = await s_link.linksock()
+        reader, writer = await asyncio.open_connection(sock=sock1)
+        link1 = await s_link.Link.anit(reader, writer, info={'unix': True})
+        return link0, link1
+
+    links = asyncio.Queue()
+
+    async def onlink(link):
+        await links.put(link)
+
+    serv = await s_link.listen('127.0.0.1', 0, onlink)
+    host, port = serv.sockets[0].getsockname()
+
+    link0 = await s_link.connect(host, port)
+    link1 = await links.get()
+    link1.onfini(serv.close)
+
+    return link0, link1
+
+async def runStream(link0, link1, mesg, count):
+
+    async def sender():
+        for _ in range(count):
+            await link0.tx(mesg)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+
+    task = asyncio.create_task(sender())
+
+    for _ in range(count):
+        await link1.rx()
+
+    await task
+
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+async def benchmark(opts):
+
+    print(f'{"transport":>10} {"message":>10} {"count":>8} {"mesg/s":>10} {"MiB/s":>8} {"cpu us/mesg":>12}')
+
+    for unix in (True, False):
+
+        link0, link1 = await getLinks(unix)
+
+        try:
+
+            for name, mesg in getMesgs():
+
+                size = len(await link0.pack(mesg))
+                count = max(10, opts.mebibytes * s_const.mebibyte // size)
+
+                # warm up the buffers before measuring
+                await runStream(link0, link1, mesg, min(count, 1000))
+
+                wall, cpu = await runStream(link0, link1, mesg, count)
+
+                transport = 'unix' if unix else 'tcp'
+                print(f'{transport:>10} {name:>10} {count:>8} {count / wall:>10.0f} '
+                      f'{count * size / s_const.mebibyte / wall:>8.1f} {cpu / count * 1_000_000:>12.2f}')
+
+        finally:
+            await link0.fini()
+            await link1.fini()
+
+def getParser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mebibytes', type=int, default=256, help='The number of MiB to send for each message size.')
+    return parser
+
+if __name__ == '__main__':
+    opts = getParser().parse_args()
+    sys.exit(asyncio.run(benchmark(opts)))
@@ -0,0 +1,131 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import argparse
+
+import synapse.common as s_common
+import synapse.daemon as s_daemon
+import synapse.telepath as s_telepath
+
+import synapse.lib.link as s_link
+import synapse.lib.layer as s_layer
+import synapse.lib.logging as s_logging
+
+'''
+Benchmark streaming node edits over telepath with and without zlib compression.
+
+Example:
+    python -O scripts/benchmark_telepath_compress.py --count 200000
+'''
+
+logger = logging.getLogger(__name__)
+if __debug__:
+    logger.warning('Running benchmark without -O.  Performance will be slower.')
+
+s_logging.setup(level=logging.ERROR)
+
+def genNodeEdits(count, rand):
+
+    tags = [f'rep.vtx.{i}' for i in range(10)]
+    meta = {'time': s_common.now(), 'user': s_common.guid()}
+
+    for offs in range(count):
+
+        ipv4 = rand.randrange(0xffffffff)
+        buid = s_common.buid(('inet:ipv4', ipv4))
+        tag = rand.choice(tags)
+
+        edits = (
+            (s_layer.EDIT_NODE_ADD, (ipv4, s_layer.STOR_TYPE_U32), ()),
+            (s_layer.EDIT_PROP_SET, ('asn', rand.randrange(65535), None, s_layer.STOR_TYPE_I64), ()),
+            (s_layer.EDIT_PROP_SET, ('loc', 'us.va', None, s_layer.STOR_TYPE_LOC), ()),
+            (s_layer.EDIT_PROP_SET, ('.seen', (1600000000000, 1700000000000), None, s_layer.STOR_TYPE_IVAL), ()),
+            (s_layer.EDIT_TAG_SET, (tag, (None, None), None), ()),
+        )
+
+        yield (offs, ((buid, 'inet:ipv4', edits),), meta)
+
+class EditsApi:
+
+    def __init__(self, edits):
+        self.edits = edits
+
+    async def syncNodeEdits(self):
+        for item in self.edits:
+            yield item
+
+async def runStream(url, count):
+
+    sent = 0
+    osend = s_link.Link._sendLocked
+
+    async def _sendLocked(link, byts):
+        nonlocal sent
+        sent += len(byts)
+        await osend(link, byts)
+
+    s_link.Link._sendLocked = _sendLocked
+
+    try:
+
+        async with await s_telepath.openurl(url) as prox:
+
+            wall = time.perf_counter()
+            cpu = time.process_time()
+
+            recv = 0
+            async for _ in prox.syncNodeEdits():
+                recv += 1
+
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+
+    finally:
+        s_link.Link._sendLocked = osend
+
+    assert recv == count
+    return wall, cpu, sent
+
+async def benchmark(opts):
+
+    rand = random.Random(opts.seed)
+    edits = list(genNodeEdits(opts.count, rand))
+
+    async with await s_daemon.Daemon.anit() as dmon:
+
+        dmon.share('edits', EditsApi(edits))
+        host, port = await dmon.listen('tcp://127.0.0.1:0')
+
+        print(f'Streaming {opts.count} node edits (client and daemon CPU are both measured)...')
+        print(f'{"level":>8} {"wire MiB":>10} {"ratio":>7} {"wall":>8} {"cpu":>8} {"edits/s":>10} {"edits/cpu s":>12}')
+
+        basesize = None
+        for level in [None] + opts.levels:
+
+            url = f'tcp://127.0.0.1:{port}/edits'
+            if level is not None:
+                url += f'?compress={level}&compressmin={opts.minsize}'
+
+            wall, cpu, sent = min([await runStream(url, opts.count) for _ in range(opts.reps)])
+
+            if basesize is None:
+                basesize = sent
+
+            name = 'off' if level is None else str(level)
+            print(f'{name:>8} {sent / 1048576:>10.1f} {basesize / sent:>6.1f}x {wall:>7.2f}s {cpu:>7.2f}s '
+                  f'{opts.count / wall:>10.0f} {opts.count / cpu:>12.0f}')
+
+def getParser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=200_000, help='The number of node edits to stream.')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 6, 9], help='The zlib levels to compare.')
+    parser.add_argument('--minsize', type=int, default=s_link.ZLIB_MINSIZE, help='The minimum frame size to compress.')
+    parser.add_argument('--reps', type=int, default=3, help='The number of times to repeat each stream.')
+    parser.add_argument('--seed', type=int, default=4)
+    return parser
+
+if __name__ == '__main__':
+    opts = getParser().parse_args()
+    sys.exit(asyncio.run(benchmark(opts)))
@@ -1,5 +1,6 @@
 import os
 import copy
+import time
 import regex
 import asyncio
 import logging
@@ -126,6 +127,13 @@ SYNC_LAYR_DEL = 4   # A layer was deleted
 
 MAX_NEXUS_DELTA = 3_600
 
+STORM_POOL_SYNC_FREQ = 1.0  # Seconds between Storm pool member nexus offset checks
+STORM_POOL_LATENCY_ALPHA = 0.2  # Smoothing factor for the Storm pool member latency EWMA
+
+SODE_BATCH_SIZE = 100  # Max number of lift results to fetch storage nodes for at once
+
+STORM_PARSE_CACHE_MAX = 100_000  # Max number of recently used queries to persist
+
 reqValidTagModel = s_config.getJsValidator({
     'type': 'object',
     'properties': {
@@ -172,6 +180,49 @@ async def wrap_liftgenr(iden, genr):
     async for indx, buid, sode in genr:
         yield iden, (indx, buid), sode
 
+class StormPoolMember:
+    '''
+    Tracks the load and nexus offset of a Storm pool member.
+    '''
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.name = proxy._ahainfo.get('name')
+
+        self.offs = None
+        self.active = 0
+        self.latency = None
+        self.synctime = None
+
+    def getLoadKey(self):
+        return (self.active, self.latency or 0.0)
+
+    def setNexsIndx(self, indx, took):
+
+        self.offs = indx - 1
+        self.synctime = time.monotonic()
+
+        if self.latency is None:
+            self.latency = took
+            return
+
+        self.latency += STORM_POOL_LATENCY_ALPHA * (took - self.latency)
+
+    @contextlib.contextmanager
+    def query(self):
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+    def pack(self):
+        return {
+            'name': self.name,
+            'offs': self.offs,
+            'active': self.active,
+            'latency': self.latency,
+        }
+
 class CortexAxonMixin:
 
     async def prepare(self):
@@ -871,6 +922,11 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             'description': 'Default buid cache size for new layers.',
             'type': ['integer', 'null'],
         },
+        'layers:cache:bytes': {
+            'default': None,
+            'description': 'Default estimated maximum size in bytes of the buid cache for new layers.',
+            'type': ['integer', 'null'],
+        },
         'provenance:en': {  # TODO: Remove in 3.0.0
             'default': False,
             'description': 'This no longer does anything.',
@@ -901,6 +957,18 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 'string',
             ],
         },
+        'storm:parse:cache:persist': {
+            'default': False,
+            'description': 'Persist the text of recently used Storm queries so they are parsed in the background to warm the query cache after a restart. '
+                           'NOTE: Any values included in the query text are written to disk.',
+            'type': 'boolean',
+        },
+        'storm:parse:cache:size': {
+            'default': 100,
+            'description': 'The number of parsed Storm queries cached by the process in addition to the per-Cortex query cache.',
+            'type': 'integer',
+            'minimum': 1,
+        },
         'storm:interface:search': {
             'default': True,
             'description': 'Enable Storm search interfaces for lookup mode.',
@@ -980,6 +1048,10 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         self.tagprune = s_cache.FixedCache(self._getTagPrune, size=1000)
 
         self.querycache = s_cache.FixedCache(self._getStormQuery, size=10000)
+        self.evalcache = s_cache.FixedCache(self._initStormEval, size=10000)
+        self.parseslab = None
+
+        s_parser.setCacheSize(self.conf.get('storm:parse:cache:size'))
 
         # $lib.crypto.jwt JWKS caches: jwks_uri -> (expiry_epoch_seconds, jwkset) and
         # jwks_uri -> asyncio.Lock for per-uri single-flight fetching.
@@ -989,6 +1061,7 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         self.stormpool = None
         self.stormpoolurl = None
         self.stormpoolopts = None
+        self.stormpoolmembers = {}
 
         self.libroot = (None, {}, {})
         self.stormlibs = []
@@ -1072,6 +1145,7 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         self.onfini(self.agenda)
 
         await self._initStormGraphs()
+        await self._initStormParseCache()
 
         await self._initRuntFuncs()
 
@@ -1828,6 +1902,9 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             # make this one a fini weakref vs the fini() handler
             self.onfini(self.stormpool)
 
+            # the sync loop is torn down along with the pool client
+            self.stormpool.schedCoro(self._runStormPoolSync(self.stormpool))
+
         except Exception as e:  # pragma: no cover
             logger.exception(f'Error starting stormpool, it will not be available: {e}')
 
@@ -1837,6 +1914,8 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             await self.stormpool.fini()
             self.stormpool = None
 
+        self.stormpoolmembers.clear()
+
     async def getStormPool(self):
         byts = self.slab.get(b'storm:pool', db='cell:conf')
         if byts is None:
@@ -2419,6 +2498,104 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         self.multiqueue = await slab.getMultiQueue('cortex:queue', nexsroot=self.nexsroot)
         self.stormpkgqueue = await slab.getMultiQueue('storm:pkg:queue', nexsroot=self.nexsroot)
 
+    async def _initStormParseCache(self):
+        '''
+        Initialize the on-disk record of recently parsed Storm queries.
+
+        NOTE: Only the query text is persisted. The queries are parsed again
+              in the background to warm the query cache after a restart.
+        '''
+        if not self.conf.get('storm:parse:cache:persist'):
+            return
+
+        path = os.path.join(self.dirn, 'slabs', 'parsecache.lmdb')
+
+        slab = await s_lmdbslab.Slab.anit(path)
+        self.onfini(slab.fini)
+
+        # (text, mode) key -> (indx, text) and indx -> (text, mode) key ordered by last use
+        self.parsedb = slab.initdb('query:text')
+        self.parseused = slab.initdb('query:used')
+        self.parseslab = slab
+
+        self.parsecount = slab.stat(db=self.parsedb).get('entries', 0)
+
+        self.parseindx = 0
+        lkey = slab.lastkey(db=self.parseused)
+        if lkey is not None:
+            self.parseindx = s_common.int64un(lkey) + 1
+
+        self.schedCoro(self._warmStormParseCache())
+
+    def _getStormParseKey(self, args):
+        text, mode = args
+        return s_common.uhex(s_common.queryhash(text)) + mode.encode()
+
+    def _saveStormParse(self, args):
+        '''
+        Record a parsed query as the most recently used and evict the least recently used query once the cache is full.
+        '''
+        if self.parseslab is None or not isinstance(args[0], str):
+            return
+
+        lkey = self._getStormParseKey(args)
+
+        byts = self.parseslab.get(lkey, db=self.parsedb)
+        if byts is not None:
+
+            oldindx = s_msgpack.un(byts)[0]
+            if oldindx == self.parseindx - 1:
+                return
+
+            self.parseslab.delete(s_common.int64en(oldindx), db=self.parseused)
+        else:
+            self.parsecount += 1
+
+        indx = self.parseindx
+        self.parseindx += 1
+
+        self.parseslab.put(lkey, s_msgpack.en((indx, args[0])), db=self.parsedb)
+        self.parseslab.put(s_common.int64en(indx), lkey, db=self.parseused)
+
+        while self.parsecount > STORM_PARSE_CACHE_MAX:
+            ukey = self.parseslab.firstkey(db=self.parseused)
+            self.parseslab.delete(self.parseslab.pop(ukey, db=self.parseused), db=self.parsedb)
+            self.parsecount -= 1
+
+    async def _warmStormParseCache(self):
+        '''
+        Parse the most recently used queries to warm the query cache after a restart.
+        '''
+        lkeys = []
+        for _, lkey in self.parseslab.scanByFullBack(db=self.parseused):
+            if len(lkeys) >= self.querycache.size:
+                break
+            lkeys.append(lkey)
+
+        for lkey in lkeys:
+
+            if self.isfini:
+                return
+
+            byts = self.parseslab.get(lkey, db=self.parsedb)
+            if byts is None:
+                continue
+
+            args = (s_msgpack.un(byts)[1], lkey[16:].decode())
+            if args in self.querycache.cache:
+                continue
+
+            try:
+                query = await s_parser.querycache.aget(args)
+            except asyncio.CancelledError:  # pragma: no cover
+                raise
+            except Exception:  # pragma: no cover
+                logger.warning(f'Unable to parse cached query [{args[0]}]')
+                continue
+
+            query.init(self)
+            self.querycache.put(args, query)
+
     async def _initStormGraphs(self):
         path = os.path.join(self.dirn, 'slabs', 'graphs.lmdb')
 
@@ -2478,15 +2655,29 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         #       the cluster case to minimize round trips
         return [await layr.getStorNode(buid) for layr in layers]
 
-    async def _genSodeList(self, buid, sodes, layers, filtercmpr=None):
+    async def _getStorNodesBatch(self, buids, layers):
+        '''
+        Return a list of per-layer storage node lists for the given buids.
+        '''
+        # NOTE: This API lives here to make it easy to optimize
+        #       the cluster case to minimize round trips
+        layrsodes = [await layr.getStorNodesBatch(buids) for layr in layers]
+        return [list(sodes) for sodes in zip(*layrsodes)]
+
+    async def _genSodeList(self, buid, sodes, layers, filtercmpr=None, newsodes=None):
         sodelist = []
 
+        if newsodes is None:
+            newsodes = {}
+
         if filtercmpr is not None:
             filt = True
             for layr in layers[-1::-1]:
                 sode = sodes.get(layr.iden)
                 if sode is None:
-                    sode = await layr.getStorNode(buid)
+                    sode = newsodes.get(layr.iden)
+                    if sode is None:
+                        sode = await layr.getStorNode(buid)
                     if filt and filtercmpr(sode):
                         return
                 else:
@@ -2498,29 +2689,66 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         for layr in layers:
             sode = sodes.get(layr.iden)
             if sode is None:
-                sode = await layr.getStorNode(buid)
+                sode = newsodes.get(layr.iden)
+                if sode is None:
+                    sode = await layr.getStorNode(buid)
             sodelist.append((layr.iden, sode))
 
         return (buid, sodelist)
 
+    async def _genSodeLists(self, items, layers, filtercmpr=None):
+        '''
+        Yield sode lists for a batch of (buid, sodes) lift results, fetching
+        the storage nodes missing from each layer in a single batch.
+        '''
+        newsodes = [{} for item in items]
+
+        for layr in layers:
+
+            todo = [indx for (indx, (buid, sodes)) in enumerate(items) if layr.iden not in sodes]
+            if not todo:
+                continue
+
+            layrsodes = await layr.getStorNodesBatch([items[indx][0] for indx in todo])
+            for indx, sode in zip(todo, layrsodes):
+                newsodes[indx][layr.iden] = sode
+
+        for (buid, sodes), news in zip(items, newsodes):
+            sodelist = await self._genSodeList(buid, sodes, layers, filtercmpr, newsodes=news)
+            if sodelist is not None:
+                yield sodelist
+
     async def _mergeSodes(self, layers, genrs, cmprkey, filtercmpr=None, reverse=False):
         lastbuid = None
         sodes = {}
+        items = []
         async for layr, (_, buid), sode in s_common.merggenr2(genrs, cmprkey, reverse=reverse):
             if not buid == lastbuid or layr in sodes:
                 if lastbuid is not None:
-                    sodelist = await self._genSodeList(lastbuid, sodes, layers, filtercmpr)
-                    if sodelist is not None:
-                        yield sodelist
-                    sodes.clear()
+                    items.append((lastbuid, sodes))
+                    if len(items) >= SODE_BATCH_SIZE:
+                        async for sodelist in self._genSodeLists(items, layers, filtercmpr):
+                            yield sodelist
+                        items = []
+                    sodes = {}
                 lastbuid = buid
             sodes[layr] = sode
 
         if lastbuid is not None:
-            sodelist = await self._genSodeList(lastbuid, sodes, layers, filtercmpr)
-            if sodelist is not None:
+            items.append((lastbuid, sodes))
+
+        if items:
+            async for sodelist in self._genSodeLists(items, layers, filtercmpr):
                 yield sodelist
 
+    async def _getLiftLayers(self, layers, getcount):
+        '''
+        Return the layers which have index rows for a lift based on their counters.
+
+        NOTE: All layers must still be used to fetch storage nodes for the lifted buids.
+        '''
+        return [layr for layr in layers if await getcount(layr)]
+
     async def _liftByDataName(self, name, layers):
         if len(layers) == 1:
             layr = layers[0].iden
@@ -2543,7 +2771,7 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             return
 
         genrs = []
-        for layr in layers:
+        for layr in await self._getLiftLayers(layers, lambda layr: layr.getPropCount(form, prop)):
             genrs.append(wrap_liftgenr(layr.iden, layr.liftByProp(form, prop, reverse=reverse)))
 
         def filtercmpr(sode):
@@ -2568,9 +2796,11 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 return False
             return props.get(prop) is not None
 
+        liftlayers = await self._getLiftLayers(layers, lambda layr: layr.getPropCount(form, prop))
+
         for cval in cmprvals:
             genrs = []
-            for layr in layers:
+            for layr in liftlayers:
                 genrs.append(wrap_liftgenr(layr.iden, layr.liftByPropValu(form, prop, (cval,), reverse=reverse)))
 
             async for sodes in self._mergeSodes(layers, genrs, cmprkey_indx, filtercmpr, reverse=reverse):
@@ -2592,9 +2822,11 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                     return False
                 return props.get(prop) is not None
 
+        liftlayers = await self._getLiftLayers(layers, lambda layr: layr.getPropArrayCount(form, prop))
+
         for cval in cmprvals:
             genrs = []
-            for layr in layers:
+            for layr in liftlayers:
                 genrs.append(wrap_liftgenr(layr.iden, layr.liftByPropArray(form, prop, (cval,), reverse=reverse)))
 
             async for sodes in self._mergeSodes(layers, genrs, cmprkey_indx, filtercmpr, reverse=reverse):
@@ -2607,9 +2839,11 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 yield (buid, [(layr, sode)])
             return
 
+        liftlayers = await self._getLiftLayers(layers, lambda layr: layr.getPropCount(form))
+
         for cval in cmprvals:
             genrs = []
-            for layr in layers:
+            for layr in liftlayers:
                 genrs.append(wrap_liftgenr(layr.iden, layr.liftByFormValu(form, (cval,), reverse=reverse)))
 
             async for sodes in self._mergeSodes(layers, genrs, cmprkey_indx, reverse=reverse):
@@ -2632,7 +2866,7 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             filtercmpr = None
 
         genrs = []
-        for layr in layers:
+        for layr in await self._getLiftLayers(layers, lambda layr: layr.getTagCount(tag, formname=form)):
             genrs.append(wrap_liftgenr(layr.iden, layr.liftByTag(tag, form, reverse=reverse)))
 
         async for sodes in self._mergeSodes(layers, genrs, cmprkey_buid, filtercmpr, reverse=reverse):
@@ -2652,7 +2886,7 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             return tags.get(tag) is not None
 
         genrs = []
-        for layr in layers:
+        for layr in await self._getLiftLayers(layers, lambda layr: layr.getTagCount(tag, formname=form)):
             genrs.append(wrap_liftgenr(layr.iden, layr.liftByTagValu(tag, cmpr, valu, form, reverse=reverse)))
 
         async for sodes in self._mergeSodes(layers, genrs, cmprkey_buid, filtercmpr, reverse=reverse):
@@ -2666,7 +2900,7 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
             return
 
         genrs = []
-        for layr in layers:
+        for layr in await self._getLiftLayers(layers, lambda layr: layr.getTagPropCount(form, tag, prop)):
             genrs.append(wrap_liftgenr(layr.iden, layr.liftByTagProp(form, tag, prop, reverse=reverse)))
 
         def filtercmpr(sode):
@@ -2697,9 +2931,11 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 return False
             return props.get(prop) is not None
 
+        liftlayers = await self._getLiftLayers(layers, lambda layr: layr.getTagPropCount(form, tag, prop))
+
         for cval in cmprvals:
             genrs = []
-            for layr in layers:
+            for layr in liftlayers:
                 genrs.append(wrap_liftgenr(layr.iden, layr.liftByTagPropValu(form, tag, prop, (cval,), reverse=reverse)))
 
             async for sodes in self._mergeSodes(layers, genrs, cmprkey_indx, filtercmpr, reverse=reverse):
@@ -5593,6 +5829,9 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         ldef.setdefault('logedits', self.conf.get('layers:logedits'))
         ldef.setdefault('readonly', False)
 
+        if (names := ldef.get('trigram:props')) is not None:
+            ldef['trigram:props'] = s_layer.reqValidTrigramProps(self.model, names)
+
         s_layer.reqValidLdef(ldef)
 
         if nexs:
@@ -6283,12 +6522,19 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 mirropts['_loginfo']['pool:from'] = self.ahasvcname
 
                 try:
-                    return await proxy.count(text, opts=mirropts)
+                    with self._getStormPoolMember(proxy).query():
+                        return await proxy.count(text, opts=mirropts)
 
                 except s_exc.TimeOut:
                     mesg = 'Timeout waiting for query mirror, running locally instead.'
                     logger.warning(mesg)
 
+                except s_exc.ShuttingDown:
+                    # the member will be skipped until the next sync finds it healthy
+                    self._getStormPoolMember(proxy).offs = None
+                    mesg = f'Pool mirror [{proxname}] is shutting down, running locally instead.'
+                    logger.warning(mesg, extra=extra)
+
         if (nexsoffs := opts.get('nexsoffs')) is not None:
             if not await self.waitNexsOffs(nexsoffs, timeout=opts.get('nexstimeout')):
                 raise s_exc.TimeOut(mesg=f'Timeout waiting for nexus offset {nexsoffs} in count()')
@@ -6308,6 +6554,81 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         mirropts['nexstimeout'] = self.stormpoolopts.get('timeout:sync')
         return mirropts
 
+    def _getStormPoolMember(self, proxy):
+        member = self.stormpoolmembers.get(proxy)
+        if member is None:
+            member = self.stormpoolmembers[proxy] = StormPoolMember(proxy)
+        return member
+
+    async def _syncStormPoolMember(self, member):
+        '''
+        Update the nexus offset and latency of a Storm pool member.
+
+        Returns:
+            bool: True if the member responded.
+        '''
+        timeout = self.stormpoolopts.get('timeout:connection')
+
+        try:
+            tick = time.monotonic()
+            indx = await s_common.wait_for(member.proxy.getNexsIndx(), timeout)
+            member.setNexsIndx(indx, time.monotonic() - tick)
+            return True
+
+        except s_exc.ShuttingDown:
+            mesg = f'Proxy for pool mirror [{member.name}] is shutting down. Skipping.'
+
+        except s_exc.IsFini:
+            mesg = f'Proxy for pool mirror [{member.name}] was shutdown. Skipping.'
+
+        except TimeoutError:
+            mesg = f'Timeout waiting for pool mirror [{member.name}] Nexus offset.'
+
+        except Exception as e:  # pragma: no cover
+            mesg = f'Error getting pool mirror [{member.name}] Nexus offset: {e}'
+
+        # only warn when a member first becomes unavailable to avoid logspam
+        if member.synctime is None or member.offs is not None:
+            logger.warning(mesg, extra=self.getLogExtra(mirror=member.name))
+
+        member.offs = None
+        member.synctime = time.monotonic()
+        return False
+
+    async def _syncStormPool(self):
+        '''
+        Update the nexus offset and latency of each Storm pool member.
+        '''
+        if self.stormpool is None:  # pragma: no cover
+            return
+
+        proxies = set(self.stormpool.proxies)
+
+        for proxy in list(self.stormpoolmembers.keys()):
+            if proxy not in proxies:
+                self.stormpoolmembers.pop(proxy, None)
+
+        members = []
+        for proxy in proxies:
+            member = self._getStormPoolMember(proxy)
+            if member.name is not None and member.name == self.ahasvcname:
+                continue
+            members.append(member)
+
+        await asyncio.gather(*[self._syncStormPoolMember(m) for m in members])
+
+    async def _runStormPoolSync(self, pool):
+
+        while not pool.isfini:
+            await self._syncStormPool()
+            await pool.waitfini(timeout=STORM_POOL_SYNC_FREQ)
+
+    def getStormPoolInfo(self):
+        '''
+        Get the load and nexus offset last observed for each Storm pool member.
+        '''
+        return [member.pack() for member in self.stormpoolmembers.values()]
+
     async def _getMirrorProxy(self, opts):
 
         if self.stormpool is None:  # pragma: no cover
@@ -6320,44 +6641,42 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
 
         timeout = self.stormpoolopts.get('timeout:connection')
 
-        for _ in range(size):
+        try:
+            await self.stormpool.waitready(timeout=timeout)
+        except TimeoutError:
+            logger.warning('Timeout waiting for pool mirror proxy.')
+            logger.warning('Pool members exhausted. Running query locally.', extra=self.getLogExtra())
+            return None
 
-            try:
-                proxy = await self.stormpool.proxy(timeout=timeout)
+        curoffs = opts.setdefault('nexsoffs', await self.getNexsIndx() - 1)
 
-                proxyname = proxy._ahainfo.get('name')
-                if proxyname is not None and proxyname == self.ahasvcname:
-                    # we are part of the pool and were selected. Skip.
-                    continue
+        members = []
+        for proxy in list(self.stormpool.proxies):
 
-            except TimeoutError:
-                logger.warning('Timeout waiting for pool mirror proxy.')
+            member = self._getStormPoolMember(proxy)
+            if member.name is not None and member.name == self.ahasvcname:
+                # we are part of the pool. Skip.
                 continue
 
-            try:
-
-                curoffs = opts.setdefault('nexsoffs', await self.getNexsIndx() - 1)
-                miroffs = await s_common.wait_for(proxy.getNexsIndx(), timeout) - 1
-                if (delta := curoffs - miroffs) <= MAX_NEXUS_DELTA:
-                    return proxy
+            if member.synctime is None:
+                # the sync loop has not seen this member yet
+                await self._syncStormPoolMember(member)
 
-                mesg = f'Pool mirror [{proxyname}] is too far out of sync. Skipping.'
-                logger.warning(mesg, extra=self.getLogExtra(delta=delta, mirror=proxyname, mirror_offset=miroffs))
+            if member.offs is None:
+                continue
 
-            except s_exc.ShuttingDown:
-                mesg = f'Proxy for pool mirror [{proxyname}] is shutting down. Skipping.'
-                logger.warning(mesg, extra=self.getLogExtra(mirror=proxyname))
+            if (delta := curoffs - member.offs) > MAX_NEXUS_DELTA:
+                mesg = f'Pool mirror [{member.name}] is too far out of sync. Skipping.'
+                logger.warning(mesg, extra=self.getLogExtra(delta=delta, mirror=member.name, mirror_offset=member.offs))
+                continue
 
-            except s_exc.IsFini:
-                mesg = f'Proxy for pool mirror [{proxyname}] was shutdown. Skipping.'
-                logger.warning(mesg, extra=self.getLogExtra(mirror=proxyname))
+            members.append(member)
 
-            except TimeoutError:
-                mesg = f'Timeout waiting for pool mirror [{proxyname}] Nexus offset.'
-                logger.warning(mesg, extra=self.getLogExtra(mirror=proxyname))
+        if not members:
+            logger.warning('Pool members exhausted. Running query locally.', extra=self.getLogExtra())
+            return None
 
-        logger.warning('Pool members exhausted. Running query locally.', extra=self.getLogExtra())
-        return None
+        return min(members, key=StormPoolMember.getLoadKey).proxy
 
     async def storm(self, text, opts=None):
 
@@ -6377,14 +6696,21 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 mirropts['_loginfo']['pool:from'] = self.ahasvcname
 
                 try:
-                    async for mesg in proxy.storm(text, opts=mirropts):
-                        yield mesg
+                    with self._getStormPoolMember(proxy).query():
+                        async for mesg in proxy.storm(text, opts=mirropts):
+                            yield mesg
                     return
 
                 except s_exc.TimeOut:
                     mesg = 'Timeout waiting for query mirror, running locally instead.'
                     logger.warning(mesg, extra=extra)
 
+                except s_exc.ShuttingDown:
+                    # the member will be skipped until the next sync finds it healthy
+                    self._getStormPoolMember(proxy).offs = None
+                    mesg = f'Pool mirror [{proxname}] is shutting down, running locally instead.'
+                    logger.warning(mesg, extra=extra)
+
         if (nexsoffs := opts.get('nexsoffs')) is not None:
             if not await self.waitNexsOffs(nexsoffs, timeout=opts.get('nexstimeout')):
                 raise s_exc.TimeOut(mesg=f'Timeout waiting for nexus offset {nexsoffs} in storm().')
@@ -6411,11 +6737,18 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 mirropts['_loginfo']['pool:from'] = self.ahasvcname
 
                 try:
-                    return await proxy.callStorm(text, opts=mirropts)
+                    with self._getStormPoolMember(proxy).query():
+                        return await proxy.callStorm(text, opts=mirropts)
                 except s_exc.TimeOut:
                     mesg = 'Timeout waiting for query mirror, running locally instead.'
                     logger.warning(mesg, extra=extra)
 
+                except s_exc.ShuttingDown:
+                    # the member will be skipped until the next sync finds it healthy
+                    self._getStormPoolMember(proxy).offs = None
+                    mesg = f'Pool mirror [{proxname}] is shutting down, running locally instead.'
+                    logger.warning(mesg, extra=extra)
+
         if (nexsoffs := opts.get('nexsoffs')) is not None:
             if not await self.waitNexsOffs(nexsoffs, timeout=opts.get('nexstimeout')):
                 raise s_exc.TimeOut(mesg=f'Timeout waiting for nexus offset {nexsoffs} in callStorm().')
@@ -6441,14 +6774,21 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
                 mirropts['_loginfo']['pool:from'] = self.ahasvcname
 
                 try:
-                    async for mesg in proxy.exportStorm(text, opts=mirropts):
-                        yield mesg
+                    with self._getStormPoolMember(proxy).query():
+                        async for mesg in proxy.exportStorm(text, opts=mirropts):
+                            yield mesg
                     return
 
                 except s_exc.TimeOut:
                     mesg = 'Timeout waiting for query mirror, running locally instead.'
                     logger.warning(mesg, extra=extra)
 
+                except s_exc.ShuttingDown:
+                    # the member will be skipped until the next sync finds it healthy
+                    self._getStormPoolMember(proxy).offs = None
+                    mesg = f'Pool mirror [{proxname}] is shutting down, running locally instead.'
+                    logger.warning(mesg, extra=extra)
+
         if (nexsoffs := opts.get('nexsoffs')) is not None:
             if not await self.waitNexsOffs(nexsoffs, timeout=opts.get('nexstimeout')):
                 raise s_exc.TimeOut(mesg=f'Timeout waiting for nexus offset {nexsoffs} in exportStorm().')
@@ -6557,8 +6897,12 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         return [m async for m in self.storm(text, opts=opts)]
 
     async def _getStormEval(self, text):
+        return await self.evalcache.aget(text)
+
+    async def _initStormEval(self, text):
+        # parsed ASTs are immutable once prepared and are shared rather than copied
         try:
-            astvalu = copy.deepcopy(await s_parser.evalcache.aget(text))
+            astvalu = await s_parser.evalcache.aget(text)
         except s_exc.FatalErr: # pragma: no cover
             logger.exception(f'Fatal error while parsing [{text}]', extra=self.getLogExtra(text=text))
             await self.fini()
@@ -6567,18 +6911,23 @@ class Cortex(s_oauth.OAuthMixin, s_cell.Cell):  # type: ignore
         return astvalu
 
     async def _getStormQuery(self, args):
+
         try:
-            query = copy.deepcopy(await s_parser.querycache.aget(args))
+            query = await s_parser.querycache.aget(args)
         except s_exc.FatalErr: # pragma: no cover
             logger.exception(f'Fatal error while parsing [{args}]', extra=self.getLogExtra(text=args[0]))
             await self.fini()
             raise
         query.init(self)
+
         await asyncio.sleep(0)
         return query
 
     async def getStormQuery(self, text, mode='storm'):
-        return await self.querycache.aget((text, mode))
+        args = (text, mode)
+        query = await self.querycache.aget(args)
+        self._saveStormParse(args)
+        return query
 
     @contextlib.asynccontextmanager
     async def getStormRuntime(self, query, opts=None):
@@ -1,6 +1,7 @@
 import types
 import asyncio
 import logging
+import collections
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +12,8 @@ import synapse.telepath as s_telepath
 import synapse.lib.base as s_base
 import synapse.lib.coro as s_coro
 import synapse.lib.link as s_link
+import synapse.lib.const as s_const
+import synapse.lib.msgpack as s_msgpack
 import synapse.lib.scope as s_scope
 import synapse.lib.share as s_share
 import synapse.lib.certdir as s_certdir
@@ -25,6 +28,7 @@ class Sess(s_base.Base):
         self.items = {}
         self.iden = s_common.guid()
         self.user = None
+        self.zlib = None
         self.conninfo = {}
 
     def getSessItem(self, name):
@@ -118,7 +122,133 @@ dmonwrap = (
     (types.GeneratorType, Genr),
 )
 
-async def t2call(link, meth, args, kwargs, first=True):
+# Limits for the items sent in a single t2:yields message
+T2_YIELDS_MAXSIZE = 1_000
+T2_YIELDS_MAXBYTES = 4 * s_const.mebibyte
+# Max seconds to wait for more items before sending a partial t2:yields message
+T2_YIELDS_MAXWAIT = 0.002
+
+# The packed ('t2:yields', {'items': ...}) message header used to send pre-packed items
+T2_YIELDS_PREFIX = b'\x92' + s_msgpack.en('t2:yields') + b'\x81' + s_msgpack.en('items')
+
+class T2Yields:
+    '''
+    Send the items from a generator to a link in t2:yields messages.
+
+    Items are packed by put() and sent by a separate task which waits up to T2_YIELDS_MAXWAIT
+    for more items before sending. Batches grow while the link is slower than the generator,
+    up to T2_YIELDS_MAXSIZE items or T2_YIELDS_MAXBYTES bytes, at which point put() waits for
+    the batch to be sent.
+    '''
+    def __init__(self, link):
+        self.link = link
+
+        self.size = 0
+        self.bodies = collections.deque()
+
+        self.task = None
+        self.flushing = False
+        self.fullevnt = asyncio.Event()
+        self.sentevnt = asyncio.Event()
+
+    def _isFull(self):
+        return len(self.bodies) >= T2_YIELDS_MAXSIZE or self.size >= T2_YIELDS_MAXBYTES
+
+    async def put(self, item):
+
+        body = s_msgpack.en(item)
+
+        self.bodies.append(body)
+        self.size += len(body)
+
+        if self.task is None or self.task.done():
+            self._reqTaskDone()
+            self.task = s_coro.create_task(self._runSendLoop())
+
+        while self._isFull():
+            self.fullevnt.set()
+            self.sentevnt.clear()
+            await self.sentevnt.wait()
+            self._reqTaskDone()
+
+    def _reqTaskDone(self):
+        # raise any exception from the send task
+        if self.task is not None and self.task.done():
+            self.task.result()
+
+    async def _runSendLoop(self):
+
+        try:
+
+            while self.bodies:
+
+                if not self.flushing and not self._isFull():
+                    await s_coro.event_wait(self.fullevnt, timeout=T2_YIELDS_MAXWAIT)
+                    if not self.bodies:
+                        break
+
+                self.fullevnt.clear()
+
+                size = 0
+                bodies = []
+                while self.bodies and len(bodies) < T2_YIELDS_MAXSIZE and size < T2_YIELDS_MAXBYTES:
+                    body = self.bodies.popleft()
+                    size += len(body)
+                    bodies.append(body)
+
+                self.size -= size
+                self.sentevnt.set()
+
+                await self.link.send(T2_YIELDS_PREFIX + s_msgpack.arrayhead(len(bodies)) + b''.join(bodies))
+
+        finally:
+            self.sentevnt.set()
+
+    async def flush(self):
+        '''
+        Send any remaining items.
+        '''
+        if self.task is not None:
+            self.flushing = True
+            self.fullevnt.set()
+            # if the caller is cancelled, the send task is left for discard()
+            await asyncio.shield(self.task)
+            self.task = None
+            self.flushing = False
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def discard(self):
+        '''
+        Discard any remaining items and wait for a send in progress to complete.
+        '''
+        self.size = 0
+        self.bodies.clear()
+
+        if self.task is not None:
+            self.fullevnt.set()
+            task, self.task = self.task, None
+            try:
+                await task
+            except Exception:
+                pass
+
+async def flushT2Yields():
+    '''
+    Send any items which are buffered for the t2:yields messages of the current t2 task.
+
+    Notes:
+        Generators which write directly to the scope link must call this first,
+        or the buffered items will be sent after the messages they write.
+    '''
+    yielder = s_scope.get('t2yields')
+    if yielder is not None:
+        await yielder.flush()
+
+async def t2call(link, meth, args, kwargs, first=True, yields=False):
     '''
     Call the given ``meth(*args, **kwargs)`` and handle the response to provide
     telepath task v2 events to the given link.
@@ -126,6 +256,9 @@ async def t2call(link, meth, args, kwargs, first=True):
     The ``first`` argument may be set to ``False`` to skip sending an initial ``t2:genr``
     message when using a using a link which has already been initialized (such as when sending
     a link to a spawned process).
+
+    The ``yields`` argument may be set to ``True`` to send generator items in batched ``t2:yields``
+    messages when the peer supports them.
     '''
     try:
 
@@ -134,6 +267,8 @@ async def t2call(link, meth, args, kwargs, first=True):
         if s_coro.iscoro(valu):
             valu = await valu
 
+        yielder = None
+
         try:
 
             if isinstance(valu, types.AsyncGeneratorType):
@@ -141,8 +276,16 @@ async def t2call(link, meth, args, kwargs, first=True):
                     await link.tx(('t2:genr', {}))
                     first = False
 
-                async for item in valu:
-                    await link.tx(('t2:yield', {'retn': (True, item)}))
+                if yields:
+                    yielder = T2Yields(link)
+                    s_scope.set('t2yields', yielder)
+                    async for item in valu:
+                        await yielder.put(item)
+                    await yielder.flush()
+
+                else:
+                    async for item in valu:
+                        await link.tx(('t2:yield', {'retn': (True, item)}))
 
                 await link.tx(('t2:yield', {'retn': None}))
                 return
@@ -152,13 +295,24 @@ async def t2call(link, meth, args, kwargs, first=True):
                     await link.tx(('t2:genr', {}))
                     first = False
 
-                for item in valu:
-                    await link.tx(('t2:yield', {'retn': (True, item)}))
+                if yields:
+                    yielder = T2Yields(link)
+                    s_scope.set('t2yields', yielder)
+                    for item in valu:
+                        await yielder.put(item)
+                    await yielder.flush()
+
+                else:
+                    for item in valu:
+                        await link.tx(('t2:yield', {'retn': (True, item)}))
 
                 await link.tx(('t2:yield', {'retn': None}))
                 return
 
         except s_exc.DmonSpawn as e:
+            if yielder is not None:
+                yielder.cancel()
+
             context = e.__context__
             if context:
                 if not isinstance(context, asyncio.CancelledError):
@@ -175,6 +329,17 @@ async def t2call(link, meth, args, kwargs, first=True):
             else:
                 logger.exception(f'error during task {meth.__name__} {e}')
 
+            if yielder is not None:
+                if isinstance(e, asyncio.CancelledError):
+                    # allow a send in progress to complete so the link remains usable
+                    await yielder.discard()
+                else:
+                    # send any items which were yielded before the exception
+                    try:
+                        await yielder.flush()
+                    except Exception:
+                        yielder.cancel()
+
             if isinstance(valu, types.AsyncGeneratorType):
                 await valu.aclose()
             elif isinstance(valu, types.GeneratorType):
@@ -368,6 +533,20 @@ class Daemon(s_base.Base):
                     await link.fini()
                     return
 
+                if type(mesg) is tuple and len(mesg) == 2:
+
+                    # t2:cancel must be handled while the task is still running
+                    if mesg[0] == 't2:cancel':
+                        await self._onTaskV2Cancel(link, task)
+                        continue
+
+                    # multiplexed stream data is not ordered with the calls on the link
+                    if mesg[0] in s_link.MUX_MESGS:
+                        mux = link.get('mux')
+                        if mux is not None:
+                            await mux.onMuxMesg(mesg)
+                        continue
+
                 if task is not None:
                     await task
 
@@ -468,6 +647,21 @@ class Daemon(s_base.Base):
             sess.setSessItem(None, item)
             reply[1]['sess'] = sess.iden
 
+            zinfo = mesg[1].get('zlib')
+            if zinfo is not None:
+                # the client is able to receive compressed frames, including this reply
+                link.setCompress(*zinfo)
+                sess.zlib = (link.zlevel, link.zminsize)
+                reply[1]['zlib'] = sess.zlib
+
+            muxinfo = mesg[1].get('mux')
+            if muxinfo is not None and link.get('mux') is None:
+                # the client may open t2 streams over this link rather than connecting pool links
+                window = min(muxinfo.get('window', s_link.MUX_WINDOW), s_link.MUX_WINDOW)
+                mux = await s_link.Mux.anit(link, window=window, onstream=self._onLinkInit)
+                link.set('mux', mux)
+                reply[1]['mux'] = {'window': window}
+
         except Exception as e:
             logger.exception(f'tele:syn error: {e} link={link.getAddrInfo()}')
             reply[1]['retn'] = s_common.retnexc(e)
@@ -497,6 +691,27 @@ class Daemon(s_base.Base):
         typename = valu.typename
         return ('task:fini', {'task': task, 'retn': retn, 'type': typename})
 
+    async def _onTaskV2Cancel(self, link: s_link.Link, task):
+
+        # t2:cancel is sent by the client when it stops consuming a generator.
+        # The ack is sent once the task has stopped so the client can reuse the link.
+        try:
+
+            if task is not None and not task.done():
+                task.cancel()
+                await s_coro.waittask(task)
+
+            # a spawned process may have written a partial message to the socket
+            if link.get('spawned'):
+                await link.fini()
+                return
+
+            await link.tx(('t2:cancel', {}))
+
+        except Exception as e:
+            logger.debug(f'Error cancelling t2 task: {e} link={link.getAddrInfo()}')
+            await link.fini()
+
     async def _onTaskV2Init(self, link: s_link.Link, mesg):
 
         # t2:init is used by the pool sockets on the client
@@ -517,6 +732,9 @@ class Daemon(s_base.Base):
             if item is None:
                 raise s_exc.NoSuchObj(name=name)
 
+            if sess.zlib is not None and link.zlevel is None:
+                link.setCompress(*sess.zlib)
+
             s_scope.set('sess', sess)
             s_scope.set('link', link)
 
@@ -529,7 +747,9 @@ class Daemon(s_base.Base):
             if meth is None:
                 raise s_exc.NoSuchMeth.init(methname, item)
 
-            sessitem = await t2call(link, meth, args, kwargs)
+            yields = mesg[1].get('yields', 0) >= 1
+
+            sessitem = await t2call(link, meth, args, kwargs, yields=yields)
             if sessitem is not None:
                 sess.onfini(sessitem)
 
@@ -1,3 +1,4 @@
+import math
 import types
 import asyncio
 import decimal
@@ -123,6 +124,12 @@ class AstNode:
                 yield item
 
     def init(self, core):
+        '''
+        Prepare the AST for execution.
+
+        NOTE: Prepared ASTs hold no per-runtime state so they may be shared
+              by concurrent runtimes. Calling init() again is harmless.
+        '''
         [k.init(core) for k in self.kids]
         self.prepare()
 
@@ -197,6 +204,33 @@ class AstNode:
     def hasVarName(self, name):
         return any(k.hasVarName(name) for k in self.kids)
 
+    def getSubQueries(self):
+        '''
+        Yield the queries nested directly within this AST node.
+        '''
+        for kid in self.kids:
+            if isinstance(kid, Query):
+                yield kid
+                continue
+
+            yield from kid.getSubQueries()
+
+    async def explain(self, runt):
+        '''
+        Return a description of the AST node and its subqueries without running it.
+        '''
+        info = {
+            'oper': self.__class__.__name__,
+            'text': self.getAstText(),
+            'line': self.astinfo.sline,
+        }
+
+        queries = [await query.explain(runt) for query in self.getSubQueries()]
+        if queries:
+            info['queries'] = queries
+
+        return info
+
 class LookList(AstNode): pass
 
 class Query(AstNode):
@@ -209,18 +243,29 @@ class Query(AstNode):
         self.opts = {}
         self.text = self.getAstText()
 
+    def init(self, core):
+        AstNode.init(self, core)
+        self.optimize()
+
+    async def explain(self, runt):
+        opers = [await oper.explain(runt) for oper in self.kids]
+        return {'text': self.text, 'opers': opers}
+
     async def run(self, runt, genr):
 
         async with contextlib.AsyncExitStack() as stack:
             for oper in self.kids:
-                genr = await stack.enter_async_context(contextlib.aclosing(oper.run(runt, genr)))
+                if runt.profiler is not None:
+                    genr = runt.profiler.run(oper, runt, genr)
+                else:
+                    genr = oper.run(runt, genr)
+                genr = await stack.enter_async_context(contextlib.aclosing(genr))
 
             async for node, path in genr:
                 yield node, path
 
     async def iterNodePaths(self, runt, genr=None):
 
-        self.optimize()
         self.validate(runt)
 
         # turtles all the way down...
@@ -1550,10 +1595,46 @@ class CaseEntry(AstNode):
 
 class LiftOper(Oper):
 
+    # the layer index family used by the lift
+    liftindx = 'byprop'
+
     def __init__(self, astinfo, kids=()):
         Oper.__init__(self, astinfo, kids=kids)
         self.reverse = False
 
+    def setProfLift(self, runt, indx, **info):
+        if runt.profiler is not None:
+            runt.profiler.setLift(self, indx, **info)
+
+    async def explain(self, runt):
+
+        info = await Oper.explain(self, runt)
+
+        lift = {'indx': self.liftindx}
+
+        # lifts which depend on the inbound node or call functions can not be estimated
+        if self.isRuntSafe(runt) and not self.hasAstClass(FuncCall):
+            try:
+                lift.update(await self.explainLift(runt))
+            except s_exc.SynErr:
+                pass
+
+        info['lift'] = lift
+        return info
+
+    async def explainLift(self, runt):
+        '''
+        Return a dict of lift details including the estimated number of rows.
+
+        NOTE: Rows are only estimated for constant values since computing
+              other values may run code from the query.
+        '''
+        return {}
+
+    def isConstKid(self, indx):
+        kid = self.kids[indx]
+        return isinstance(kid, Const) or (isinstance(kid, List) and kid.isconst)
+
     def reverseLift(self, astinfo):
         self.astinfo = astinfo
         self.reverse = True
@@ -1586,6 +1667,8 @@ class LiftOper(Oper):
 
     async def run(self, runt, genr):
 
+        self.setProfLift(runt, self.liftindx)
+
         if self.isRuntSafe(runt):
 
             # runtime safe lift operation
@@ -1630,6 +1713,12 @@ class YieldValu(Oper):
 
 class LiftTag(LiftOper):
 
+    liftindx = 'bytag'
+
+    async def explainLift(self, runt):
+        tag = await self.kids[0].compute(runt, None)
+        return {'rows': await runt.snap.view.getTagCount(tag)}
+
     async def lift(self, runt, path):
 
         tag = await self.kids[0].compute(runt, path)
@@ -1651,6 +1740,25 @@ class LiftByArray(LiftOper):
     '''
     :prop*[range=(200, 400)]
     '''
+
+    liftindx = 'byarray'
+
+    async def explainLift(self, runt):
+
+        name = await self.kids[0].compute(runt, None)
+        if name.find('::') != -1:
+            return {}
+
+        if not self.isConstKid(2):
+            return {}
+
+        cmpr = await self.kids[1].compute(runt, None)
+        if cmpr != '=':
+            return {'rows': await runt.snap.view.getPropArrayCount(name)}
+
+        valu = await s_stormtypes.tostor(await self.kids[2].compute(runt, None))
+        return {'rows': await runt.snap.view.getPropArrayCount(name, valu=valu)}
+
     async def lift(self, runt, path):
 
         name = await self.kids[0].compute(runt, path)
@@ -1708,6 +1816,22 @@ class LiftTagProp(LiftOper):
     '''
     #foo.bar:baz [ = x ]
     '''
+
+    liftindx = 'bytagprop'
+
+    async def explainLift(self, runt):
+
+        if len(self.kids) == 3 and not self.isConstKid(2):
+            return {}
+
+        tag, prop = await self.kids[0].compute(runt, None)
+
+        if len(self.kids) == 3 and await self.kids[1].compute(runt, None) == '=':
+            valu = await s_stormtypes.tostor(await self.kids[2].compute(runt, None))
+            return {'rows': await runt.snap.view.getTagPropCount(None, tag, prop, valu=valu)}
+
+        return {'rows': await runt.snap.view.getTagPropCount(None, tag, prop)}
+
     async def lift(self, runt, path):
 
         tag, prop = await self.kids[0].compute(runt, path)
@@ -1730,6 +1854,26 @@ class LiftFormTagProp(LiftOper):
     hehe:haha#foo.bar:baz [ = x ]
     '''
 
+    liftindx = 'bytagprop'
+
+    async def explainLift(self, runt):
+
+        if len(self.kids) == 3 and not self.isConstKid(2):
+            return {}
+
+        formname, tag, prop = await self.kids[0].compute(runt, None)
+        forms = runt.model.reqFormsByLook(formname, self.kids[0].addExcInfo)
+
+        valu = s_common.novalu
+        if len(self.kids) == 3 and await self.kids[1].compute(runt, None) == '=':
+            valu = await s_stormtypes.tostor(await self.kids[2].compute(runt, None))
+
+        rows = 0
+        for form in forms:
+            rows += await runt.snap.view.getTagPropCount(form, tag, prop, valu=valu)
+
+        return {'rows': rows}
+
     async def lift(self, runt, path):
 
         formname, tag, prop = await self.kids[0].compute(runt, path)
@@ -1762,6 +1906,8 @@ class LiftTagTag(LiftOper):
     ##foo.bar
     '''
 
+    liftindx = 'bytag'
+
     async def lift(self, runt, path):
 
         tagname = await self.kids[0].compute(runt, path)
@@ -1803,6 +1949,21 @@ class LiftTagTag(LiftOper):
 
 class LiftFormTag(LiftOper):
 
+    liftindx = 'bytag'
+
+    async def explainLift(self, runt):
+
+        formname = await self.kids[0].compute(runt, None)
+        forms = runt.model.reqFormsByLook(formname, self.kids[0].addExcInfo)
+
+        tag = await self.kids[1].compute(runt, None)
+
+        rows = 0
+        for form in forms:
+            rows += await runt.snap.view.getTagCount(tag, formname=form)
+
+        return {'rows': rows}
+
     async def lift(self, runt, path):
 
         formname = await self.kids[0].compute(runt, path)
@@ -1863,14 +2024,48 @@ class LiftProp(LiftOper):
         async for node in s_common.merggenr2(genrs, cmprkey, reverse=self.reverse):
             yield node
 
+    async def explainLift(self, runt):
+
+        name = await self.kids[0].compute(runt, None)
+
+        prop = runt.model.props.get(name)
+        if prop is None:
+            rows = 0
+            for propname in runt.model.reqPropsByLook(name, self.kids[0].addExcInfo):
+                rows += await runt.snap.view.getPropCount(propname)
+            return {'rows': rows}
+
+        if prop.isform:
+
+            # filters which call functions would need to be run to compute the lift hints
+            if self.hasRightFuncCall():
+                return {}
+
+            hints = [hint async for hint in self.getRightHints(runt, None)]
+            if len(hints) > 1:
+                hints = await self.sortHintsByCost(runt, prop, hints)
+
+            # the first hint is used for the lift
+            if hints:
+                indx = 'bytag' if hints[0][0] == 'tag' else 'byprop'
+                rows = await self.getHintCost(runt, prop, hints[0])
+                return {'indx': indx, 'hints': hints, 'rows': rows}
+
+        return {'rows': await runt.snap.view.getPropCount(prop.full)}
+
     async def proplift(self, prop, runt, path):
 
         # check if we can optimize a form lift
         if prop.isform:
 
-            async for hint in self.getRightHints(runt, path):
+            hints = [hint async for hint in self.getRightHints(runt, path)]
+            if len(hints) > 1:
+                hints = await self.sortHintsByCost(runt, prop, hints)
+
+            for hint in hints:
                 if hint[0] == 'tag':
                     tagname = hint[1].get('name')
+                    self.setProfLift(runt, 'bytag', hint='tag', tag=tagname)
                     async for node in runt.snap.nodesByTag(tagname, form=prop.full, reverse=self.reverse):
                         yield node
                     return
@@ -1891,6 +2086,8 @@ class LiftProp(LiftOper):
                     cmpr = hint[1].get('cmpr')
                     valu = hint[1].get('valu')
 
+                    self.setProfLift(runt, 'byprop', hint='relprop', prop=fullname, cmpr=cmpr)
+
                     if cmpr is not None and valu is not None:
                         try:
                             # try lifting by valu but no guarantee a cmpr is available
@@ -1909,6 +2106,67 @@ class LiftProp(LiftOper):
         async for node in runt.snap.nodesByProp(prop.full, reverse=self.reverse):
             yield node
 
+    async def sortHintsByCost(self, runt, form, hints):
+        '''
+        Order lift hints by the estimated number of rows each would lift.
+
+        The filters which produced the hints remain in the pipeline, so any
+        hint may be used for the lift and the most selective one wins.
+        '''
+        costs = []
+        for indx, hint in enumerate(hints):
+            costs.append((await self.getHintCost(runt, form, hint), indx, hint))
+
+        costs.sort(key=lambda x: x[:2])
+        return [hint for (cost, indx, hint) in costs]
+
+    async def getHintCost(self, runt, form, hint):
+
+        view = runt.snap.view
+
+        if hint[0] == 'tag':
+            return await view.getTagCount(hint[1].get('name'), formname=form.full)
+
+        if hint[0] == 'relprop':
+
+            relpropname = hint[1].get('name')
+            if hint[1].get('univ'):
+                fullname = ''.join([form.full, relpropname])
+            else:
+                fullname = ':'.join([form.full, relpropname])
+
+            # a prop which does not exist will lift nothing
+            if runt.model.prop(fullname) is None:
+                return 0
+
+            if hint[1].get('cmpr') == '=' and hint[1].get('valu') is not None:
+                try:
+                    valu = await s_stormtypes.tostor(hint[1].get('valu'))
+                    return await view.getPropCount(fullname, valu=valu)
+                except asyncio.CancelledError:  # pragma: no cover
+                    raise
+                except:
+                    pass
+
+            return await view.getPropCount(fullname)
+
+        return math.inf  # pragma: no cover
+
+    def hasRightFuncCall(self):
+
+        for oper in self.iterright():
+
+            if isinstance(oper, LiftOper):
+                continue
+
+            if not isinstance(oper, FiltOper):
+                return False
+
+            if oper.hasAstClass(FuncCall):
+                return True
+
+        return False
+
     async def getRightHints(self, runt, path):
 
         for oper in self.iterright():
@@ -1926,6 +2184,33 @@ class LiftProp(LiftOper):
 
 class LiftPropBy(LiftOper):
 
+    async def explainLift(self, runt):
+
+        if not self.isConstKid(2):
+            return {}
+
+        name = await self.kids[0].compute(runt, None)
+        if name.find('::') != -1:
+            return {}
+
+        cmpr = await self.kids[1].compute(runt, None)
+        valu = await self.kids[2].compute(runt, None)
+
+        view = runt.snap.view
+
+        prop = runt.model.props.get(name)
+        if prop is None:
+            rows = 0
+            for propname in runt.model.ifaceprops.get(name, ()):
+                rows += await view.getPropCount(propname)
+            return {'rows': rows}
+
+        if cmpr == '=' and not isinstance(valu, s_node.Node):
+            valu = await s_stormtypes.tostor(valu)
+            return {'rows': await view.getPropCount(prop.full, valu=valu)}
+
+        return {'rows': await view.getPropCount(prop.full)}
+
     async def lift(self, runt, path):
         name = await self.kids[0].compute(runt, path)
         cmpr = await self.kids[1].compute(runt, path)
@@ -2101,10 +2386,11 @@ class N1WalkNPivo(PivotOut):
             async for item in self.getPivsOut(runt, node, path):
                 yield item
 
-            async for (verb, iden) in node.iterEdgesN1():
-                wnode = await runt.snap.getNodeByBuid(s_common.uhex(iden))
-                if wnode is not None:
-                    yield wnode, path.fork(wnode, {'type': 'edge', 'verb': verb})
+            async for edges in s_coro.chunks(node.iterEdgesN1()):
+                wnodes = await runt.snap.getNodesByBuids([s_common.uhex(iden) for (_, iden) in edges])
+                for (verb, _), wnode in zip(edges, wnodes):
+                    if wnode is not None:
+                        yield wnode, path.fork(wnode, {'type': 'edge', 'verb': verb})
 
 class PivotToTags(PivotOper):
     '''
@@ -2231,10 +2517,11 @@ class N2WalkNPivo(PivotIn):
             async for item in self.getPivsIn(runt, node, path):
                 yield item
 
-            async for (verb, iden) in node.iterEdgesN2():
-                wnode = await runt.snap.getNodeByBuid(s_common.uhex(iden))
-                if wnode is not None:
-                    yield wnode, path.fork(wnode, {'type': 'edge', 'verb': verb, 'reverse': True})
+            async for edges in s_coro.chunks(node.iterEdgesN2()):
+                wnodes = await runt.snap.getNodesByBuids([s_common.uhex(iden) for (_, iden) in edges])
+                for (verb, _), wnode in zip(edges, wnodes):
+                    if wnode is not None:
+                        yield wnode, path.fork(wnode, {'type': 'edge', 'verb': verb, 'reverse': True})
 
 class PivotInFrom(PivotOper):
     '''
@@ -2922,7 +3209,7 @@ class AndCond(Cond):
     '''
     async def getLiftHints(self, runt, path):
         h0 = await self.kids[0].getLiftHints(runt, path)
-        h1 = await self.kids[0].getLiftHints(runt, path)
+        h1 = await self.kids[1].getLiftHints(runt, path)
         return h0 + h1
 
     async def getCondEval(self, runt):
@@ -4515,11 +4802,11 @@ class N1Walk(Oper):
         return f'{self.__class__.__name__}: {self.kids}, isjoin={self.isjoin}'
 
     async def walkNodeEdges(self, runt, node, verb=None):
-        async for verb, iden in node.iterEdgesN1(verb=verb):
-            buid = s_common.uhex(iden)
-            walknode = await runt.snap.getNodeByBuid(buid)
-            if walknode is not None:
-                yield verb, walknode
+        async for edges in s_coro.chunks(node.iterEdgesN1(verb=verb)):
+            walknodes = await runt.snap.getNodesByBuids([s_common.uhex(iden) for (_, iden) in edges])
+            for (verb, _), walknode in zip(edges, walknodes):
+                if walknode is not None:
+                    yield verb, walknode
 
     def buildfilter(self, runt, destforms, cmpr):
 
@@ -4638,11 +4925,11 @@ class N2Walk(N1Walk):
         N1Walk.__init__(self, astinfo, kids=kids, isjoin=isjoin, reverse=True)
 
     async def walkNodeEdges(self, runt, node, verb=None):
-        async for verb, iden in node.iterEdgesN2(verb=verb):
-            buid = s_common.uhex(iden)
-            walknode = await runt.snap.getNodeByBuid(buid)
-            if walknode is not None:
-                yield verb, walknode
+        async for edges in s_coro.chunks(node.iterEdgesN2(verb=verb)):
+            walknodes = await runt.snap.getNodesByBuids([s_common.uhex(iden) for (_, iden) in edges])
+            for (verb, _), walknode in zip(edges, walknodes):
+                if walknode is not None:
+                    yield verb, walknode
 
 class EditEdgeAdd(Edit):
 
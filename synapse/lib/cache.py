@@ -98,6 +98,15 @@ class FixedCache:
         self.fifo.clear()
         self.cache.clear()
 
+    def resize(self, size):
+        '''
+        Change the maximum number of entries in the cache.
+        '''
+        self.size = size
+        while len(self.fifo) > size:
+            delkey = self.fifo.popleft()
+            self.cache.pop(delkey, None)
+
 class LruDict(collections.abc.MutableMapping):
     '''
     Maintains the last n accessed keys
@@ -154,6 +163,158 @@ class LruDict(collections.abc.MutableMapping):
         '''
         return item in self.data
 
+class SlruCache:
+    '''
+    A segmented LRU cache bounded by both entry count and estimated bytes.
+
+    New entries are added to a probationary segment and are only promoted to
+    the protected segment when they are accessed again. A single large scan
+    therefore only churns the probationary segment and does not evict the
+    frequently accessed entries.
+    '''
+    def __init__(self, maxsize=10000, maxbytes=None, protected=0.8):
+
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.protected = protected
+
+        self.disabled = not self.maxsize or self.maxbytes == 0
+
+        self.probdata = collections.OrderedDict()
+        self.protdata = collections.OrderedDict()
+
+        self.size = 0
+        self.protsize = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evicts = 0
+
+    def __len__(self):
+        return len(self.probdata) + len(self.protdata)
+
+    def __contains__(self, key):
+        return key in self.protdata or key in self.probdata
+
+    def get(self, key, default=None):
+
+        item = self.protdata.get(key)
+        if item is not None:
+            self.protdata.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+        item = self.probdata.pop(key, None)
+        if item is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+
+        # a second access promotes the entry to the protected segment
+        self.protdata[key] = item
+        self.protsize += item[1]
+        self._trimProtected()
+
+        return item[0]
+
+    def put(self, key, valu, size=1):
+        '''
+        Add a value to the cache with an estimated size in bytes.
+        '''
+        if self.disabled:
+            return
+
+        # never flush the cache for an entry which could not fit anyway
+        if self.maxbytes is not None and size > self.maxbytes:
+            self.pop(key)
+            return
+
+        item = self.protdata.get(key)
+        if item is not None:
+            self.protdata[key] = (valu, size)
+            self.protdata.move_to_end(key)
+            self.size += size - item[1]
+            self.protsize += size - item[1]
+            self._trimProtected()
+            self._trim()
+            return
+
+        item = self.probdata.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+
+        self.probdata[key] = (valu, size)
+        self.size += size
+        self._trim()
+
+    def pop(self, key, default=None):
+
+        item = self.protdata.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+            self.protsize -= item[1]
+            return item[0]
+
+        item = self.probdata.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+            return item[0]
+
+        return default
+
+    def clear(self):
+        self.probdata.clear()
+        self.protdata.clear()
+        self.size = 0
+        self.protsize = 0
+
+    def resize(self, maxsize, maxbytes=None):
+        '''
+        Change the cache bounds, evicting entries as needed.
+        '''
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.disabled = not self.maxsize or self.maxbytes == 0
+
+        self._trimProtected()
+        self._trim()
+
+    def stat(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evicts': self.evicts,
+            'size': len(self),
+            'bytes': self.size,
+        }
+
+    def _trimProtected(self):
+
+        # demote the least recently used protected entries back to probation
+        maxsize = int(self.maxsize * self.protected)
+        maxbytes = None
+        if self.maxbytes is not None:
+            maxbytes = int(self.maxbytes * self.protected)
+
+        while self.protdata and (len(self.protdata) > maxsize or (maxbytes is not None and self.protsize > maxbytes)):
+            key, item = self.protdata.popitem(last=False)
+            self.protsize -= item[1]
+            self.probdata[key] = item
+
+    def _trim(self):
+
+        while len(self) > self.maxsize or (self.maxbytes is not None and self.size > self.maxbytes):
+
+            if self.probdata:
+                key, item = self.probdata.popitem(last=False)
+            else:
+                key, item = self.protdata.popitem(last=False)
+                self.protsize -= item[1]
+
+            self.size -= item[1]
+            self.evicts += 1
+
 # Search for instances of escaped double or single asterisks
 # https://regex101.com/r/fOdmF2/1
 ReRegex = regex.compile(r'(\\\*\\\*)|(\\\*)')
@@ -4,6 +4,7 @@ import ssl
 import copy
 import stat
 import time
+import glob
 import fcntl
 import shutil
 import signal
@@ -57,6 +58,7 @@ import synapse.lib.urlhelp as s_urlhelp
 import synapse.lib.version as s_version
 import synapse.lib.lmdbslab as s_lmdbslab
 import synapse.lib.thisplat as s_thisplat
+import synapse.lib.multislabseqn as s_multislabseqn
 import synapse.lib.processpool as s_processpool
 
 import synapse.lib.crypto.passwd as s_passwd
@@ -800,8 +802,8 @@ class CellApi(s_base.Base):
         return await self.cell.saveHiveTree(path=path)
 
     @adminapi()
-    async def getNexusChanges(self, offs, tellready=False, wait=True):
-        async for item in self.cell.getNexusChanges(offs, tellready=tellready, wait=wait):
+    async def getNexusChanges(self, offs, tellready=False, wait=True, batch=False):
+        async for item in self.cell.getNexusChanges(offs, tellready=tellready, wait=wait, batch=batch):
             yield item
 
     @adminapi()
@@ -890,6 +892,20 @@ class CellApi(s_base.Base):
         if False:  # pragma: no cover
             yield
 
+    @adminapi()
+    async def iterNexsSnapshot(self):
+        '''
+        Take a snapshot of the service slabs for mirror catch-up and return it as a compressed stream of bytes.
+
+        Note: The snapshot does not include the Nexus log. The Nexus offset which the snapshot
+              corresponds to is recorded in the snapshot.yaml file within the archive.
+        '''
+        await self.cell.iterNexsSnapshot(user=self.user)
+
+        # Make this a generator
+        if False:  # pragma: no cover
+            yield
+
     @adminapi()
     async def getDiagInfo(self):
         return {
@@ -966,6 +982,12 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
             'hidedocs': True,
             'hidecmdl': True,
         },
+        'mirror:catchup:lag': {
+            'description': 'When a mirror boots at least this many Nexus entries behind the upstream, catch up from '
+                           'a snapshot of the upstream rather than replaying the Nexus log.',
+            'type': ['integer', 'null'],
+            'minimum': 1,
+        },
         'auth:passwd': {
             'description': 'Set to <passwd> (local only) to bootstrap the root user password.',
             'type': 'string',
@@ -999,6 +1021,12 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
             'description': 'Record all changes to a stream file on disk.  Required for mirroring (on both sides).',
             'type': 'boolean',
         },
+        'nexslog:compress': {
+            'default': None,
+            'description': 'Compress rotated Nexus log slabs into read-only files using the given codec.',
+            'type': ['string', 'null'],
+            'enum': ['zlib', 'lzma', None],
+        },
         'nexslog:async': {
             'default': True,
             'description': 'Deprecated. This option ignored.',
@@ -1226,6 +1254,7 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
             'tasks': 1,
             'issuewait': 1,
             'shutdowndrain': 1,
+            'nexsbatch': 1,
         }
 
         self.safemode = self.conf.req('safemode')
@@ -1249,6 +1278,7 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
             await self._onBootOptimize()
 
         await self._initCellBoot()
+        await self._initMirrorCatchup()
 
         # we need to know this pretty early...
         self.ahasvcname = self._getAhaSvcName()
@@ -2867,8 +2897,8 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
     async def initServicePassive(self):  # pragma: no cover
         pass
 
-    async def getNexusChanges(self, offs, tellready=False, wait=True):
-        async for item in self.nexsroot.iter(offs, tellready=tellready, wait=wait):
+    async def getNexusChanges(self, offs, tellready=False, wait=True, batch=False):
+        async for item in self.nexsroot.iter(offs, tellready=tellready, wait=wait, batch=batch):
             yield item
 
     def _reqBackDirn(self, name):
@@ -2983,9 +3013,12 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
 
         return retn
 
-    async def _execBackupTask(self, dirn):
+    async def _execBackupTask(self, dirn, snapshot=False):
         '''
         A task that backs up the cell to the target directory
+
+        If snapshot is True, the Nexus log is skipped and the current Nexus offset is
+        recorded in a snapshot.yaml file for mirror catch-up.
         '''
         logger.info(f'Starting backup to [{dirn}]')
 
@@ -3020,11 +3053,15 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
                 dstdir = s_common.gendir(dirn)
                 shutil.copy(os.path.join(self.dirn, 'cell.guid'), os.path.join(dstdir, 'cell.guid'))
 
+                kwargs = {}
+                if snapshot:
+                    kwargs['skipdirs'] = ['slabs/nexuslog']
+
                 args = (child_pipe, self.dirn, dirn, paths, logconf)
 
                 def waitforproc1():
                     nonlocal proc
-                    proc = ctx.Process(target=self._backupProc, args=args)
+                    proc = ctx.Process(target=self._backupProc, args=args, kwargs=kwargs)
                     proc.start()
                     hasdata = mypipe.poll(timeout=self.BACKUP_SPAWN_TIMEOUT)
                     if not hasdata:
@@ -3034,6 +3071,10 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
 
                 await s_coro.executor(waitforproc1)
 
+                # record the offset while the LMDB transactions are held by the backup process
+                if snapshot:
+                    s_common.yamlsave({'nexsindx': await self.nexsroot.index()}, dstdir, 'snapshot.yaml')
+
             def waitforproc2():
                 proc.join()
                 if proc.exitcode:
@@ -3054,7 +3095,7 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
                 proc.terminate()
 
     @staticmethod
-    def _backupProc(pipe, srcdir, dstdir, lmdbpaths, logconf):
+    def _backupProc(pipe, srcdir, dstdir, lmdbpaths, logconf, skipdirs=None):
         '''
         (In a separate process) Actually do the backup
         '''
@@ -3062,10 +3103,15 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
         s_logging.setup(**logconf)
         try:
 
-            with s_t_backup.capturelmdbs(srcdir) as lmdbinfo:
+            capskips = None
+            if skipdirs:
+                capskips = [os.path.join(glob.escape(os.path.abspath(srcdir)), name, '*') for name in skipdirs]
+                skipdirs = list(skipdirs)
+
+            with s_t_backup.capturelmdbs(srcdir, skipdirs=capskips) as lmdbinfo:
                 pipe.send('captured')
                 logger.debug('Acquired LMDB transactions')
-                s_t_backup.txnbackup(lmdbinfo, srcdir, dstdir)
+                s_t_backup.txnbackup(lmdbinfo, srcdir, dstdir, skipdirs=skipdirs)
         except Exception:
             logger.exception(f'Error running backup of {srcdir}')
             raise
@@ -3192,6 +3238,34 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
                 self.removetask = asyncio.create_task(self._removeStreamingBackup(path))
                 await asyncio.shield(self.removetask)
 
+    async def iterNexsSnapshot(self, user):
+
+        if self.backuprunning:
+            raise s_exc.BackupAlreadyRunning(mesg='Another backup is already running')
+
+        if self.backupstreaming:
+            raise s_exc.BackupAlreadyRunning(mesg='Another streaming backup is already running')
+
+        name = 'snapshot-' + time.strftime('%Y%m%d%H%M%S', datetime.datetime.now().timetuple())
+        path = self._reqBackDirn(name)
+
+        try:
+            self.backuprunning = True
+            self.backupstreaming = True
+
+            self._reqBackupSpace()
+
+            logger.info(f'Taking a snapshot for mirror catch-up [{name}]')
+            await self._execBackupTask(path, snapshot=True)
+
+            self.backuprunning = False
+            await self._streamBackupArchive(path, user, name)
+
+        finally:
+            self.backuprunning = False
+            self.removetask = asyncio.create_task(self._removeStreamingBackup(path))
+            await asyncio.shield(self.removetask)
+
     async def isUserAllowed(self, iden, perm, gateiden=None, default=False):
         user = self.auth.user(iden)  # type: s_auth.User
         if user is None:
@@ -4633,6 +4707,151 @@ class Cell(s_nexus.Pusher, s_telepath.Aware):
             if os.path.isfile(tarpath):
                 os.unlink(tarpath)
 
+    async def _getBootNexsIndx(self):
+        '''
+        Get the Nexus offset of the service before the Nexus is initialized.
+        '''
+        indx = 0
+
+        path = s_common.genpath(self.dirn, 'slabs', 'nexus.lmdb')
+        if os.path.isdir(path):
+            async with await s_lmdbslab.Slab.anit(path) as slab:
+                hotcount = await slab.getHotCount('nexs:indx')
+                indx = hotcount.get('nexs:indx')
+
+        logpath = s_common.genpath(self.dirn, 'slabs', 'nexuslog')
+        if os.path.isdir(logpath):
+            async with await s_multislabseqn.MultiSlabSeqn.anit(logpath) as nexslog:
+                indx = max(indx, nexslog.index())
+
+        return indx
+
+    async def _initMirrorCatchup(self):
+
+        maxlag = self.conf.get('mirror:catchup:lag')
+        if maxlag is None:
+            return
+
+        # bootstrapping a new mirror is handled by _initCellBoot()
+        murl = self.conf.get('mirror')
+        if murl is None or not os.path.isfile(s_common.genpath(self.dirn, 'cell.guid')):
+            return
+
+        offs = await self._getBootNexsIndx()
+
+        async with s_telepath.loadTeleCell(self.dirn):
+
+            try:
+                proxy = await s_telepath.openurl(murl)
+            except Exception as e:
+                logger.warning(f'Unable to check mirror lag, upstream is not available: {e}')
+                return
+
+            async with proxy:
+
+                lag = await proxy.getNexsIndx() - offs
+                if lag < maxlag:
+                    return
+
+                logger.warning(f'Mirror is {lag} Nexus entries behind the upstream (mirror:catchup:lag={maxlag}), '
+                               'catching up from a snapshot.')
+
+                await self._initSnapshotCell(proxy)
+
+    async def _initSnapshotCell(self, proxy):
+        '''
+        Replace the service slabs with a snapshot from the upstream.
+        '''
+        tmpdir = s_common.gendir(self.dirn, 'tmp')
+        tarpath = s_common.genpath(tmpdir, 'snapshot.tgz')
+        snapdirn = s_common.genpath(tmpdir, 'snapshot')
+        olddirn = s_common.genpath(tmpdir, 'snapshot.old')
+
+        try:
+
+            try:
+
+                with s_common.genfile(tarpath) as fd:
+                    async for byts in proxy.iterNexsSnapshot():
+                        fd.write(byts)
+
+                with tarfile.open(tarpath) as tgz:
+                    for memb in tgz.getmembers():
+                        if memb.name.find('/') == -1:
+                            continue
+                        memb.name = memb.name.split('/', 1)[1]
+                        tgz.extract(memb, snapdirn)
+
+            except asyncio.CancelledError:  # pragma: no cover
+                raise
+
+            except Exception:
+                logger.exception('Failed to retrieve a snapshot from the upstream, replaying the Nexus log instead.')
+                return
+
+            with s_common.genfile(snapdirn, 'cell.guid') as fd:
+                snapiden = fd.read().decode().strip()
+
+            with s_common.genfile(self.dirn, 'cell.guid') as fd:
+                celliden = fd.read().decode().strip()
+
+            if snapiden != celliden:
+                mesg = f'Snapshot cell.guid {snapiden} does not match the mirror cell.guid {celliden}.'
+                raise s_exc.BadState(mesg=mesg)
+
+            nexsindx = s_common.yamlload(snapdirn, 'snapshot.yaml').get('nexsindx')
+
+            lmdbpaths = []
+            for root, dnames, fnames in os.walk(snapdirn):
+                for name in list(dnames):
+                    if name.endswith('.lmdb'):
+                        dnames.remove(name)
+                        lmdbpaths.append(os.path.relpath(os.path.join(root, name), snapdirn))
+
+            # move the existing slabs aside before moving the snapshot slabs into place
+            for relpath in lmdbpaths:
+
+                for path in (relpath, s_common.switchext(relpath, ext='.opts.yaml')):
+
+                    srcpath = s_common.genpath(snapdirn, path)
+                    if not os.path.exists(srcpath):
+                        continue
+
+                    dstpath = s_common.genpath(self.dirn, path)
+                    if os.path.exists(dstpath):
+                        oldpath = s_common.genpath(olddirn, path)
+                        s_common.gendir(os.path.dirname(oldpath))
+                        os.rename(dstpath, oldpath)
+
+                    s_common.gendir(os.path.dirname(dstpath))
+                    os.rename(srcpath, dstpath)
+
+            # the Nexus log was not included so the offset must be set explicitly
+            path = s_common.genpath(self.dirn, 'slabs', 'nexus.lmdb')
+            async with await s_lmdbslab.Slab.anit(path) as slab:
+                hotcount = await slab.getHotCount('nexs:indx')
+                hotcount.set('nexs:indx', nexsindx)
+
+            # entries in the local Nexus log predate the snapshot and must never be replayed over it
+            logpath = s_common.genpath(self.dirn, 'slabs', 'nexuslog')
+            if os.path.isdir(logpath):
+                oldpath = s_common.genpath(olddirn, 'slabs', 'nexuslog')
+                s_common.gendir(os.path.dirname(oldpath))
+                os.rename(logpath, oldpath)
+
+            await s_multislabseqn.MultiSlabSeqn.initEmpty(s_common.gendir(logpath), nexsindx)
+
+            shutil.rmtree(olddirn, ignore_errors=True)
+
+            logger.warning(f'Mirror caught up from a snapshot at Nexus offset {nexsindx}.')
+
+        finally:
+
+            if os.path.isfile(tarpath):
+                os.unlink(tarpath)
+
+            shutil.rmtree(snapdirn, ignore_errors=True)
+
     async def _bootCellMirror(self, pnfo):
         # this function must assume almost nothing is initialized
         # but that's ok since it will only run rarely.
@@ -60,6 +60,7 @@ import os
 import math
 import shutil
 import struct
+import heapq
 import asyncio
 import logging
 import contextlib
@@ -76,6 +77,7 @@ import synapse.lib.gis as s_gis
 import synapse.lib.cell as s_cell
 import synapse.lib.coro as s_coro
 import synapse.lib.cache as s_cache
+import synapse.lib.const as s_const
 import synapse.lib.nexus as s_nexus
 import synapse.lib.queue as s_queue
 import synapse.lib.urlhelp as s_urlhelp
@@ -102,8 +104,10 @@ reqValidLdef = s_config.getJsValidator({
         'lmdb:growsize': {'type': 'integer'},
         'logedits': {'type': 'boolean', 'default': True},
         'cache:size': {'type': ['integer', 'null'], 'minimum': 1},
+        'cache:bytes': {'type': ['integer', 'null'], 'minimum': 1},
         'name': {'type': 'string'},
         'readonly': {'type': 'boolean', 'default': False},
+        'trigram:props': {'type': 'array', 'items': {'type': 'string'}, 'uniqueItems': True},
     },
     'additionalProperties': True,
     'required': ['iden', 'creator', 'lockmemory'],
@@ -112,6 +116,16 @@ reqValidLdef = s_config.getJsValidator({
 WINDOW_MAXSIZE = 10_000
 MIGR_COMMIT_SIZE = 1_000
 
+# the maximum number of z-order cells used to cover a geo near= search
+GEO_MAX_CELLS = 32
+
+# ival durations are bucketed by bit length for the ival index
+IVAL_DUR_CLASSES = 65
+
+# layers with more storage nodes than this do not keep a buid presence filter
+BUID_BLOOM_MAXSIZE = 1_000_000
+BUID_BLOOM_MINBITS = 2 ** 16
+
 class LayerApi(s_cell.CellApi):
 
     async def __anit__(self, core, link, user, layr):
@@ -203,6 +217,7 @@ class LayerApi(s_cell.CellApi):
         return self.layr.iden
 
 BUID_CACHE_SIZE = 10000
+BUID_CACHE_BYTES = 64 * s_const.mebibyte
 
 STOR_TYPE_UTF8 = 1
 
@@ -260,6 +275,38 @@ EDIT_EDGE_DEL = 11     # (<etyp>, (<verb>, <destnodeiden>), ())
 
 EDIT_PROGRESS = 100   # (used by syncIndexEvents) (<etyp>, (), ())
 
+class BuidBloom:
+    '''
+    A bloom filter which tracks the buids which may have storage nodes in a layer.
+
+    Buids are already uniformly distributed hashes, so the filter bits are
+    taken directly from slices of the buid bytes.
+    '''
+    def __init__(self, size):
+
+        bits = BUID_BLOOM_MINBITS
+        while bits < size * 16:
+            bits *= 2
+
+        self.mask = bits - 1
+        self.byts = bytearray(bits // 8)
+
+        self.size = 0
+        self.maxsize = bits // 8
+
+    def add(self, buid):
+        for offs in (0, 4, 8, 12):
+            bitn = int.from_bytes(buid[offs:offs + 4], 'big') & self.mask
+            self.byts[bitn >> 3] |= 1 << (bitn & 7)
+        self.size += 1
+
+    def has(self, buid):
+        for offs in (0, 4, 8, 12):
+            bitn = int.from_bytes(buid[offs:offs + 4], 'big') & self.mask
+            if not self.byts[bitn >> 3] & (1 << (bitn & 7)):
+                return False
+        return True
+
 class IndxBy:
     '''
     IndxBy sub-classes encapsulate access methods and encoding details for
@@ -563,11 +610,41 @@ class StorTypeUtf8(StorType):
 
         self.lifters.update({
             '=': self._liftUtf8Eq,
-            '~=': self._liftRegx,
+            '~=': self._liftUtf8Regx,
             '^=': self._liftUtf8Prefix,
             'range=': self._liftUtf8Range,
         })
 
+    async def _liftUtf8Regx(self, liftby, valu, reverse=False):
+
+        trigrams = None
+        if isinstance(liftby, (IndxByForm, IndxByProp)) and liftby.abrv in self.layr.trigramready:
+            trigrams = getRegxTrigrams(valu)
+
+        # without required literals every value must be checked
+        if not trigrams:
+            async for item in self._liftRegx(liftby, valu, reverse=reverse):
+                yield item
+            return
+
+        regx = regex.compile(valu, flags=regex.I)
+
+        items = []
+        for buid in self.layr._iterTrigramBuids(liftby.abrv, trigrams):
+
+            await asyncio.sleep(0)
+
+            storvalu = liftby.getNodeValu(buid)
+            if not isinstance(storvalu, str) or regx.search(storvalu) is None:
+                continue
+
+            items.append((liftby.abrv + self._getIndxByts(storvalu), buid))
+
+        # yield in index order to allow merging with the other layers
+        items.sort(reverse=reverse)
+        for item in items:
+            yield item
+
     async def _liftUtf8Eq(self, liftby, valu, reverse=False):
         if reverse:
             scan = liftby.keyBuidsByDupsBack
@@ -1260,14 +1337,20 @@ class StorTypeIval(StorType):
             yield item
 
     async def _liftIvalAt(self, liftby, valu, reverse=False):
+
+        minindx = self.timetype.getIntIndx(valu[0])
+        maxindx = self.timetype.getIntIndx(valu[1])
+
+        if isinstance(liftby, (IndxByForm, IndxByProp)):
+            async for item in self._liftIvalAtIndx(liftby, minindx, maxindx, reverse=reverse):
+                yield item
+            return
+
         if reverse:
             scan = liftby.scanByPrefBack
         else:
             scan = liftby.scanByPref
 
-        minindx = self.timetype.getIntIndx(valu[0])
-        maxindx = self.timetype.getIntIndx(valu[1])
-
         for lkey, buid in scan():
 
             tick = lkey[-16:-8]
@@ -1282,6 +1365,49 @@ class StorTypeIval(StorType):
 
             yield lkey, buid
 
+    async def _liftIvalAtIndx(self, liftby, minindx, maxindx, reverse=False):
+
+        minint = int.from_bytes(minindx, 'big')
+        maxint = int.from_bytes(maxindx, 'big')
+
+        if maxint == 0:
+            return
+
+        # an interval in duration class N is shorter than 2**N so any
+        # overlapping interval must start after minint - 2**N
+        genrs = []
+        for durclass in range(IVAL_DUR_CLASSES):
+            prefix = liftby.abrv + durclass.to_bytes(1, 'big')
+            tickmin = max(minint - (1 << durclass), 0).to_bytes(8, 'big')
+            tickmax = (maxint - 1).to_bytes(8, 'big')
+            genrs.append(self._iterIvalRows(prefix, tickmin, tickmax, minindx, reverse=reverse))
+
+        for item in heapq.merge(*genrs, reverse=reverse):
+            await asyncio.sleep(0)
+            yield item
+
+    def _iterIvalRows(self, prefix, tickmin, tickmax, minindx, reverse=False):
+
+        if reverse:
+            rows = self.layr.layrslab.scanByRangeBack(prefix + tickmax + b'\xff' * 8, prefix + tickmin, db=self.layr.byival)
+        else:
+            rows = self.layr.layrslab.scanByRange(prefix + tickmin, prefix + tickmax, db=self.layr.byival)
+
+        # lkey = <abrv> <durclass> <tick> <tock>
+        for lkey, buid in rows:
+
+            if lkey[-8:] <= minindx:
+                continue
+
+            yield lkey[:8] + lkey[9:], buid
+
+    def getDurIndx(self, indx):
+        '''
+        Return the duration class byte for an ival index.
+        '''
+        dura = int.from_bytes(indx[8:], 'big') - int.from_bytes(indx[:8], 'big')
+        return max(dura, 0).bit_length().to_bytes(1, 'big')
+
     def indx(self, valu):
         return (self.timetype.getIntIndx(valu[0]) + self.timetype.getIntIndx(valu[1]),)
 
@@ -1340,6 +1466,9 @@ class StorTypeLatLon(StorType):
         self.latspace = 90 * 10 ** 8
         self.lonspace = 180 * 10 ** 8
 
+        self.latmax = self.latspace * 2
+        self.lonmax = self.lonspace * 2
+
         self.lifters.update({
             '=': self._liftLatLonEq,
             'near=': self._liftLatLonNear,
@@ -1357,6 +1486,142 @@ class StorTypeLatLon(StorType):
 
     async def _liftLatLonNear(self, liftby, valu, reverse=False):
 
+        if not isinstance(liftby, (IndxByForm, IndxByProp)):
+            async for item in self._liftLatLonNearScan(liftby, valu, reverse=reverse):
+                yield item
+            return
+
+        (lat, lon), dist = valu
+
+        latmin, latmax, lonmin, lonmax = s_gis.bbox(lat, lon, dist)
+
+        latmin = max(latmin, -90.0)
+        latmax = min(latmax, 90.0)
+
+        # split boxes which wrap around the antimeridian
+        if lonmax - lonmin >= 360.0:
+            lonboxes = ((-180.0, 180.0),)
+        elif lonmin < -180.0:
+            lonboxes = ((lonmin + 360.0, 180.0), (-180.0, lonmax))
+        elif lonmax > 180.0:
+            lonboxes = ((lonmin, 180.0), (-180.0, lonmax - 360.0))
+        else:
+            lonboxes = ((lonmin, lonmax),)
+
+        latminvalu = round(latmin * self.scale) + self.latspace
+        latmaxvalu = round(latmax * self.scale) + self.latspace
+
+        latminindx = latminvalu.to_bytes(5, 'big')
+        latmaxindx = latmaxvalu.to_bytes(5, 'big')
+
+        items = []
+        for boxmin, boxmax in lonboxes:
+
+            lonminvalu = round(boxmin * self.scale) + self.lonspace
+            lonmaxvalu = round(boxmax * self.scale) + self.lonspace
+
+            lonminindx = lonminvalu.to_bytes(5, 'big')
+            lonmaxindx = lonmaxvalu.to_bytes(5, 'big')
+
+            for zmin, zmax in self._getZordRanges(lonminvalu, lonmaxvalu, latminvalu, latmaxvalu):
+
+                await asyncio.sleep(0)
+
+                for lkey, buid in self.layr._iterGeoRows(liftby.abrv, zmin, zmax):
+
+                    # lkey = <abrv> <zord> <lonindx> <latindx>
+                    lonbyts = lkey[16:21]
+                    if lonbyts < lonminindx or lonbyts > lonmaxindx:
+                        continue
+
+                    latbyts = lkey[21:26]
+                    if latbyts < latminindx or latbyts > latmaxindx:
+                        continue
+
+                    latvalu = (int.from_bytes(latbyts, 'big') - self.latspace) / self.scale
+                    lonvalu = (int.from_bytes(lonbyts, 'big') - self.lonspace) / self.scale
+
+                    if s_gis.haversine((lat, lon), (latvalu, lonvalu)) <= dist:
+                        items.append((liftby.abrv + lonbyts + latbyts, buid))
+
+        # yield in index order to allow merging with the other layers
+        items.sort(reverse=reverse)
+        for item in items:
+            yield item
+
+    def _getZordQuant(self, lonvalu, latvalu):
+        # quantize the scaled lon/lat values to 32 bits each
+        lonq = min(max(lonvalu, 0), self.lonmax) * ZORD_SIZE // (self.lonmax + 1)
+        latq = min(max(latvalu, 0), self.latmax) * ZORD_SIZE // (self.latmax + 1)
+        return lonq, latq
+
+    def _getZordRanges(self, lonmin, lonmax, latmin, latmax):
+        '''
+        Return a list of (zmin, zmax) z-order ranges which cover the given box.
+        '''
+        xmin, ymin = self._getZordQuant(lonmin, latmin)
+        xmax, ymax = self._getZordQuant(lonmax, latmax)
+
+        # start at the smallest cells which cover the box with at most 2x2 cells
+        span = max(xmax - xmin, ymax - ymin) + 1
+        level = max(0, 32 - span.bit_length())
+        shift = 32 - level
+
+        cells = []
+        todo = collections.deque()
+        for cx in range(xmin >> shift, (xmax >> shift) + 1):
+            for cy in range(ymin >> shift, (ymax >> shift) + 1):
+                todo.append((level, cx, cy))
+
+        while todo:
+
+            level, cx, cy = todo.popleft()
+
+            shift = 32 - level
+
+            x0 = cx << shift
+            y0 = cy << shift
+            x1 = x0 + (1 << shift) - 1
+            y1 = y0 + (1 << shift) - 1
+
+            if x0 > xmax or x1 < xmin or y0 > ymax or y1 < ymin:
+                continue
+
+            inside = x0 >= xmin and x1 <= xmax and y0 >= ymin and y1 <= ymax
+            if inside or level == 32 or len(cells) + len(todo) + 4 > GEO_MAX_CELLS:
+                zmin = zordEncode(x0, y0)
+                cells.append((zmin, zmin + (1 << (shift * 2)) - 1))
+                continue
+
+            cx <<= 1
+            cy <<= 1
+            level += 1
+
+            todo.append((level, cx, cy))
+            todo.append((level, cx, cy + 1))
+            todo.append((level, cx + 1, cy))
+            todo.append((level, cx + 1, cy + 1))
+
+        cells.sort()
+
+        ranges = []
+        for zmin, zmax in cells:
+            if ranges and ranges[-1][1] + 1 == zmin:
+                ranges[-1] = (ranges[-1][0], zmax)
+                continue
+            ranges.append((zmin, zmax))
+
+        return ranges
+
+    def getZordIndx(self, indx):
+        '''
+        Return the z-order key bytes for a lon/lat index.
+        '''
+        lonq, latq = self._getZordQuant(int.from_bytes(indx[:5], 'big'), int.from_bytes(indx[5:], 'big'))
+        return zordEncode(lonq, latq).to_bytes(8, 'big')
+
+    async def _liftLatLonNearScan(self, liftby, valu, reverse=False):
+
         (lat, lon), dist = valu
 
         # latscale = (lat * self.scale) + self.latspace
@@ -1492,6 +1757,18 @@ class Layer(s_nexus.Pusher):
 
         await self._initLayerStorage()
 
+        self.trigramtasks = {}
+        self.trigramabrvs = self._getTrigramAbrvs(layrinfo.get('trigram:props', ()))
+
+        # only indexes which have been fully built are used for lifts
+        ready = {s_common.uhex(abrv) for abrv in self.meta.get('trigram:ready', ())}
+        self.trigramready = ready & self.trigramabrvs.keys()
+
+        # the presence filter is built in the background and unused until complete
+        self.buidbloom = None
+        self.buidbloominit = None
+        self.buidbloomtask = self.schedCoro(self._initBuidBloom())
+
         self.editors = [
             self._editNodeAdd,
             self._editNodeDel,
@@ -1513,10 +1790,12 @@ class Layer(s_nexus.Pusher):
         self.windows = set()
         self.upstreamwaits = collections.defaultdict(lambda: collections.defaultdict(list))
 
-        self.buidcache = s_cache.LruDict(self._getBuidCacheSize())
+        self.buidcache = s_cache.SlruCache(self._getBuidCacheSize(), maxbytes=self._getBuidCacheBytes())
 
         self.onfini(self._onLayrFini)
 
+        self._initTrigramTasks()
+
         # if we are a mirror, we upstream all our edits and
         # wait for them to make it back down the pipe...
         self.leader = None
@@ -1541,6 +1820,123 @@ class Layer(s_nexus.Pusher):
 
         return BUID_CACHE_SIZE
 
+    def _getBuidCacheBytes(self):
+        '''
+        Resolve the BUID cache byte limit with priority: layer config > cortex conf > default.
+        '''
+        cachebytes = self.layrinfo.get('cache:bytes')
+        if cachebytes is not None:
+            return cachebytes
+
+        cachebytes = self.core.conf.get('layers:cache:bytes')
+        if cachebytes is not None:
+            return cachebytes
+
+        return BUID_CACHE_BYTES
+
+    def _getTrigramAbrvs(self, names):
+
+        abrvs = {}
+        for name in names:
+
+            prop = self.core.model.prop(name)
+            if prop is None:
+                logger.warning(f'Layer {self.iden} has a trigram index for a missing property: {name}')
+                continue
+
+            if prop.isform:
+                abrvs[self.setPropAbrv(prop.name, None)] = (prop.name, None)
+            else:
+                abrvs[self.setPropAbrv(prop.form.name, prop.name)] = (prop.form.name, prop.name)
+
+        return abrvs
+
+    async def _setTrigramProps(self, names):
+
+        if names is None:
+            names = ()
+
+        abrvs = self._getTrigramAbrvs(names)
+
+        for abrv in self.trigramabrvs.keys() - abrvs.keys():
+
+            self.trigramabrvs.pop(abrv)
+
+            task = self.trigramtasks.pop(abrv, None)
+            if task is not None:
+                task.cancel()
+
+            self._setTrigramReady(abrv, False)
+            await self._dropTrigramIndx(abrv)
+
+        for abrv in abrvs.keys() - self.trigramabrvs.keys():
+            # new values are indexed by edits while the existing values are indexed in the background
+            self.trigramabrvs[abrv] = abrvs[abrv]
+            self._schedTrigramIndx(abrv)
+
+    def _initTrigramTasks(self):
+        for abrv in self.trigramabrvs.keys() - self.trigramready:
+            self._schedTrigramIndx(abrv)
+
+    def _schedTrigramIndx(self, abrv):
+        self.trigramtasks[abrv] = self.schedCoro(self._initTrigramIndx(abrv, *self.trigramabrvs[abrv]))
+
+    def _setTrigramReady(self, abrv, ready):
+
+        if ready:
+            self.trigramready.add(abrv)
+        else:
+            self.trigramready.discard(abrv)
+
+        self.meta.set('trigram:ready', [s_common.ehex(abrv) for abrv in self.trigramready])
+
+    async def _initTrigramIndx(self, abrv, form, prop):
+        '''
+        Index the existing values of a property and begin using the index for lifts once complete.
+        '''
+        logger.warning(f'Adding trigram index for {form} {prop} to layer {self.iden}')
+
+        stortype = self.stortypes[STOR_TYPE_UTF8]
+
+        for i, (lkey, buid) in enumerate(self.layrslab.scanByPref(abrv, db=self.byprop)):
+
+            valu = stortype.decodeIndx(lkey[8:])
+            if valu is s_common.novalu:
+
+                sode = self._getStorNode(buid)
+                if sode is None: # pragma: no cover
+                    continue
+
+                if prop is None:
+                    valt = sode.get('valu')
+                else:
+                    valt = sode['props'].get(prop)
+
+                if valt is None: # pragma: no cover
+                    continue
+
+                valu = valt[0]
+
+            self._putTrigrams(abrv, buid, valu)
+
+            if i % 1000 == 0:
+                await asyncio.sleep(0)
+
+        self.trigramtasks.pop(abrv, None)
+        self._setTrigramReady(abrv, True)
+
+        logger.warning('...complete!')
+
+    async def _dropTrigramIndx(self, abrv):
+
+        lkeys = list(self.layrslab.scanKeysByPref(abrv, db=self.bytrigram, nodup=True))
+        for i, lkey in enumerate(lkeys):
+
+            self.layrslab.delete(lkey, db=self.bytrigram)
+
+            if i % 1000 == 0:
+                await asyncio.sleep(0)
+
     def _reqNotReadOnly(self):
         if self.readonly and not self.core.migration:
             mesg = f'Layer {self.iden} is read only!'
@@ -1666,7 +2062,7 @@ class Layer(s_nexus.Pusher):
     def _testDelTagIndx(self, buid, form, tag):
         formabrv = self.setPropAbrv(form, None)
         tagabrv = self.tagabrv.bytsToAbrv(tag.encode())
-        self.layrslab.delete(tagabrv + formabrv, buid, db=self.bytag)
+        self._delTagIndx(tagabrv + formabrv, buid)
 
     def _testDelPropIndx(self, buid, form, prop):
         sode = self._getStorNode(buid)
@@ -1674,20 +2070,20 @@ class Layer(s_nexus.Pusher):
 
         abrv = self.setPropAbrv(form, prop)
         for indx in self.stortypes[stortype].indx(storvalu):
-            self.layrslab.delete(abrv + indx, buid, db=self.byprop)
+            self._delIndx(abrv + indx, buid, self.byprop, self.propcounts)
 
     def _testDelTagStor(self, buid, form, tag):
-        sode = self._getStorNode(buid)
+        sode = self._genStorNode(buid)
         sode['tags'].pop(tag, None)
         self.setSodeDirty(buid, sode, form)
 
     def _testDelPropStor(self, buid, form, prop):
-        sode = self._getStorNode(buid)
+        sode = self._genStorNode(buid)
         sode['props'].pop(prop, None)
         self.setSodeDirty(buid, sode, form)
 
     def _testDelFormValuStor(self, buid, form):
-        sode = self._getStorNode(buid)
+        sode = self._genStorNode(buid)
         sode['valu'] = None
         self.setSodeDirty(buid, sode, form)
 
@@ -1695,18 +2091,18 @@ class Layer(s_nexus.Pusher):
         modlprop = self.core.model.prop(f'{form}:{prop}')
         abrv = self.setPropAbrv(form, prop)
         for indx in self.stortypes[modlprop.type.stortype].indx(valu):
-            self.layrslab.put(abrv + indx, buid, db=self.byprop)
+            self._putIndx(abrv + indx, buid, self.byprop, self.propcounts)
 
     def _testAddPropArrayIndx(self, buid, form, prop, valu):
         modlprop = self.core.model.prop(f'{form}:{prop}')
         abrv = self.setPropAbrv(form, prop)
         for indx in self.getStorIndx(modlprop.type.stortype, valu):
-            self.layrslab.put(abrv + indx, buid, db=self.byarray)
+            self._putIndx(abrv + indx, buid, self.byarray, self.arraycounts)
 
     def _testAddTagIndx(self, buid, form, tag):
         formabrv = self.setPropAbrv(form, None)
         tagabrv = self.tagabrv.bytsToAbrv(tag.encode())
-        self.layrslab.put(tagabrv + formabrv, buid, db=self.bytag)
+        self._putTagIndx(tagabrv + formabrv, buid)
 
     def _testAddTagPropIndx(self, buid, form, tag, prop, valu):
         tpabrv = self.setTagPropAbrv(None, tag, prop)
@@ -1714,8 +2110,8 @@ class Layer(s_nexus.Pusher):
 
         tagprop = self.core.model.tagprop(prop)
         for indx in self.stortypes[tagprop.type.stortype].indx(valu):
-            self.layrslab.put(tpabrv + indx, buid, db=self.bytagprop)
-            self.layrslab.put(ftpabrv + indx, buid, db=self.bytagprop)
+            self._putIndx(tpabrv + indx, buid, self.bytagprop, self.tagpropcounts)
+            self._putIndx(ftpabrv + indx, buid, self.bytagprop, self.tagpropcounts)
 
     async def verify(self, config=None):
 
@@ -1835,7 +2231,7 @@ class Layer(s_nexus.Pusher):
                 sode['tags'][tag] = (None, None)
                 self.setSodeDirty(buid, sode, form)
             elif autofix == 'index':
-                self.layrslab.delete(lkey, buid, db=self.bytag)
+                self._delTagIndx(lkey, buid)
 
         for lkey, buid in self.layrslab.scanByPref(tagabrv, db=self.bytag):
 
@@ -1861,7 +2257,7 @@ class Layer(s_nexus.Pusher):
 
         async def tryfix(lkey, buid):
             if autofix == 'index':
-                self.layrslab.delete(lkey, buid, db=self.byprop)
+                self._delIndx(lkey, buid, self.byprop, self.propcounts)
 
         for lkey, buid in self.layrslab.scanByPref(abrv, db=self.byprop):
 
@@ -1918,7 +2314,7 @@ class Layer(s_nexus.Pusher):
 
         async def tryfix(lkey, buid):
             if autofix == 'index':
-                self.layrslab.delete(lkey, buid, db=self.byarray)
+                self._delIndx(lkey, buid, self.byarray, self.arraycounts)
 
         for lkey, buid in self.layrslab.scanByPref(abrv, db=self.byarray):
 
@@ -1977,7 +2373,7 @@ class Layer(s_nexus.Pusher):
 
         async def tryfix(lkey, buid):
             if autofix == 'index':
-                self.layrslab.delete(lkey, buid, db=self.bytagprop)
+                self._delIndx(lkey, buid, self.bytagprop, self.tagpropcounts)
 
         for lkey, buid in self.layrslab.scanByPref(abrv, db=self.bytagprop):
 
@@ -2699,6 +3095,113 @@ class Layer(s_nexus.Pusher):
 
         logger.warning('...complete!')
 
+    async def _layrV11toV12(self):
+
+        logger.warning(f'Adding index counters to layer {self.iden}')
+
+        async def calcIndxCounts(db, counts, *sizes):
+
+            vals = collections.defaultdict(int)
+            for i, lkey in enumerate(self.layrslab.scanKeys(db=db, nodup=True)):
+
+                count = self.layrslab.count(lkey, db=db)
+                for size in sizes:
+                    vals[lkey[:size]] += count
+
+                if i % 1000 == 0:
+                    await asyncio.sleep(0)
+
+            for abrv, count in vals.items():
+                counts.set(abrv.hex(), count)
+
+        await calcIndxCounts(self.bytag, self.tagcounts, 8, 16)
+        await calcIndxCounts(self.byprop, self.propcounts, 8)
+        await calcIndxCounts(self.byarray, self.arraycounts, 8)
+        await calcIndxCounts(self.bytagprop, self.tagpropcounts, 8)
+
+        self.meta.set('version', 12)
+        self.layrvers = 12
+
+        logger.warning('...complete!')
+
+    async def _layrV12toV13(self):
+
+        logger.warning(f'Adding geo index to layer {self.iden}')
+
+        async def commit():
+            await self.layrslab.putmulti(putkeys, db=self.bygeo)
+            putkeys.clear()
+
+        stor = self.stortypes[STOR_TYPE_LATLONG]
+
+        putkeys = []
+        for form, prop in self._getStorTypeProps(STOR_TYPE_LATLONG):
+
+            abrv = self.getPropAbrv(form, prop)
+            for lkey, buid in self.layrslab.scanByPref(abrv, db=self.byprop):
+
+                indx = lkey[8:]
+                putkeys.append((abrv + stor.getZordIndx(indx) + indx, buid))
+
+                if len(putkeys) > MIGR_COMMIT_SIZE:
+                    await commit()
+
+        if putkeys:
+            await commit()
+
+        self.meta.set('version', 13)
+        self.layrvers = 13
+
+        logger.warning('...complete!')
+
+    async def _layrV13toV14(self):
+
+        logger.warning(f'Adding ival index to layer {self.iden}')
+
+        async def commit():
+            await self.layrslab.putmulti(putkeys, db=self.byival)
+            putkeys.clear()
+
+        stor = self.stortypes[STOR_TYPE_IVAL]
+
+        putkeys = []
+        for form, prop in self._getStorTypeProps(STOR_TYPE_IVAL):
+
+            abrv = self.getPropAbrv(form, prop)
+            for lkey, buid in self.layrslab.scanByPref(abrv, db=self.byprop):
+
+                indx = lkey[8:]
+                putkeys.append((abrv + stor.getDurIndx(indx) + indx, buid))
+
+                if len(putkeys) > MIGR_COMMIT_SIZE:
+                    await commit()
+
+        if putkeys:
+            await commit()
+
+        self.meta.set('version', 14)
+        self.layrvers = 14
+
+        logger.warning('...complete!')
+
+    def _getStorTypeProps(self, stortype):
+        '''
+        Yield (form, prop) tuples for non-array model props in the layer with the given stortype.
+        '''
+        for form, prop in list(self.getFormProps()):
+
+            if form is None:
+                modlprop = self.core.model.prop(prop)
+            elif prop is None:
+                modlprop = self.core.model.form(form)
+            elif prop[0] == '.':
+                modlprop = self.core.model.prop(form + prop)
+            else:
+                modlprop = self.core.model.prop(f'{form}:{prop}')
+
+            if modlprop is not None and modlprop.type.stortype == stortype:
+                yield form, prop
+
     async def _initSlabs(self, slabopts):
 
         otherslabopts = {
@@ -2718,6 +3221,12 @@ class Layer(s_nexus.Pusher):
 
         self.formcounts = await self.layrslab.getHotCount('count:forms')
 
+        # per-abrv row counts for the prop/array/tag/tagprop indexes
+        self.tagcounts = await self.layrslab.getHotCount('count:bytag')
+        self.propcounts = await self.layrslab.getHotCount('count:byprop')
+        self.arraycounts = await self.layrslab.getHotCount('count:byarray')
+        self.tagpropcounts = await self.layrslab.getHotCount('count:bytagprop')
+
         nodeeditpath = s_common.genpath(self.dirn, 'nodeedits.lmdb')
         self.nodeeditslab = await s_lmdbslab.Slab.anit(nodeeditpath, **otherslabopts)
 
@@ -2740,6 +3249,9 @@ class Layer(s_nexus.Pusher):
         self.byprop = self.layrslab.initdb('byprop', dupsort=True)
         self.byarray = self.layrslab.initdb('byarray', dupsort=True)
         self.bytagprop = self.layrslab.initdb('bytagprop', dupsort=True)
+        self.bytrigram = self.layrslab.initdb('bytrigram', dupsort=True)
+        self.bygeo = self.layrslab.initdb('bygeo', dupsort=True)
+        self.byival = self.layrslab.initdb('byival', dupsort=True)
 
         self.countdb = self.layrslab.initdb('counters')
         self.nodedata = self.dataslab.initdb('nodedata')
@@ -2760,7 +3272,7 @@ class Layer(s_nexus.Pusher):
         await self._initSlabs(slabopts)
 
         if self.fresh:
-            self.meta.set('version', 11)
+            self.meta.set('version', 14)
 
         self.layrslab.addResizeCallback(self.core.checkFreeSpace)
         self.dataslab.addResizeCallback(self.core.checkFreeSpace)
@@ -2798,8 +3310,17 @@ class Layer(s_nexus.Pusher):
         if self.layrvers < 11:
             await self._layrV10toV11()
 
-        if self.layrvers != 11:
-            mesg = f'Got layer version {self.layrvers}.  Expected 11.  Accidental downgrade?'
+        if self.layrvers < 12:
+            await self._layrV11toV12()
+
+        if self.layrvers < 13:
+            await self._layrV12toV13()
+
+        if self.layrvers < 14:
+            await self._layrV13toV14()
+
+        if self.layrvers != 14:
+            mesg = f'Got layer version {self.layrvers}.  Expected 14.  Accidental downgrade?'
             raise s_exc.BadStorageVersion(mesg=mesg)
 
     async def getLayerSize(self):
@@ -2817,6 +3338,9 @@ class Layer(s_nexus.Pusher):
             mesg = 'Layer only supports setting "mirror" and "upstream" to None.'
             raise s_exc.BadOptValu(mesg=mesg)
 
+        if name == 'trigram:props':
+            valu = reqValidTrigramProps(self.core.model, valu)
+
         return await self._push('layer:set', name, valu)
 
     @s_nexus.Pusher.onPush('layer:set')
@@ -2824,7 +3348,8 @@ class Layer(s_nexus.Pusher):
         '''
         Set a mutable layer property.
         '''
-        if name not in ('name', 'desc', 'cache:size', 'logedits', 'readonly', 'mirror', 'upstream'):
+        if name not in ('name', 'desc', 'cache:size', 'cache:bytes', 'logedits', 'readonly', 'mirror', 'upstream',
+                        'trigram:props'):
             mesg = f'{name} is not a valid layer info key'
             raise s_exc.BadOptValu(mesg=mesg)
 
@@ -2834,7 +3359,15 @@ class Layer(s_nexus.Pusher):
                 mesg = 'cache:size must be >= 1'
                 raise s_exc.BadOptValu(mesg=mesg)
 
-            self.buidcache = s_cache.LruDict(valu)
+            self.buidcache.resize(valu, maxbytes=self.buidcache.maxbytes)
+
+        elif name == 'cache:bytes':
+            valu = int(valu)
+            if valu < 1:
+                mesg = 'cache:bytes must be >= 1'
+                raise s_exc.BadOptValu(mesg=mesg)
+
+            self.buidcache.resize(self.buidcache.maxsize, maxbytes=valu)
 
         elif name == 'logedits':
             valu = bool(valu)
@@ -2851,6 +3384,11 @@ class Layer(s_nexus.Pusher):
         elif name == 'upstream' and valu is None:
             self._stopUpstream()
 
+        elif name == 'trigram:props':
+            await self._setTrigramProps(valu)
+            if not valu:
+                valu = None
+
         # TODO when we can set more props, we may need to parse values.
         if valu is None:
             self.layrinfo.pop(name, None)
@@ -2864,6 +3402,7 @@ class Layer(s_nexus.Pusher):
 
     async def stat(self):
         ret = {**self.layrslab.statinfo(),
+               'buidcache': self.buidcache.stat(),
                }
         if self.logedits:
             ret['nodeeditlog_indx'] = (self.nodeeditlog.index(), 0, 0)
@@ -2932,6 +3471,56 @@ class Layer(s_nexus.Pusher):
         sode['form'] = form
         self.dirty[buid] = sode
 
+        if self.buidbloominit is not None:
+            self.buidbloominit.add(buid)
+
+        if self.buidbloom is not None and not self.buidbloom.has(buid):
+            self.buidbloom.add(buid)
+            # stop using the filter once it is over capacity
+            if self.buidbloom.size > self.buidbloom.maxsize:
+                self.buidbloom = None
+
+    async def _initBuidBloom(self):
+        '''
+        Build a presence filter for the buids with storage nodes in a small layer.
+
+        NOTE: Buids which are written while the filter is being built are
+              added to it by setSodeDirty().
+        '''
+        count = self.getStorNodeCount()
+        if count > BUID_BLOOM_MAXSIZE:
+            return
+
+        bloom = self.buidbloominit = BuidBloom(count * 2)
+
+        try:
+
+            for buid in self.dirty:
+                bloom.add(buid)
+
+            for i, buid in enumerate(self.layrslab.scanKeys(db=self.bybuidv3)):
+
+                bloom.add(buid)
+
+                if i % 1000 == 0:
+                    await asyncio.sleep(0)
+
+        finally:
+            self.buidbloominit = None
+
+        if bloom.size > bloom.maxsize:
+            return
+
+        self.buidbloom = bloom
+
+    def mayHaveStorNode(self, buid):
+        '''
+        Return False if the layer definitely has no storage node for the buid.
+        '''
+        if self.buidbloom is None:
+            return True
+        return buid in self.dirty or self.buidbloom.has(buid)
+
     async def _onLayrSlabCommit(self, mesg):
         await self._saveDirtySodes()
 
@@ -2944,8 +3533,9 @@ class Layer(s_nexus.Pusher):
         kvlist = []
 
         for buid, sode in self.dirty.items():
-            self.buidcache[buid] = sode
-            kvlist.append((buid, s_msgpack.en(sode)))
+            byts = s_msgpack.en(sode)
+            self.buidcache.put(buid, sode, len(byts))
+            kvlist.append((buid, byts))
 
         self.layrslab._putmulti(kvlist, db=self.bybuidv3)
         self.dirty.clear()
@@ -2955,18 +3545,70 @@ class Layer(s_nexus.Pusher):
         return info.get('entries', 0)
 
     async def getStorNode(self, buid):
+        '''
+        Return the storage node for the given buid.
+
+        NOTE: The returned storage node is shared and must be treated as
+              read-only. Use copyStorNode() to get a mutable copy.
+        '''
         sode = self._getStorNode(buid)
         if sode is not None:
-            return deepcopy(sode)
+            return sode
         return {}
 
+    async def getStorNodesBatch(self, buids):
+        '''
+        Return a list of storage nodes for the given buids.
+
+        Storage nodes which are not dirty or cached are read in sorted order
+        using a single cursor. Missing storage nodes are returned as empty dicts.
+
+        NOTE: The returned storage nodes are shared and must be treated as read-only.
+        '''
+        retn = [None] * len(buids)
+
+        todo = []
+        for indx, buid in enumerate(buids):
+
+            sode = self.dirty.get(buid)
+            if sode is None:
+                sode = self.buidcache.get(buid)
+
+            if sode is None:
+                if not self.mayHaveStorNode(buid):
+                    retn[indx] = {}
+                    continue
+
+                todo.append((buid, indx))
+                continue
+
+            retn[indx] = sode
+
+        if todo:
+            todo.sort()
+
+            lkeys = [buid for (buid, indx) in todo]
+            for (buid, indx), byts in zip(todo, self.layrslab.getmulti(lkeys, db=self.bybuidv3)):
+
+                if byts is None:
+                    retn[indx] = {}
+                    continue
+
+                sode = collections.defaultdict(dict)
+                sode.update(s_msgpack.un(byts))
+                self.buidcache.put(buid, sode, len(byts))
+
+                retn[indx] = sode
+
+        return retn
+
     def _getStorNode(self, buid):
         '''
         Return the storage node for the given buid.
 
-        NOTE: This API returns the *actual* storage node dict if it's
-              dirty. You must make a deep copy if you plan to return it
-              outside of the Layer.
+        NOTE: This API returns the *actual* storage node dict. Storage nodes
+              are copy-on-write; editors replace them via _genStorNode() rather
+              than mutating them, so callers must never modify the result.
         '''
 
         # check the dirty nodes first
@@ -2978,27 +3620,28 @@ class Layer(s_nexus.Pusher):
         if sode is not None:
             return sode
 
+        if not self.mayHaveStorNode(buid):
+            return None
+
         byts = self.layrslab.get(buid, db=self.bybuidv3)
         if byts is None:
             return None
 
         sode = collections.defaultdict(dict)
         sode.update(s_msgpack.un(byts))
-        self.buidcache[buid] = sode
+        self.buidcache.put(buid, sode, len(byts))
 
         return sode
 
     def _genStorNode(self, buid):
-        # get or create the storage node. this returns the *actual* storage node
+        # get or create a private copy of the storage node for editing.
+        # the copy replaces the shared version when passed to setSodeDirty()
 
         sode = self._getStorNode(buid)
         if sode is not None:
-            return sode
+            return copyStorNode(sode)
 
-        sode = collections.defaultdict(dict)
-        self.buidcache[buid] = sode
-
-        return sode
+        return collections.defaultdict(dict)
 
     async def getTagCount(self, tagname, formname=None):
         '''
@@ -3008,12 +3651,11 @@ class Layer(s_nexus.Pusher):
             abrv = self.tagabrv.bytsToAbrv(tagname.encode())
             if formname is not None:
                 abrv += self.getPropAbrv(formname, None)
-                return self.layrslab.count(abrv, db=self.bytag)
 
         except s_exc.NoSuchAbrv:
             return 0
 
-        return await self.layrslab.countByPref(abrv, db=self.bytag)
+        return self.tagcounts.get(abrv.hex())
 
     async def getPropCount(self, formname, propname=None, maxsize=None):
         '''
@@ -3024,7 +3666,11 @@ class Layer(s_nexus.Pusher):
         except s_exc.NoSuchAbrv:
             return 0
 
-        return await self.layrslab.countByPref(abrv, db=self.byprop, maxsize=maxsize)
+        count = self.propcounts.get(abrv.hex())
+        if maxsize is not None:
+            return min(count, maxsize)
+
+        return count
 
     def getPropValuCount(self, formname, propname, stortype, valu):
         try:
@@ -3050,7 +3696,7 @@ class Layer(s_nexus.Pusher):
         except s_exc.NoSuchAbrv:
             return 0
 
-        return await self.layrslab.countByPref(abrv, db=self.byarray)
+        return self.arraycounts.get(abrv.hex())
 
     def getPropArrayValuCount(self, formname, propname, stortype, valu):
         try:
@@ -3073,7 +3719,11 @@ class Layer(s_nexus.Pusher):
         except s_exc.NoSuchAbrv:
             return 0
 
-        return await self.layrslab.countByPref(abrv, db=self.byprop, maxsize=maxsize)
+        count = self.propcounts.get(abrv.hex())
+        if maxsize is not None:
+            return min(count, maxsize)
+
+        return count
 
     async def getTagPropCount(self, form, tag, prop):
         '''
@@ -3084,7 +3734,7 @@ class Layer(s_nexus.Pusher):
         except s_exc.NoSuchAbrv:
             return 0
 
-        return await self.layrslab.countByPref(abrv, db=self.bytagprop)
+        return self.tagpropcounts.get(abrv.hex())
 
     def getTagPropValuCount(self, form, tag, prop, stortype, valu):
         try:
@@ -3161,7 +3811,7 @@ class Layer(s_nexus.Pusher):
                 # logger.warning(f'TagIndex for #{tag} has {s_common.ehex(buid)} but no storage node.')
                 continue
 
-            yield None, buid, deepcopy(sode)
+            yield None, buid, sode
 
     async def liftByTags(self, tags):
         # todo: support form and reverse kwargs
@@ -3190,7 +3840,7 @@ class Layer(s_nexus.Pusher):
             if sode is None: # pragma: no cover
                 continue
 
-            yield None, buid, deepcopy(sode)
+            yield None, buid, sode
 
     async def liftByTagValu(self, tag, cmpr, valu, form=None, reverse=False):
 
@@ -3219,7 +3869,7 @@ class Layer(s_nexus.Pusher):
                 if sode is None: # pragma: no cover
                     # logger.warning(f'TagValuIndex for #{tag} has {s_common.ehex(buid)} but no storage node.')
                     continue
-                yield None, buid, deepcopy(sode)
+                yield None, buid, sode
 
     async def hasTagProp(self, name):
         async for _ in self.liftTagProp(name):
@@ -3269,7 +3919,7 @@ class Layer(s_nexus.Pusher):
                 # logger.warning(f'TagPropIndex for {form}#{tag}:{prop} has {s_common.ehex(buid)} but no storage node.')
                 continue
 
-            yield lkey[8:], buid, deepcopy(sode)
+            yield lkey[8:], buid, sode
 
     async def liftByTagPropValu(self, form, tag, prop, cmprvals, reverse=False):
         '''
@@ -3284,7 +3934,7 @@ class Layer(s_nexus.Pusher):
                     # logger.warning(f'TagPropValuIndex for {form}#{tag}:{prop} has {s_common.ehex(buid)} but no storage node.')
                     continue
 
-                yield lkey[8:], buid, deepcopy(sode)
+                yield lkey[8:], buid, sode
 
     async def liftByProp(self, form, prop, reverse=False):
 
@@ -3304,7 +3954,7 @@ class Layer(s_nexus.Pusher):
             if sode is None: # pragma: no cover
                 # logger.warning(f'PropIndex for {form}:{prop} has {s_common.ehex(buid)} but no storage node.')
                 continue
-            yield lkey[8:], buid, deepcopy(sode)
+            yield lkey[8:], buid, sode
 
     # NOTE: form vs prop valu lifting is differentiated to allow merge sort
     async def liftByFormValu(self, form, cmprvals, reverse=False):
@@ -3318,7 +3968,7 @@ class Layer(s_nexus.Pusher):
                 if sode is None: # pragma: no cover
                     # logger.warning(f'FormValuIndex for {form} has {s_common.ehex(buid)} but no storage node.')
                     continue
-                yield lkey[8:], buid, deepcopy(sode)
+                yield lkey[8:], buid, sode
 
     async def liftByPropValu(self, form, prop, cmprvals, reverse=False):
         for cmpr, valu, kind in cmprvals:
@@ -3333,7 +3983,7 @@ class Layer(s_nexus.Pusher):
                     # logger.warning(f'PropValuIndex for {form}:{prop} has {s_common.ehex(buid)} but no storage node.')
                     continue
 
-                yield lkey[8:], buid, deepcopy(sode)
+                yield lkey[8:], buid, sode
 
     async def liftByPropArray(self, form, prop, cmprvals, reverse=False):
         for cmpr, valu, kind in cmprvals:
@@ -3342,7 +3992,7 @@ class Layer(s_nexus.Pusher):
                 if sode is None: # pragma: no cover
                     # logger.warning(f'PropArrayIndex for {form}:{prop} has {s_common.ehex(buid)} but no storage node.')
                     continue
-                yield lkey[8:], buid, deepcopy(sode)
+                yield lkey[8:], buid, sode
 
     async def liftByDataName(self, name):
         try:
@@ -3358,13 +4008,13 @@ class Layer(s_nexus.Pusher):
                 # logger.warning(f'PropArrayIndex for {form}:{prop} has {s_common.ehex(buid)} but no storage node.')
                 continue
 
-            sode = deepcopy(sode)
-
             byts = self.dataslab.get(buid + abrv, db=self.nodedata)
             if byts is None:
                 # logger.warning(f'NodeData for {name} has {s_common.ehex(buid)} but no data.')
                 continue
 
+            # shallow copy to avoid adding nodedata to the shared sode
+            sode = dict(sode)
             sode['nodedata'] = {name: s_msgpack.un(byts)}
             yield None, buid, sode
 
@@ -3612,6 +4262,11 @@ class Layer(s_nexus.Pusher):
 
                 await asyncio.sleep(0)
 
+            # the copy is only published once all of its edits are applied so
+            # readers never see a shared storage node change
+            if not self.mayDelBuid(buid, sode) and changes:
+                self.setSodeDirty(buid, sode, form)
+
             flatedit = results.get(buid)
             if flatedit is None:
                 results[buid] = flatedit = (buid, form, [])
@@ -3677,6 +4332,72 @@ class Layer(s_nexus.Pusher):
         self._reqNotReadOnly()
         await self._push('edits', nodeedits, meta)
 
+    def _putTrigrams(self, abrv, buid, valu):
+        for trigram in getTrigrams(valu):
+            self.layrslab.put(abrv + trigram.encode('utf8', 'surrogatepass'), buid, db=self.bytrigram)
+
+    def _delTrigrams(self, abrv, buid, valu):
+        for trigram in getTrigrams(valu):
+            self.layrslab.delete(abrv + trigram.encode('utf8', 'surrogatepass'), buid, db=self.bytrigram)
+
+    def _iterTrigramBuids(self, abrv, trigrams):
+        '''
+        Yield the buids whose value contains all of the given trigrams.
+        '''
+        lkeys = [abrv + trigram.encode('utf8', 'surrogatepass') for trigram in trigrams]
+
+        # scan the least common trigram and check the rest
+        lkeys.sort(key=lambda lkey: self.layrslab.count(lkey, db=self.bytrigram))
+
+        first, rest = lkeys[0], lkeys[1:]
+        for _, buid in self.layrslab.scanByDups(first, db=self.bytrigram):
+            if all(self.layrslab.hasdup(lkey, buid, db=self.bytrigram) for lkey in rest):
+                yield buid
+
+    def _putGeoIndx(self, abrv, buid, valu):
+        stor = self.stortypes[STOR_TYPE_LATLONG]
+        indx = stor._getLatLonIndx(valu)
+        self.layrslab.put(abrv + stor.getZordIndx(indx) + indx, buid, db=self.bygeo)
+
+    def _delGeoIndx(self, abrv, buid, valu):
+        stor = self.stortypes[STOR_TYPE_LATLONG]
+        indx = stor._getLatLonIndx(valu)
+        self.layrslab.delete(abrv + stor.getZordIndx(indx) + indx, buid, db=self.bygeo)
+
+    def _putIvalIndx(self, abrv, buid, valu):
+        stor = self.stortypes[STOR_TYPE_IVAL]
+        for indx in stor.indx(valu):
+            self.layrslab.put(abrv + stor.getDurIndx(indx) + indx, buid, db=self.byival)
+
+    def _delIvalIndx(self, abrv, buid, valu):
+        stor = self.stortypes[STOR_TYPE_IVAL]
+        for indx in stor.indx(valu):
+            self.layrslab.delete(abrv + stor.getDurIndx(indx) + indx, buid, db=self.byival)
+
+    def _iterGeoRows(self, abrv, zmin, zmax):
+        lmin = abrv + zmin.to_bytes(8, 'big')
+        lmax = abrv + zmax.to_bytes(8, 'big')
+        yield from self.layrslab.scanByRange(lmin, lmax, db=self.bygeo)
+
+    def _putIndx(self, lkey, buid, db, counts):
+        if self.layrslab.put(lkey, buid, db=db):
+            counts.inc(lkey[:8].hex())
+
+    def _delIndx(self, lkey, buid, db, counts):
+        if self.layrslab.delete(lkey, buid, db=db):
+            counts.inc(lkey[:8].hex(), valu=-1)
+
+    def _putTagIndx(self, lkey, buid):
+        # tag rows are counted both per tag and per tag+form
+        if self.layrslab.put(lkey, buid, db=self.bytag):
+            self.tagcounts.inc(lkey[:8].hex())
+            self.tagcounts.inc(lkey[:16].hex())
+
+    def _delTagIndx(self, lkey, buid):
+        if self.layrslab.delete(lkey, buid, db=self.bytag):
+            self.tagcounts.inc(lkey[:8].hex(), valu=-1)
+            self.tagcounts.inc(lkey[:16].hex(), valu=-1)
+
     async def _editNodeAdd(self, buid, form, edit, sode, meta):
 
         valt = edit[1]
@@ -3693,21 +4414,30 @@ class Layer(s_nexus.Pusher):
             self.layrslab.put(abrv, buid, db=self.byform)
 
         sode['valu'] = valt
-        self.setSodeDirty(buid, sode, form)
+        sode['form'] = form
 
         if isarray:
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.put(abrv + indx, buid, db=self.byarray)
+                self._putIndx(abrv + indx, buid, self.byarray, self.arraycounts)
                 await asyncio.sleep(0)
 
             for indx in self.getStorIndx(STOR_TYPE_MSGP, valu):
-                self.layrslab.put(abrv + indx, buid, db=self.byprop)
+                self._putIndx(abrv + indx, buid, self.byprop, self.propcounts)
 
         else:
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.put(abrv + indx, buid, db=self.byprop)
+                self._putIndx(abrv + indx, buid, self.byprop, self.propcounts)
+
+            if stortype == STOR_TYPE_UTF8 and abrv in self.trigramabrvs:
+                self._putTrigrams(abrv, buid, valu)
+
+            elif stortype == STOR_TYPE_LATLONG:
+                self._putGeoIndx(abrv, buid, valu)
+
+            elif stortype == STOR_TYPE_IVAL:
+                self._putIvalIndx(abrv, buid, valu)
 
         self.formcounts.inc(form)
         if self.nodeAddHook is not None:
@@ -3730,7 +4460,6 @@ class Layer(s_nexus.Pusher):
 
         valt = sode.get('valu', None)
         if valt is None:
-            self.mayDelBuid(buid, sode)
             return ()
 
         valu, stortype = valt
@@ -3740,16 +4469,25 @@ class Layer(s_nexus.Pusher):
         if stortype & STOR_FLAG_ARRAY:
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.delete(abrv + indx, buid, db=self.byarray)
+                self._delIndx(abrv + indx, buid, self.byarray, self.arraycounts)
                 await asyncio.sleep(0)
 
             for indx in self.getStorIndx(STOR_TYPE_MSGP, valu):
-                self.layrslab.delete(abrv + indx, buid, db=self.byprop)
+                self._delIndx(abrv + indx, buid, self.byprop, self.propcounts)
 
         else:
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.delete(abrv + indx, buid, db=self.byprop)
+                self._delIndx(abrv + indx, buid, self.byprop, self.propcounts)
+
+            if stortype == STOR_TYPE_UTF8 and abrv in self.trigramabrvs:
+                self._delTrigrams(abrv, buid, valu)
+
+            elif stortype == STOR_TYPE_LATLONG:
+                self._delGeoIndx(abrv, buid, valu)
+
+            elif stortype == STOR_TYPE_IVAL:
+                self._delIvalIndx(abrv, buid, valu)
 
         self.formcounts.inc(form, valu=-1)
         if self.nodeDelHook is not None:
@@ -3762,9 +4500,7 @@ class Layer(s_nexus.Pusher):
 
         sode.pop('valu', None)
 
-        if not self.mayDelBuid(buid, sode):
-            self.setSodeDirty(buid, sode, form)
-            self.layrslab.dirty = True
+        self.layrslab.dirty = True
 
         return (
             (EDIT_NODE_DEL, (valu, stortype), ()),
@@ -3804,9 +4540,9 @@ class Layer(s_nexus.Pusher):
                 realtype = oldt & 0x7fff
 
                 for oldi in self.getStorIndx(oldt, oldv):
-                    self.layrslab.delete(abrv + oldi, buid, db=self.byarray)
+                    self._delIndx(abrv + oldi, buid, self.byarray, self.arraycounts)
                     if univabrv is not None:
-                        self.layrslab.delete(univabrv + oldi, buid, db=self.byarray)
+                        self._delIndx(univabrv + oldi, buid, self.byarray, self.arraycounts)
 
                     if realtype == STOR_TYPE_NDEF:
                         self.layrslab.delete(oldi, buid + abrv, db=self.byndef)
@@ -3814,35 +4550,48 @@ class Layer(s_nexus.Pusher):
                     await asyncio.sleep(0)
 
                 for indx in self.getStorIndx(STOR_TYPE_MSGP, oldv):
-                    self.layrslab.delete(abrv + indx, buid, db=self.byprop)
+                    self._delIndx(abrv + indx, buid, self.byprop, self.propcounts)
                     if univabrv is not None:
-                        self.layrslab.delete(univabrv + indx, buid, db=self.byprop)
+                        self._delIndx(univabrv + indx, buid, self.byprop, self.propcounts)
 
             else:
 
                 for oldi in self.getStorIndx(oldt, oldv):
-                    self.layrslab.delete(abrv + oldi, buid, db=self.byprop)
+                    self._delIndx(abrv + oldi, buid, self.byprop, self.propcounts)
                     if univabrv is not None:
-                        self.layrslab.delete(univabrv + oldi, buid, db=self.byprop)
+                        self._delIndx(univabrv + oldi, buid, self.byprop, self.propcounts)
 
                     if oldt == STOR_TYPE_NDEF:
                         self.layrslab.delete(oldi, buid + abrv, db=self.byndef)
 
+                if oldt == STOR_TYPE_UTF8 and abrv in self.trigramabrvs:
+                    self._delTrigrams(abrv, buid, oldv)
+
+                elif oldt == STOR_TYPE_LATLONG:
+                    self._delGeoIndx(abrv, buid, oldv)
+                    if univabrv is not None:
+                        self._delGeoIndx(univabrv, buid, oldv)
+
+                elif oldt == STOR_TYPE_IVAL:
+                    self._delIvalIndx(abrv, buid, oldv)
+                    if univabrv is not None:
+                        self._delIvalIndx(univabrv, buid, oldv)
+
         if sode.get('form') is None:
             formabrv = self.setPropAbrv(form, None)
             self.layrslab.put(formabrv, buid, db=self.byform)
 
         sode['props'][prop] = (valu, stortype)
-        self.setSodeDirty(buid, sode, form)
+        sode['form'] = form
 
         if isarray:
 
             realtype = stortype & 0x7fff
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.put(abrv + indx, buid, db=self.byarray)
+                self._putIndx(abrv + indx, buid, self.byarray, self.arraycounts)
                 if univabrv is not None:
-                    self.layrslab.put(univabrv + indx, buid, db=self.byarray)
+                    self._putIndx(univabrv + indx, buid, self.byarray, self.arraycounts)
 
                 if realtype == STOR_TYPE_NDEF:
                     self.layrslab.put(indx, buid + abrv, db=self.byndef)
@@ -3850,20 +4599,33 @@ class Layer(s_nexus.Pusher):
                 await asyncio.sleep(0)
 
             for indx in self.getStorIndx(STOR_TYPE_MSGP, valu):
-                self.layrslab.put(abrv + indx, buid, db=self.byprop)
+                self._putIndx(abrv + indx, buid, self.byprop, self.propcounts)
                 if univabrv is not None:
-                    self.layrslab.put(univabrv + indx, buid, db=self.byprop)
+                    self._putIndx(univabrv + indx, buid, self.byprop, self.propcounts)
 
         else:
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.put(abrv + indx, buid, db=self.byprop)
+                self._putIndx(abrv + indx, buid, self.byprop, self.propcounts)
                 if univabrv is not None:
-                    self.layrslab.put(univabrv + indx, buid, db=self.byprop)
+                    self._putIndx(univabrv + indx, buid, self.byprop, self.propcounts)
 
                 if stortype == STOR_TYPE_NDEF:
                     self.layrslab.put(indx, buid + abrv, db=self.byndef)
 
+            if stortype == STOR_TYPE_UTF8 and abrv in self.trigramabrvs:
+                self._putTrigrams(abrv, buid, valu)
+
+            elif stortype == STOR_TYPE_LATLONG:
+                self._putGeoIndx(abrv, buid, valu)
+                if univabrv is not None:
+                    self._putGeoIndx(univabrv, buid, valu)
+
+            elif stortype == STOR_TYPE_IVAL:
+                self._putIvalIndx(abrv, buid, valu)
+                if univabrv is not None:
+                    self._putIvalIndx(univabrv, buid, valu)
+
         return (
             (EDIT_PROP_SET, (prop, valu, oldv, stortype), ()),
         )
@@ -3880,7 +4642,6 @@ class Layer(s_nexus.Pusher):
 
         valt = sode['props'].get(prop, None)
         if valt is None:
-            self.mayDelBuid(buid, sode)
             return ()
 
         valu, stortype = valt
@@ -3891,9 +4652,9 @@ class Layer(s_nexus.Pusher):
 
             for aval in valu:
                 for indx in self.getStorIndx(realtype, aval):
-                    self.layrslab.delete(abrv + indx, buid, db=self.byarray)
+                    self._delIndx(abrv + indx, buid, self.byarray, self.arraycounts)
                     if univabrv is not None:
-                        self.layrslab.delete(univabrv + indx, buid, db=self.byarray)
+                        self._delIndx(univabrv + indx, buid, self.byarray, self.arraycounts)
 
                     if realtype == STOR_TYPE_NDEF:
                         self.layrslab.delete(indx, buid + abrv, db=self.byndef)
@@ -3901,24 +4662,34 @@ class Layer(s_nexus.Pusher):
                 await asyncio.sleep(0)
 
             for indx in self.getStorIndx(STOR_TYPE_MSGP, valu):
-                self.layrslab.delete(abrv + indx, buid, db=self.byprop)
+                self._delIndx(abrv + indx, buid, self.byprop, self.propcounts)
                 if univabrv is not None:
-                    self.layrslab.delete(univabrv + indx, buid, db=self.byprop)
+                    self._delIndx(univabrv + indx, buid, self.byprop, self.propcounts)
 
         else:
 
             for indx in self.getStorIndx(stortype, valu):
-                self.layrslab.delete(abrv + indx, buid, db=self.byprop)
+                self._delIndx(abrv + indx, buid, self.byprop, self.propcounts)
                 if univabrv is not None:
-                    self.layrslab.delete(univabrv + indx, buid, db=self.byprop)
+                    self._delIndx(univabrv + indx, buid, self.byprop, self.propcounts)
 
                 if stortype == STOR_TYPE_NDEF:
                     self.layrslab.delete(indx, buid + abrv, db=self.byndef)
 
-        sode['props'].pop(prop, None)
+            if stortype == STOR_TYPE_UTF8 and abrv in self.trigramabrvs:
+                self._delTrigrams(abrv, buid, valu)
+
+            elif stortype == STOR_TYPE_LATLONG:
+                self._delGeoIndx(abrv, buid, valu)
+                if univabrv is not None:
+                    self._delGeoIndx(univabrv, buid, valu)
+
+            elif stortype == STOR_TYPE_IVAL:
+                self._delIvalIndx(abrv, buid, valu)
+                if univabrv is not None:
+                    self._delIvalIndx(univabrv, buid, valu)
 
-        if not self.mayDelBuid(buid, sode):
-            self.setSodeDirty(buid, sode, form)
+        sode['props'].pop(prop, None)
 
         return (
             (EDIT_PROP_DEL, (prop, valu, stortype), ()),
@@ -3949,9 +4720,9 @@ class Layer(s_nexus.Pusher):
             self.layrslab.put(formabrv, buid, db=self.byform)
 
         sode['tags'][tag] = valu
-        self.setSodeDirty(buid, sode, form)
+        sode['form'] = form
 
-        self.layrslab.put(tagabrv + formabrv, buid, db=self.bytag)
+        self._putTagIndx(tagabrv + formabrv, buid)
 
         return (
             (EDIT_TAG_SET, (tag, valu, oldv), ()),
@@ -3965,16 +4736,14 @@ class Layer(s_nexus.Pusher):
         oldv = sode['tags'].pop(tag, None)
         if oldv is None:
             # TODO tombstone
-            self.mayDelBuid(buid, sode)
             return ()
 
-        self.setSodeDirty(buid, sode, form)
+        sode['form'] = form
 
         tagabrv = self.tagabrv.bytsToAbrv(tag.encode())
 
-        self.layrslab.delete(tagabrv + formabrv, buid, db=self.bytag)
+        self._delTagIndx(tagabrv + formabrv, buid)
 
-        self.mayDelBuid(buid, sode)
         return (
             (EDIT_TAG_DEL, (tag, oldv), ()),
         )
@@ -4008,8 +4777,8 @@ class Layer(s_nexus.Pusher):
                     return ()
 
                 for oldi in self.getStorIndx(oldt, oldv):
-                    self.layrslab.delete(tp_abrv + oldi, buid, db=self.bytagprop)
-                    self.layrslab.delete(ftp_abrv + oldi, buid, db=self.bytagprop)
+                    self._delIndx(tp_abrv + oldi, buid, self.bytagprop, self.tagpropcounts)
+                    self._delIndx(ftp_abrv + oldi, buid, self.bytagprop, self.tagpropcounts)
 
         if sode.get('form') is None:
             formabrv = self.setPropAbrv(form, None)
@@ -4018,14 +4787,11 @@ class Layer(s_nexus.Pusher):
         if tag not in sode['tagprops']:
             sode['tagprops'][tag] = {}
         sode['tagprops'][tag][prop] = (valu, stortype)
-        self.setSodeDirty(buid, sode, form)
+        sode['form'] = form
 
-        kvpairs = []
         for indx in self.getStorIndx(stortype, valu):
-            kvpairs.append((tp_abrv + indx, buid))
-            kvpairs.append((ftp_abrv + indx, buid))
-
-        self.layrslab._putmulti(kvpairs, db=self.bytagprop)
+            self._putIndx(tp_abrv + indx, buid, self.bytagprop, self.tagpropcounts)
+            self._putIndx(ftp_abrv + indx, buid, self.bytagprop, self.tagpropcounts)
 
         return (
             (EDIT_TAGPROP_SET, (tag, prop, valu, oldv, stortype), ()),
@@ -4036,7 +4802,6 @@ class Layer(s_nexus.Pusher):
 
         tp_dict = sode['tagprops'].get(tag)
         if not tp_dict:
-            self.mayDelBuid(buid, sode)
             return ()
 
         oldv, oldt = tp_dict.pop(prop, (None, None))
@@ -4044,19 +4809,17 @@ class Layer(s_nexus.Pusher):
             sode['tagprops'].pop(tag, None)
 
         if oldv is None:
-            self.mayDelBuid(buid, sode)
             return ()
 
-        self.setSodeDirty(buid, sode, form)
+        sode['form'] = form
 
         tp_abrv = self.setTagPropAbrv(None, tag, prop)
         ftp_abrv = self.setTagPropAbrv(form, tag, prop)
 
         for oldi in self.getStorIndx(oldt, oldv):
-            self.layrslab.delete(tp_abrv + oldi, buid, db=self.bytagprop)
-            self.layrslab.delete(ftp_abrv + oldi, buid, db=self.bytagprop)
+            self._delIndx(tp_abrv + oldi, buid, self.bytagprop, self.tagpropcounts)
+            self._delIndx(ftp_abrv + oldi, buid, self.bytagprop, self.tagpropcounts)
 
-        self.mayDelBuid(buid, sode)
         return (
             (EDIT_TAGPROP_DEL, (tag, prop, oldv, oldt), ()),
         )
@@ -4073,7 +4836,7 @@ class Layer(s_nexus.Pusher):
 
         # a bit of special case...
         if sode.get('form') is None:
-            self.setSodeDirty(buid, sode, form)
+            sode['form'] = form
             formabrv = self.setPropAbrv(form, None)
             self.layrslab.put(formabrv, buid, db=self.byform)
 
@@ -4093,13 +4856,11 @@ class Layer(s_nexus.Pusher):
 
         oldb = self.dataslab.pop(buid + abrv, db=self.nodedata)
         if oldb is None:
-            self.mayDelBuid(buid, sode)
             return ()
 
         oldv = s_msgpack.un(oldb)
         self.dataslab.delete(abrv, buid, db=self.dataname)
 
-        self.mayDelBuid(buid, sode)
         return (
             (EDIT_NODEDATA_DEL, (name, oldv), ()),
         )
@@ -4122,7 +4883,7 @@ class Layer(s_nexus.Pusher):
 
         # a bit of special case...
         if sode.get('form') is None:
-            self.setSodeDirty(buid, sode, form)
+            sode['form'] = form
             formabrv = self.setPropAbrv(form, None)
             self.layrslab.put(formabrv, buid, db=self.byform)
 
@@ -4143,14 +4904,12 @@ class Layer(s_nexus.Pusher):
         n2buid = s_common.uhex(n2iden)
 
         if not self.layrslab.delete(buid + venc, n2buid, db=self.edgesn1):
-            self.mayDelBuid(buid, sode)
             return ()
 
         self.layrslab.delete(venc, buid + n2buid, db=self.byverb)
         self.layrslab.delete(n2buid + venc, buid, db=self.edgesn2)
         self.layrslab.delete(buid + n2buid, venc, db=self.edgesn1n2)
 
-        self.mayDelBuid(buid, sode)
         return (
             (EDIT_EDGE_DEL, (verb, n2iden), ()),
         )
@@ -4865,6 +5624,22 @@ class Layer(s_nexus.Pusher):
         await self.fini()
         shutil.rmtree(self.dirn, ignore_errors=True)
 
+def copyStorNode(sode):
+    '''
+    Return a mutable copy of a storage node.
+
+    Storage node values are immutable tuples, so only the nested dicts need
+    to be copied rather than performing a full deepcopy.
+    '''
+    copy = collections.defaultdict(dict)
+    for name, valu in sode.items():
+        if name == 'tagprops':
+            valu = {tag: dict(props) for (tag, props) in valu.items()}
+        elif isinstance(valu, dict):
+            valu = dict(valu)
+        copy[name] = valu
+    return copy
+
 def getFlatEdits(nodeedits):
 
     editsbynode = collections.defaultdict(list)
@@ -4881,3 +5656,178 @@ def getFlatEdits(nodeedits):
         addedits(buid, form, edits)
 
     return [(k[0], k[1], v) for (k, v) in editsbynode.items()]
+
+ZORD_SIZE = 2 ** 32
+
+def _zordSpread(valu):
+    # spread the low 32 bits out to the even bits of a 64 bit integer
+    valu &= 0xffffffff
+    valu = (valu | (valu << 16)) & 0x0000ffff0000ffff
+    valu = (valu | (valu << 8)) & 0x00ff00ff00ff00ff
+    valu = (valu | (valu << 4)) & 0x0f0f0f0f0f0f0f0f
+    valu = (valu | (valu << 2)) & 0x3333333333333333
+    valu = (valu | (valu << 1)) & 0x5555555555555555
+    return valu
+
+def zordEncode(x, y):
+    '''
+    Interleave two 32 bit integers into a 64 bit z-order (morton) value.
+    '''
+    return (_zordSpread(x) << 1) | _zordSpread(y)
+
+def reqValidTrigramProps(model, names):
+    '''
+    Normalize and validate a list of property names for the trigram index.
+    '''
+    if names is None:
+        return None
+
+    if not isinstance(names, (list, tuple)):
+        mesg = 'trigram:props must be a list of property names.'
+        raise s_exc.BadArg(mesg=mesg)
+
+    for name in names:
+
+        prop = model.prop(name)
+        if prop is None:
+            mesg = f'No property named {name}.'
+            raise s_exc.NoSuchProp(mesg=mesg, name=name)
+
+        if prop.isrunt or (not prop.isform and prop.isuniv) or prop.type.stortype != STOR_TYPE_UTF8:
+            mesg = f'Trigram indexes are only supported for str properties: {name}'
+            raise s_exc.BadArg(mesg=mesg, name=name)
+
+    return sorted(set(names))
+
+def foldChar(c):
+    '''
+    Return a single character case folding of a character.
+
+    Unlike str.casefold() the folding never changes the length of a string,
+    which matches the simple case folding used by case insensitive regexes.
+    '''
+    uppr = c.upper()
+    if len(uppr) == 1 and uppr.isascii():
+        return uppr.lower()
+    return c.casefold()[0]
+
+def getTrigrams(valu):
+    '''
+    Return the set of case folded trigrams in a string value.
+    '''
+    if valu.isascii():
+        valu = valu.lower()
+    else:
+        valu = ''.join(foldChar(c) for c in valu)
+    return {valu[i:i + 3] for i in range(len(valu) - 2)}
+
+regxclasses = set('dDsSwWbBAZ')
+regxrepeats = set('?*')
+
+def getRegxTrigrams(text):
+    '''
+    Return the set of trigrams which any case insensitive match of the regex must contain.
+
+    Only ASCII literal runs are considered. None is returned for expressions
+    which contain groups or alternation since their literals are not required.
+    '''
+    if '|' in text or '(' in text:
+        return None
+
+    runs = []
+    curr = []
+
+    def endrun():
+        if len(curr) >= 3:
+            runs.append(''.join(curr))
+        curr.clear()
+
+    i = 0
+    size = len(text)
+    while i < size:
+
+        c = text[i]
+
+        if c == '\\':
+
+            if i + 1 >= size:
+                return None
+
+            c = text[i + 1]
+            i += 2
+
+            if c in regxclasses:
+                endrun()
+                continue
+
+            if c.isalnum() or not c.isascii():
+                return None
+
+            curr.append(c.lower())
+            continue
+
+        if c in regxrepeats:
+            # the previous atom is optional
+            if curr:
+                curr.pop()
+            endrun()
+            i += 1
+            continue
+
+        if c == '{':
+            # the previous atom may not occur and the quantifier is not a literal
+            if curr:
+                curr.pop()
+            endrun()
+
+            i = text.find('}', i + 1)
+            if i == -1:
+                return None
+
+            i += 1
+            continue
+
+        if c == '[':
+            endrun()
+
+            # skip the character class
+            i += 1
+            if text[i:i + 1] == '^':
+                i += 1
+            if text[i:i + 1] == ']':
+                i += 1
+
+            while i < size and text[i] != ']':
+                if text[i] == '\\':
+                    i += 1
+                i += 1
+
+            if i >= size:
+                return None
+
+            i += 1
+            continue
+
+        if c == '+':
+            # the previous atom may repeat but a run may continue from it
+            last = curr[-1:]
+            endrun()
+            curr.extend(last)
+            i += 1
+            continue
+
+        if c in '.^$]}' or not c.isascii():
+            endrun()
+            i += 1
+            continue
+
+        curr.append(c.lower())
+        i += 1
+
+    endrun()
+
+    trigrams = set()
+    for run in runs:
+        trigrams.update(run[i:i + 3] for i in range(len(run) - 2))
+
+    return trigrams
@@ -1,3 +1,4 @@
+import zlib
 import socket
 import asyncio
 import logging
@@ -12,11 +13,30 @@ import synapse.exc as s_exc
 import synapse.common as s_common
 
 import synapse.lib.base as s_base
+import synapse.lib.coro as s_coro
 import synapse.lib.const as s_const
 import synapse.lib.msgpack as s_msgpack
 
 READSIZE = 16 * s_const.mebibyte
 MAXWRITE = 64 * s_const.mebibyte
+# send() only waits for the transport to drain when more than this many bytes are buffered
+TXHIGHWATER = s_const.mebibyte
+
+# A compressed frame is sent as a (ZLIB_MESG, <bytes>) message containing one or more packed messages
+ZLIB_MESG = 'link:zlib'
+# The default minimum size of a frame to compress
+ZLIB_MINSIZE = 1024
+# Frames at least this large are compressed in an executor thread
+ZLIB_EXECSIZE = s_const.mebibyte
+# The max size of a compressed frame once it is expanded
+ZLIB_MAXSIZE = MAXWRITE
+
+# The default flow control window for each multiplexed stream
+MUX_WINDOW = 4 * s_const.mebibyte
+# The max bytes sent for a stream before the next ready stream is given a turn
+MUX_QUANTUM = 256 * s_const.kibibyte
+# The messages used to carry multiplexed streams over a Link
+MUX_MESGS = ('mx:ack', 'mx:data', 'mx:fini')
 
 async def unixlisten(path, onlink):
     '''
@@ -113,7 +133,7 @@ class Link(s_base.Base):
 
         self.iden = s_common.guid()
 
-        writer.transport.set_write_buffer_limits(high=1)
+        writer.transport.set_write_buffer_limits(high=TXHIGHWATER)
 
         self.reader = reader
         self.writer = writer
@@ -167,6 +187,17 @@ class Link(s_base.Base):
 
         self.unpk = s_msgpack.Unpk()
 
+        # subclasses which parse other protocols override feed()
+        self._rxitems = type(self).feed is Link.feed
+
+        self.zlevel = None
+        self.zminsize = ZLIB_MINSIZE
+        self.zrecv = False
+
+        zinfo = info.get('zlib')
+        if zinfo is not None:
+            self.setCompress(*zinfo)
+
         async def fini():
             self.writer.close()
             if self._forceclose:
@@ -207,12 +238,19 @@ class Link(s_base.Base):
                     return valu
 
     async def getSpawnInfo(self):
+
+        # the link may no longer be used once its socket is written to by another process
+        self.set('spawned', True)
+
         info = {}
 
         # selectively add info for pickle...
         if self.info.get('unix'):
             info['unix'] = True
 
+        if self.zlevel is not None:
+            info['zlib'] = (self.zlevel, self.zminsize)
+
         if self.info.get('tls'):
             info['unix'] = True
             link0, sock = await linksock()
@@ -224,11 +262,13 @@ class Link(s_base.Base):
                         byts = await link.recv(1024)
                         if not byts:
                             break
-                        await self.send(byts)
+                        await self._send(byts)
 
             self.schedCoro(relay(link0))
 
         else:
+            # the spawned process writes to the socket directly
+            await self._flush()
             sock = self.reader._transport._sock
 
         return {
@@ -242,29 +282,99 @@ class Link(s_base.Base):
         '''
         return dict(self._addrinfo)
 
+    def setCompress(self, level, minsize=ZLIB_MINSIZE):
+        '''
+        Compress transmitted frames of at least minsize bytes using zlib.
+
+        Args:
+            level (int|None): The zlib compression level (1-9) or None to disable compression.
+            minsize (int): The minimum size of a frame to compress.
+
+        Notes:
+            The peer must be able to receive compressed frames. Telepath
+            negotiates this during the tele:syn handshake.
+
+            Enabling compression also allows the peer to send compressed frames.
+        '''
+        if level is not None:
+
+            if not isinstance(level, int) or not 1 <= level <= 9:
+                mesg = f'Invalid zlib compression level: {level!r}'
+                raise s_exc.BadArg(mesg=mesg, level=level)
+
+            if not isinstance(minsize, int) or minsize < 0:
+                mesg = f'Invalid minimum compression size: {minsize!r}'
+                raise s_exc.BadArg(mesg=mesg, minsize=minsize)
+
+        self.zlevel = level
+        self.zminsize = minsize
+
+        if level is not None:
+            self.zrecv = True
+
+    def setDecompress(self):
+        '''
+        Allow the peer to send compressed frames without compressing the frames sent to it.
+        '''
+        self.zrecv = True
+
     async def send(self, byts):
+        '''
+        Send bytes containing one or more complete packed messages.
+        '''
+        async with self._txlock:
 
-        offs = 0
-        size = len(byts)
+            if self.zlevel is not None and self.zminsize <= len(byts) <= ZLIB_MAXSIZE:
+
+                if len(byts) >= ZLIB_EXECSIZE:
+                    zbyts = await s_coro.executor(zlib.compress, byts, self.zlevel)
+                else:
+                    zbyts = zlib.compress(byts, self.zlevel)
 
+                # only send the compressed frame if it is smaller
+                if len(zbyts) + 16 < len(byts):
+                    byts = s_msgpack.en((ZLIB_MESG, zbyts))
+
+            await self._sendLocked(byts)
+
+    async def _send(self, byts):
         async with self._txlock:
+            await self._sendLocked(byts)
 
-            try:
-                while offs < size:
+    async def _sendLocked(self, byts):
+
+        size = len(byts)
+        transport = self.writer.transport
+
+        try:
 
-                    self.writer.write(byts[offs:offs + MAXWRITE])
-                    offs += MAXWRITE
+            if size <= MAXWRITE:
+                self.writer.write(byts)
 
+                # drain() also raises if the connection was lost
+                if transport.get_write_buffer_size() > TXHIGHWATER or transport.is_closing():
                     await self.writer.drain()
 
-            except (asyncio.CancelledError, Exception) as e:
+                return
 
-                await self.fini()
+            offs = 0
+            view = memoryview(byts)
 
-                einfo = s_common.retnexc(e)
-                logger.debug('link.tx connection trouble %s', einfo)
+            while offs < size:
 
-                raise
+                self.writer.write(view[offs:offs + MAXWRITE])
+                offs += MAXWRITE
+
+                await self.writer.drain()
+
+        except (asyncio.CancelledError, Exception) as e:
+
+            await self.fini()
+
+            einfo = s_common.retnexc(e)
+            logger.debug('link.tx connection trouble %s', einfo)
+
+            raise
 
     async def tx(self, mesg):
         '''
@@ -276,7 +386,27 @@ class Link(s_base.Base):
         byts = await self.pack(mesg)
         await self.send(byts)
 
+    async def _flush(self):
+        '''
+        Wait for all buffered bytes to be written to the socket.
+        '''
+        async with self._txlock:
+            transport = self.writer.transport
+            if not transport.get_write_buffer_size():
+                return
+
+            transport.set_write_buffer_limits(high=0)
+            try:
+                await self.writer.drain()
+            finally:
+                transport.set_write_buffer_limits(high=TXHIGHWATER)
+
     def txfini(self):
+        # write_eof() waits for buffered bytes to be written before shutting down
+        if self.writer.can_write_eof():
+            self.writer.write_eof()
+            return
+
         self.sock.shutdown(1)
 
     async def recv(self, size):
@@ -310,8 +440,11 @@ class Link(s_base.Base):
                     await self.fini()
                     return None
 
-                for _, mesg in self.feed(byts):
-                    self.rxqu.append(mesg)
+                if self._rxitems:
+                    self._feedRxQueue(byts)
+                else:
+                    for _, mesg in self.feed(byts):
+                        self.rxqu.append(mesg)
 
             except asyncio.CancelledError:
                 await self.fini()
@@ -340,11 +473,50 @@ class Link(s_base.Base):
         '''
         self.info[name] = valu
 
+    def _feedRxQueue(self, byts):
+        # unpack messages directly into the rx queue without tracking their sizes
+        rxqu = self.rxqu
+        for mesg in self.unpk.items(byts):
+
+            if type(mesg) is tuple and len(mesg) == 2 and mesg[0] == ZLIB_MESG:
+                rxqu.extend(s_msgpack.Unpk().items(self._unzip(mesg[1])))
+                continue
+
+            rxqu.append(mesg)
+
     def feed(self, byts):
         '''
         Used by rx() to unpack messages from bytes.
         '''
-        return self.unpk.feed(byts)
+        retn = []
+        for size, mesg in self.unpk.feed(byts):
+
+            if type(mesg) is tuple and len(mesg) == 2 and mesg[0] == ZLIB_MESG:
+                retn.extend(s_msgpack.Unpk().feed(self._unzip(mesg[1])))
+                continue
+
+            retn.append((size, mesg))
+
+        return retn
+
+    def _unzip(self, zbyts):
+
+        # compressed frames are only accepted once compression is negotiated
+        if not self.zrecv:
+            mesg = f'Received a compressed frame before compression was enabled link={self.getAddrInfo()}'
+            raise s_exc.BadMesgFormat(mesg=mesg)
+
+        if not isinstance(zbyts, bytes):
+            raise s_exc.BadMesgFormat(mesg=f'Invalid compressed frame link={self.getAddrInfo()}')
+
+        unzip = zlib.decompressobj()
+        byts = unzip.decompress(zbyts, ZLIB_MAXSIZE)
+
+        if unzip.unconsumed_tail or not unzip.eof:
+            mesg = f'Compressed frame is larger than {ZLIB_MAXSIZE} bytes or truncated link={self.getAddrInfo()}'
+            raise s_exc.BadMesgFormat(mesg=mesg)
+
+        return byts
 
     async def pack(self, mesg):
         '''
@@ -352,6 +524,324 @@ class Link(s_base.Base):
         '''
         return s_msgpack.en(mesg)
 
+class Mux(s_base.Base):
+    '''
+    Multiplex many MuxStream objects over a single Link.
+
+    Each stream is a virtual Link which carries a msgpack byte stream in
+    ('mx:data', {'strm': <iden>, 'byts': <bytes>}) messages. Streams with data
+    to send are given turns in round-robin order and each stream may only have
+    ``window`` unacknowledged bytes in flight, so a slow or large stream does not
+    block the others.
+
+    Notes:
+        The owner of the Link must pass any received mx:* messages to onMuxMesg().
+        Streams are opened by the client side with open(). On the server side,
+        onstream is called with each new stream.
+    '''
+    async def __anit__(self, link, window=MUX_WINDOW, onstream=None):
+
+        await s_base.Base.__anit__(self)
+
+        self.link = link
+        self.window = window
+        self.onstream = onstream
+
+        self.streams = {}
+        self.lastiden = 0
+
+        self.ready = collections.deque()
+        self.readyevnt = asyncio.Event()
+
+        self.mesgfuncs = {
+            'mx:ack': self._onMuxAck,
+            'mx:data': self._onMuxData,
+            'mx:fini': self._onMuxFini,
+        }
+
+        link.onfini(self.fini)
+
+        async def fini():
+            for strm in list(self.streams.values()):
+                await strm.fini()
+
+        self.onfini(fini)
+
+        self.schedCoro(self._runSendLoop())
+
+    async def open(self):
+        '''
+        Open a new stream.
+        '''
+        self.lastiden += 1
+        return await self._initStream(self.lastiden)
+
+    async def _initStream(self, iden):
+
+        strm = await MuxStream.anit(self, iden)
+        self.streams[iden] = strm
+
+        async def fini():
+            self.streams.pop(iden, None)
+
+        strm.onfini(fini)
+        return strm
+
+    async def onMuxMesg(self, mesg):
+
+        func = self.mesgfuncs.get(mesg[0])
+        if func is None:
+            return
+
+        try:
+            await func(mesg[1])
+
+        except Exception as e:
+            # a malformed stream message is a protocol error for the whole link
+            logger.exception(f'Mux error for {mesg[0]}: {e} link={self.link.getAddrInfo()}')
+            await self.link.fini()
+
+    async def _onMuxData(self, info):
+
+        iden = info.get('strm')
+
+        strm = self.streams.get(iden)
+        if strm is None:
+
+            # streams are only opened by the client and are never reused
+            if self.onstream is None or iden <= self.lastiden:
+                return
+
+            self.lastiden = iden
+            strm = await self._initStream(iden)
+            self.schedCoro(self.onstream(strm))
+
+        await strm._feed(info.get('byts'))
+
+    async def _onMuxAck(self, info):
+        strm = self.streams.get(info.get('strm'))
+        if strm is not None:
+            strm.credit += info.get('size')
+            self._schedStream(strm)
+
+    async def _onMuxFini(self, info):
+        strm = self.streams.get(info.get('strm'))
+        if strm is not None:
+            strm.peerfini = True
+            await strm.fini()
+
+    def _schedStream(self, strm):
+        if not strm.isready and strm.txqu and strm.credit > 0:
+            strm.isready = True
+            self.ready.append(strm)
+            self.readyevnt.set()
+
+    async def _runSendLoop(self):
+
+        while not self.isfini:
+
+            if not self.ready:
+                self.readyevnt.clear()
+                await self.readyevnt.wait()
+                continue
+
+            strm = self.ready.popleft()
+            strm.isready = False
+
+            if strm.isfini:
+                continue
+
+            byts = strm._popTxBytes(min(MUX_QUANTUM, strm.credit))
+            strm.credit -= len(byts)
+
+            try:
+                await self.link.tx(('mx:data', {'strm': strm.iden, 'byts': byts}))
+            except Exception as e:
+                logger.debug(f'Mux send error: {e} link={self.link.getAddrInfo()}')
+                await self.fini()
+                return
+
+            if not strm.txqu:
+                strm.txevnt.set()
+
+            self._schedStream(strm)
+
+class MuxStream(s_base.Base):
+    '''
+    A virtual Link which sends and receives messages over a Mux.
+    '''
+    async def __anit__(self, mux, iden):
+
+        await s_base.Base.__anit__(self)
+
+        self.mux = mux
+        self.iden = iden
+        self.info = {}
+
+        self.peerfini = False
+
+        self.txqu = collections.deque()
+        self.txoffs = 0
+        self.txevnt = asyncio.Event()
+        self.credit = mux.window
+        self.isready = False
+
+        self.unpk = s_msgpack.Unpk()
+        self.rxqu = collections.deque()
+        self.rxevnt = asyncio.Event()
+        self.acksize = 0
+
+        async def fini():
+
+            self.txqu.clear()
+            self.txevnt.set()
+            self.rxevnt.set()
+
+            if self.peerfini or self.mux.link.isfini:
+                return
+
+            try:
+                await self.mux.link.tx(('mx:fini', {'strm': self.iden}))
+            except Exception as e:  # pragma: no cover
+                logger.debug(f'Error sending mx:fini: {e}')
+
+        self.onfini(fini)
+
+    @property
+    def zlevel(self):
+        # frames are compressed by the underlying link
+        return self.mux.link.zlevel
+
+    def setCompress(self, level, minsize=ZLIB_MINSIZE):
+        pass
+
+    def setDecompress(self):
+        pass
+
+    def get(self, name, defval=None):
+        return self.info.get(name, defval)
+
+    def set(self, name, valu):
+        self.info[name] = valu
+
+    def getAddrInfo(self):
+        return self.mux.link.getAddrInfo()
+
+    async def getSpawnInfo(self):
+
+        self.set('spawned', True)
+
+        # relay the bytes written by the spawned process
+        link0, sock = await linksock()
+        link0.onfini(sock.close)
+
+        async def relay(link):
+            async with link:
+                while True:
+                    byts = await link.recv(MUX_QUANTUM)
+                    if not byts:
+                        break
+                    await self.send(byts)
+
+        self.schedCoro(relay(link0))
+
+        return {
+            'info': {'unix': True},
+            'sock': sock,
+        }
+
+    async def tx(self, mesg):
+
+        if self.isfini:
+            raise s_exc.IsFini()
+
+        await self.send(s_msgpack.en(mesg))
+
+    async def send(self, byts):
+        '''
+        Send bytes and wait for them to be sent by the Mux.
+        '''
+        if self.isfini:
+            raise s_exc.LinkShutDown(mesg='Mux stream is fini.')
+
+        self.txqu.append(byts)
+        self.txevnt.clear()
+        self.mux._schedStream(self)
+
+        await self.txevnt.wait()
+
+        if self.isfini:
+            raise s_exc.LinkShutDown(mesg='Mux stream is fini.')
+
+    def _popTxBytes(self, size):
+
+        # return up to size bytes from the tx queue
+        retn = []
+        while self.txqu and size > 0:
+
+            byts = self.txqu[0]
+            if self.txoffs == 0 and len(byts) <= size:
+                retn.append(byts)
+                size -= len(byts)
+                self.txqu.popleft()
+                continue
+
+            part = memoryview(byts)[self.txoffs:self.txoffs + size]
+            retn.append(part)
+            size -= len(part)
+
+            self.txoffs += len(part)
+            if self.txoffs == len(byts):
+                self.txoffs = 0
+                self.txqu.popleft()
+
+        if len(retn) == 1:
+            return retn[0]
+
+        return b''.join(retn)
+
+    async def _feed(self, byts):
+
+        # bytes which are part of incomplete messages are acknowledged
+        # immediately so messages larger than the window may be received.
+        size = len(byts)
+        for item in self.unpk.feed(byts):
+            self.rxqu.append(item)
+            size -= item[0]
+
+        self.rxevnt.set()
+        await self._addAckSize(size)
+
+    async def _addAckSize(self, size):
+
+        self.acksize += size
+        if self.acksize < self.mux.window // 4:
+            return
+
+        size, self.acksize = self.acksize, 0
+        if not self.isfini and not self.mux.link.isfini:
+            await self.mux.link.tx(('mx:ack', {'strm': self.iden, 'size': size}))
+
+    async def rx(self):
+
+        while not self.rxqu:
+
+            if self.isfini:
+                return None
+
+            self.rxevnt.clear()
+            await self.rxevnt.wait()
+
+        size, mesg = self.rxqu.popleft()
+
+        try:
+            await self._addAckSize(size)
+        except Exception as e:
+            logger.debug(f'Error sending mx:ack: {e}')
+            await self.fini()
+
+        return mesg
+
 async def connect(host, port, ssl=None, hostname=None, linkinfo=None, linkcls=Link):
     '''
     Async connect and return a <linkcls>.
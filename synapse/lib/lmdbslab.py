@@ -1304,6 +1304,27 @@ class Slab(s_base.Base):
         finally:
             self._relXactForReading()
 
+    def getmulti(self, lkeys, db=None):
+        '''
+        Return a list of values (or None) for the given keys using a single cursor.
+
+        Note:
+            Passing the keys in sorted order minimizes cursor movement.
+        '''
+        self._acqXactForReading()
+        realdb, dupsort = self.dbnames[db]
+        try:
+            retn = []
+            with self.xact.cursor(db=realdb) as curs:
+                for lkey in lkeys:
+                    if curs.set_key(lkey):
+                        retn.append(curs.value())
+                    else:
+                        retn.append(None)
+            return retn
+        finally:
+            self._relXactForReading()
+
     def last(self, db=None):
         '''
         Return the last key/value pair from the given db.
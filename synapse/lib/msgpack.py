@@ -126,6 +126,20 @@ def un(byts, use_list=False):
     return msgpack.loads(byts, use_list=use_list, raw=False, strict_map_key=False,
                          unicode_errors='surrogatepass', ext_hook=_ext_un)
 
+def arrayhead(size):
+    '''
+    Return the msgpack header for an array of the given size.
+
+    Notes:
+        This may be used to pack an array from a list of already packed items
+        without packing each item again.
+    '''
+    if size < 16:
+        return bytes((0x90 | size,))
+    if size < 0x10000:
+        return b'\xdc' + size.to_bytes(2, 'big')
+    return b'\xdd' + size.to_bytes(4, 'big')
+
 def isok(item):
     '''
     Returns True if the item can be msgpacked (by testing packing).
@@ -229,6 +243,23 @@ class Unpk:
 
         return retn
 
+    def items(self, byts):
+        '''
+        Feed bytes to the unpacker and return an iterator of completed objects.
+
+        Args:
+            byts (bytes): Bytes to unpack.
+
+        Notes:
+            This skips tracking the size of each object and must not be mixed
+            with feed() on the same Unpk.
+
+        Returns:
+            iterator: The completed objects.
+        '''
+        self.unpk.feed(byts)
+        return self.unpk
+
 def loadfile(path):
     '''
     Load and upack the msgpack bytes from a file by path.
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import os
+import lzma
+import zlib
 import heapq
 import bisect
 import shutil
 import asyncio
 import logging
+import functools
 import contextlib
 
 import regex
@@ -15,14 +18,164 @@ import synapse.common as s_common
 
 import synapse.lib.base as s_base
 import synapse.lib.coro as s_coro
+import synapse.lib.msgpack as s_msgpack
 import synapse.lib.slabseqn as s_slabseqn
 import synapse.lib.lmdbslab as s_lmdbslab
 
-from typing import List, Tuple, Dict, Optional, Any, AsyncIterator
+from typing import List, Tuple, Dict, Optional, Any, AsyncIterator, Union
 
 logger = logging.getLogger(__name__)
 
 seqnslabre = regex.compile(r'^seqn([0-9a-f]{16})\.lmdb$')
+zseqnre = regex.compile(r'^seqn([0-9a-f]{16})\.zseqn$')
+
+ZSEQN_MAGIC = b'synzseqn'
+ZSEQN_VERSION = 1
+ZSEQN_BLOCKSIZE = 256 * 1024
+
+codecs = {
+    'lzma': lzma,
+    'zlib': zlib,
+}
+
+class ZSeqn(s_base.Base):
+    '''
+    A read-only sequence of (indx, valu) tuples stored in blocks of compressed msgpack.
+
+    Notes:
+        The file contains the compressed blocks followed by a msgpack encoded footer which
+        records the first offset, file offset, and size of each block.  The footer is
+        followed by its 8 byte length and the ZSEQN_MAGIC bytes.
+    '''
+    async def __anit__(self, path: str):  # type: ignore
+
+        await s_base.Base.__anit__(self)
+
+        self.path = path
+        self.fd = open(path, 'rb')
+        self.onfini(self.fd.close)
+
+        info = self._loadFooter()
+
+        self.codec = codecs.get(info.get('codec'))
+        if self.codec is None:
+            self.fd.close()
+            mesg = f'Compressed log {path} uses an unknown codec: {info.get("codec")}'
+            raise s_exc.BadCoreStore(mesg=mesg)
+
+        self.size = info['count']
+        self.indx = info['indx']
+        self.blocks = info['blocks']
+        self.blockindx = [block[0] for block in self.blocks]
+
+        # The most recently decompressed block
+        self._cachebidx = None
+        self._cacheitems = ()
+        self._cachekeys = ()
+
+    def __repr__(self):
+        return f'ZSeqn: {self.path!r}'
+
+    def _loadFooter(self):
+
+        try:
+            self.fd.seek(-16, os.SEEK_END)
+            tail = self.fd.read(16)
+
+            if tail[8:] != ZSEQN_MAGIC:
+                raise s_exc.BadCoreStore(mesg=f'Invalid compressed log file: {self.path}')
+
+            size = int.from_bytes(tail[:8], 'big')
+            self.fd.seek(-16 - size, os.SEEK_END)
+            info = s_msgpack.un(self.fd.read(size))
+
+        except OSError as e:
+            self.fd.close()
+            raise s_exc.BadCoreStore(mesg=f'Invalid compressed log file: {self.path}') from e
+
+        except s_exc.BadCoreStore:
+            self.fd.close()
+            raise
+
+        if info.get('version') != ZSEQN_VERSION:
+            self.fd.close()
+            mesg = f'Compressed log {self.path} has version {info.get("version")}. Expected {ZSEQN_VERSION}.'
+            raise s_exc.BadStorageVersion(mesg=mesg)
+
+        return info
+
+    def _getBlock(self, bidx):
+
+        if bidx != self._cachebidx:
+
+            _, offs, size = self.blocks[bidx]
+
+            self.fd.seek(offs)
+            byts = self.codec.decompress(self.fd.read(size))
+
+            self._cacheitems = [item for (_, item) in s_msgpack.Unpk().feed(byts)]
+            self._cachekeys = [item[0] for item in self._cacheitems]
+            self._cachebidx = bidx
+
+        return self._cachekeys, self._cacheitems
+
+    def _getBlockIndx(self, offs):
+        return max(bisect.bisect_right(self.blockindx, offs) - 1, 0)
+
+    def add(self, item, indx=None):
+        raise s_exc.IsReadOnly(mesg=f'Compressed log {self.path} is read-only.')
+
+    def addWithPackRetn(self, item, indx=None):
+        raise s_exc.IsReadOnly(mesg=f'Compressed log {self.path} is read-only.')
+
+    def first(self):
+        if not self.blocks:
+            return None
+        return self._getBlock(0)[1][0]
+
+    def last(self):
+        if not self.blocks:
+            return None
+        return self._getBlock(len(self.blocks) - 1)[1][-1]
+
+    def index(self):
+        '''
+        Return the next index after the last entry in the sequence.
+        '''
+        return self.indx
+
+    def iter(self, offs):
+        '''
+        Iterate over items in a sequence from a given offset.
+
+        Args:
+            offs (int): The offset to begin iterating from.
+
+        Yields:
+            (indx, valu): The index and valu of the item.
+        '''
+        if not self.blocks:
+            return
+
+        for bidx in range(self._getBlockIndx(offs), len(self.blocks)):
+
+            keys, items = self._getBlock(bidx)
+
+            for item in items[bisect.bisect_left(keys, offs):]:
+                yield item
+
+    def get(self, offs):
+        '''
+        Retrieve a single row by offset
+        '''
+        if not self.blocks or offs < self.blockindx[0]:
+            return None
+
+        keys, items = self._getBlock(self._getBlockIndx(offs))
+
+        i = bisect.bisect_left(keys, offs)
+        if i < len(keys) and keys[i] == offs:
+            return items[i][1]
 
 class MultiSlabSeqn(s_base.Base):
     '''
@@ -40,6 +193,11 @@ class MultiSlabSeqn(s_base.Base):
             opts (Optional[Dict]):  options for this multislab
             slabopts (Optional[Dict]):  options to pass through to the slab creation
 
+        Notes:
+            The following opts are supported:
+
+            - compress: The codec ("zlib" or "lzma") used to compress rotated slabs into read-only segments.
+            - compress:blocksize: The uncompressed size of each block in a compressed segment.
         '''
 
         await s_base.Base.__anit__(self)
@@ -47,6 +205,13 @@ class MultiSlabSeqn(s_base.Base):
         if opts is None:
             opts = {}
 
+        self.compname = opts.get('compress')
+        if self.compname is not None and self.compname not in codecs:
+            mesg = f'Invalid compression codec: {self.compname}'
+            raise s_exc.BadArg(mesg=mesg, name='compress', valu=self.compname)
+
+        self.blocksize = opts.get('compress:blocksize', ZSEQN_BLOCKSIZE)
+
         self.offsevents: List[Tuple[int, int, asyncio.Event]] = []  # as a heap
         self._waitcounter = 0
 
@@ -60,20 +225,28 @@ class MultiSlabSeqn(s_base.Base):
         self.tailseqn: Optional[s_slabseqn.SlabSeqn] = None
 
         # The most recently accessed slab/seqn that isn't the tail
-        self._cacheslab: Optional[s_lmdbslab.Slab] = None
-        self._cacheseqn: Optional[s_slabseqn.SlabSeqn] = None
+        self._cacheslab: Optional[Union[s_lmdbslab.Slab, ZSeqn]] = None
+        self._cacheseqn: Optional[Union[s_slabseqn.SlabSeqn, ZSeqn]] = None
         self._cacheridx: Optional[int] = None
 
         # A startidx -> (Slab, Seqn) dict for all open Slabs, so we don't accidentally open the same Slab twice
         self._openslabs: Dict[int, Tuple[s_lmdbslab.Slab, s_slabseqn.SlabSeqn]] = {}
 
+        # The startidx of each compressed segment and a startidx -> ZSeqn dict for the open ones
+        self._zseqns = set()
+        self._openzseqns: Dict[int, ZSeqn] = {}
+
         # Lock to avoid an open race
         self._openlock = asyncio.Lock()
+        self._complock = asyncio.Lock()
 
         await self._discoverRanges()
 
         async def fini():
-            for slab, _ in list(self._openslabs.values()):
+            opened = [slab for slab, _ in self._openslabs.values()]
+            opened.extend(self._openzseqns.values())
+
+            for slab in opened:
                 # We incref the slabs, so might have to fini multiple times
                 count = 1
                 while count:
@@ -81,6 +254,9 @@ class MultiSlabSeqn(s_base.Base):
 
         self.onfini(fini)
 
+        if self.compname is not None:
+            self.schedCoro(self._compressTask())
+
     def __repr__(self):
         return f'MultiSlabSeqn: {self.dirn!r}'
 
@@ -108,9 +284,23 @@ class MultiSlabSeqn(s_base.Base):
         self.indx = 0  # The next place an add() will go
         lowindx = None
 
-        # Make sure the files are in order
+        self._zseqns.clear()
+
+        # Remove any compressed segments which were interrupted while being written
+        for fn in s_common.listdir(self.dirn, glob='*seqn' + '[abcdef01234567890]' * 16 + '.zseqn.tmp'):
+            logger.warning(f'Removing incomplete compressed log {fn}')
+            os.unlink(fn)
+
+        paths = []
+        for fn in s_common.listdir(self.dirn, glob='*seqn' + '[abcdef01234567890]' * 16 + '.zseqn'):
+            match = zseqnre.match(os.path.basename(fn))
+            assert match
+
+            startidx = int(match.group(1), 16)
+            self._zseqns.add(startidx)
+            paths.append((startidx, fn))
 
-        for fn in sorted(s_common.listdir(self.dirn, glob='*seqn' + '[abcdef01234567890]' * 16 + '.lmdb')):
+        for fn in s_common.listdir(self.dirn, glob='*seqn' + '[abcdef01234567890]' * 16 + '.lmdb'):
 
             if not os.path.isdir(fn):
                 logger.warning(f'Found a non-directory {fn} where a directory should be')
@@ -118,7 +308,18 @@ class MultiSlabSeqn(s_base.Base):
             match = seqnslabre.match(os.path.basename(fn))
             assert match
 
-            newstartidx = int(match.group(1), 16)
+            startidx = int(match.group(1), 16)
+            if startidx in self._zseqns:
+                # The slab was compressed but not yet removed
+                logger.warning(f'Removing log {fn} which has already been compressed')
+                self._rmSlabFiles(fn)
+                continue
+
+            paths.append((startidx, fn))
+
+        # Make sure the files are in order
+
+        for newstartidx, fn in sorted(paths):
 
             assert newstartidx >= fnstartidx
 
@@ -135,24 +336,31 @@ class MultiSlabSeqn(s_base.Base):
                 if fnstartidx != lastidx + 1:
                     logger.debug(f'Multislab:  gap in indices at {fn}.  Previous last index is {lastidx}.')
 
-            async with await s_lmdbslab.Slab.anit(fn, **self.slabopts) as slab:
-                self.firstindx = self._getFirstIndx(slab)
-                # We use the old name of the sequence to ease migration from the old system
-                seqn = slab.getSeqn('nexuslog')
+            if fnstartidx in self._zseqns:
+                async with await ZSeqn.anit(fn) as seqn:
+                    firstitem = seqn.first()
+                    nextindx = seqn.index()
+
+            else:
+                async with await s_lmdbslab.Slab.anit(fn, **self.slabopts) as slab:
+                    self.firstindx = self._getFirstIndx(slab)
+                    # We use the old name of the sequence to ease migration from the old system
+                    seqn = slab.getSeqn('nexuslog')
 
-                firstitem = seqn.first()
+                    firstitem = seqn.first()
+                    nextindx = seqn.index()
 
-                if firstitem is None:
-                    self.indx = fnstartidx
-                else:
-                    self.indx = seqn.indx
+            if firstitem is None:
+                self.indx = fnstartidx
+            else:
+                self.indx = nextindx
 
-                    firstidx = firstitem[0]  # might not match the separately stored first index due to culling
+                firstidx = firstitem[0]  # might not match the separately stored first index due to culling
 
-                    if firstidx < fnstartidx:
-                        raise s_exc.BadCoreStore(mesg='Multislab:  filename inconsistent with contents')
+                if firstidx < fnstartidx:
+                    raise s_exc.BadCoreStore(mesg='Multislab:  filename inconsistent with contents')
 
-                    lastidx = seqn.index() - 1
+                lastidx = nextindx - 1
 
             self._ranges.append(fnstartidx)
 
@@ -163,12 +371,44 @@ class MultiSlabSeqn(s_base.Base):
         if self.firstindx > self.indx:
             raise s_exc.BadCoreStore(mesg='Invalid firstindx value')
 
+        # The tail is always a writable slab
+        if fnstartidx in self._zseqns:
+            fnstartidx = max(self.indx, fnstartidx + 1)
+
         await self._initTailSlab(fnstartidx)
 
+    @staticmethod
+    async def initEmpty(dirn: str, indx: int, slabopts: Optional[Dict] = None) -> None:
+        '''
+        Initialize an empty sequence in a new directory which begins at the given index.
+        '''
+        if s_common.listdir(dirn, glob='*seqn*'):
+            mesg = f'Multislab:  cannot initialize an empty sequence in non-empty directory {dirn}'
+            raise s_exc.BadArg(mesg=mesg)
+
+        fn = MultiSlabSeqn.slabFilename(dirn, indx)
+        async with await s_lmdbslab.Slab.anit(fn, **(slabopts or {})) as slab:
+            MultiSlabSeqn._setFirstIndx(slab, indx)
+
     @staticmethod
     def slabFilename(dirn: str, indx: int):
         return s_common.genpath(dirn, f'seqn{indx:016x}.lmdb')
 
+    @staticmethod
+    def zseqnFilename(dirn: str, indx: int):
+        return s_common.genpath(dirn, f'seqn{indx:016x}.zseqn')
+
+    @staticmethod
+    def _rmSlabFiles(fn: str):
+
+        optspath = s_common.switchext(fn, ext='.opts.yaml')
+        try:
+            os.unlink(optspath)
+        except FileNotFoundError:
+            pass
+
+        shutil.rmtree(fn, ignore_errors=True)
+
     async def _initTailSlab(self, indx: int) -> int:
         if self.tailslab:
             await self.tailslab.fini()
@@ -207,7 +447,154 @@ class MultiSlabSeqn(s_base.Base):
             return self._ranges[-1]
 
         logger.info('Rotating %s at indx %d', self.tailslab.path, self.indx)
-        return await self._initTailSlab(self.indx)
+
+        # a group which is still being applied may span the rotation
+        size = self.getGroupSize()
+
+        indx = await self._initTailSlab(self.indx)
+
+        if size:
+            self._setGroupSize(size)
+
+        if self.compname is not None:
+            self.schedCoro(self._compressTask())
+
+        return indx
+
+    async def _compressTask(self):
+        try:
+            await self.compress()
+        except asyncio.CancelledError:  # pragma: no cover
+            raise
+        except Exception:  # pragma: no cover
+            logger.exception(f'Error compressing rotated logs in {self.dirn}')
+
+    async def compress(self) -> int:
+        '''
+        Rewrite each rotated slab into a compressed read-only segment.
+
+        Note:
+            This is a no-op unless the "compress" option is set.
+
+        Returns:
+            int: The number of slabs which were compressed.
+        '''
+        if self.compname is None:
+            return 0
+
+        count = 0
+        async with self._complock:
+
+            for startidx in self._ranges[:-1]:
+
+                if self.isfini:  # pragma: no cover
+                    break
+
+                # ranges may have been culled while we were compressing
+                if startidx in self._zseqns or startidx not in self._ranges[:-1]:
+                    continue
+
+                await self._compressSlab(startidx)
+                count += 1
+
+        return count
+
+    async def _compressSlab(self, startidx: int) -> None:
+
+        codec = codecs[self.compname]
+
+        fn = self.slabFilename(self.dirn, startidx)
+        zfn = self.zseqnFilename(self.dirn, startidx)
+        tmpfn = zfn + '.tmp'
+
+        logger.info('Compressing log %s using %s', fn, self.compname)
+
+        blocks = []
+        count = 0
+
+        slab, seqn = await self._makeSlab(startidx)
+
+        try:
+
+            with open(tmpfn, 'wb') as fd:
+
+                async def flush(first, chunk):
+                    byts = await s_coro.executor(codec.compress, b''.join(chunk))
+                    blocks.append((first, fd.tell(), len(byts)))
+                    fd.write(byts)
+
+                chunk = []
+                chunksize = 0
+
+                for indx, byts in seqn.rows(startidx):
+
+                    if not chunk:
+                        first = indx
+
+                    # the stored bytes are already msgpack encoded so we pack the (indx, valu) tuple by hand
+                    item = b'\x92' + s_msgpack.en(indx) + byts
+
+                    chunk.append(item)
+                    chunksize += len(item)
+                    count += 1
+
+                    if chunksize >= self.blocksize:
+                        await flush(first, chunk)
+                        chunk = []
+                        chunksize = 0
+
+                    if count % 1000 == 0:
+                        await asyncio.sleep(0)
+
+                if chunk:
+                    await flush(first, chunk)
+
+                info = {
+                    'version': ZSEQN_VERSION,
+                    'codec': self.compname,
+                    'count': count,
+                    'indx': seqn.index(),
+                    'blocks': blocks,
+                }
+
+                footer = s_msgpack.en(info)
+                fd.write(footer)
+                fd.write(len(footer).to_bytes(8, 'big'))
+                fd.write(ZSEQN_MAGIC)
+
+                fd.flush()
+                os.fsync(fd.fileno())
+
+            os.replace(tmpfn, zfn)
+
+        except Exception:
+            try:
+                os.unlink(tmpfn)
+            except FileNotFoundError:  # pragma: no cover
+                pass
+            raise
+
+        finally:
+            await slab.fini()
+
+        async with self._openlock:
+
+            self._zseqns.add(startidx)
+
+            if self._cacheridx is not None and self._ranges[self._cacheridx] == startidx:
+                self._cacheridx = None
+                assert self._cacheslab
+                await self._cacheslab.fini()
+                self._cacheslab = self._cacheseqn = None
+
+            # readers which still have the slab open will continue to use it until they are done
+            item = self._openslabs.get(startidx)
+            if item is not None:
+                item[0].onfini(functools.partial(self._rmSlabFiles, fn))
+            else:
+                self._rmSlabFiles(fn)
+
+        logger.info('Compressed log %s (%d entries in %d blocks)', zfn, count, len(blocks))
 
     async def cull(self, offs: int) -> bool:
         '''
@@ -238,22 +625,26 @@ class MultiSlabSeqn(s_base.Base):
         for ridx in range(len(self._ranges) - 1):
             startidx = self._ranges[ridx]
 
-            if self._openslabs.get(startidx):
+            if self._openslabs.get(startidx) or self._openzseqns.get(startidx):
                 raise s_exc.SlabInUse(mesg='Attempt to cull while another task is still using it')
 
-            fn = self.slabFilename(self.dirn, startidx)
+            if startidx in self._zseqns:
+                fn = self.zseqnFilename(self.dirn, startidx)
+            else:
+                fn = self.slabFilename(self.dirn, startidx)
+
             if offs < self._ranges[ridx + 1] - 1:
                 logger.warning('Log %s will not be deleted since offs is less than last indx', fn)
                 break
 
-            optspath = s_common.switchext(fn, ext='.opts.yaml')
-            try:
-                os.unlink(optspath)
-            except FileNotFoundError:  # pragma: no cover
-                pass
-
             logger.info('Removing log %s with startidx %d', fn, startidx)
-            shutil.rmtree(fn)
+
+            if startidx in self._zseqns:
+                os.unlink(fn)
+                self._zseqns.discard(startidx)
+            else:
+                self._rmSlabFiles(fn)
+
             del_ridx = ridx
 
             await asyncio.sleep(0)
@@ -271,10 +662,13 @@ class MultiSlabSeqn(s_base.Base):
 
         return True
 
-    async def _makeSlab(self, startidx: int) -> Tuple[s_lmdbslab.Slab, s_slabseqn.SlabSeqn]:
+    async def _makeSlab(self, startidx: int) -> Tuple[Union[s_lmdbslab.Slab, ZSeqn], Union[s_slabseqn.SlabSeqn, ZSeqn]]:
 
         async with self._openlock:  # Avoid race in two tasks making the same slab
 
+            if startidx in self._zseqns:
+                return await self._openZSeqn(startidx)
+
             item = self._openslabs.get(startidx)
             if item is not None:
                 item[0].incref()
@@ -297,8 +691,26 @@ class MultiSlabSeqn(s_base.Base):
 
             return slab, seqn
 
+    async def _openZSeqn(self, startidx: int) -> Tuple[ZSeqn, ZSeqn]:
+
+        zseqn = self._openzseqns.get(startidx)
+        if zseqn is not None:
+            zseqn.incref()
+            return zseqn, zseqn
+
+        zseqn = await ZSeqn.anit(self.zseqnFilename(self.dirn, startidx))
+
+        self._openzseqns[startidx] = zseqn
+
+        def fini():
+            self._openzseqns.pop(startidx, None)
+
+        zseqn.onfini(fini)
+
+        return zseqn, zseqn
+
     @contextlib.asynccontextmanager
-    async def _getSeqn(self, ridx: int) -> AsyncIterator[s_slabseqn.SlabSeqn]:
+    async def _getSeqn(self, ridx: int) -> AsyncIterator[Union[s_slabseqn.SlabSeqn, ZSeqn]]:
         '''
         Get the sequence corresponding to an index into self._ranges
         '''
@@ -398,6 +810,51 @@ class MultiSlabSeqn(s_base.Base):
 
         return retn
 
+    def getGroupSize(self) -> int:
+        '''
+        Return the number of items saved by the last saveWithPackRetn() call which has not been marked done.
+        '''
+        assert self.tailslab
+        byts = self.tailslab.get(b'groupsize', db=self.tailslab.initdb('info'))
+        if byts is None:
+            return 0
+
+        return s_common.int64un(byts)
+
+    def setGroupDone(self) -> None:
+        '''
+        Mark the items saved by the last saveWithPackRetn() call as done.
+        '''
+        self._setGroupSize(0)
+
+    def _setGroupSize(self, size: int) -> None:
+
+        assert self.tailslab
+        db = self.tailslab.initdb('info')
+
+        if size:
+            self.tailslab.put(b'groupsize', s_common.int64en(size), db=db)
+        else:
+            self.tailslab.delete(b'groupsize', db=db)
+
+    async def saveWithPackRetn(self, items) -> List[Tuple[int, bytes]]:
+        '''
+        Add a series of items to the end of the sequence in a single write, returning the offset and packed item of each.
+
+        Notes:
+            The number of items is stored in the same slab as the items until setGroupDone() is called,
+            so it is always committed along with them.
+        '''
+        assert self.tailseqn
+        self._setGroupSize(len(items))
+        retn = await self.tailseqn.saveWithPackRetn(items, indx=self.indx)
+
+        if retn:
+            self.indx = retn[-1][0] + 1
+            self._wake_waiters()
+
+        return retn
+
     async def last(self) -> Optional[Tuple[int, Any]]:
         ridx = self._getRangeIndx(self.indx - 1)
         if ridx is None:
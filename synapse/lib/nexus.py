@@ -4,11 +4,13 @@ import asyncio
 import logging
 import functools
 import contextlib
+import collections
 
 from typing import List, Dict, Any, Callable, Tuple, Optional, AsyncIterator
 
 import synapse.exc as s_exc
 import synapse.common as s_common
+import synapse.daemon as s_daemon
 import synapse.telepath as s_telepath
 
 import synapse.lib.base as s_base
@@ -29,7 +31,20 @@ FOLLOWER_CONNECT_WAIT_S = 60.0
 mirrordisconnect = f'Unable to connect to leader for {FOLLOWER_CONNECT_WAIT_S}s.'
 
 WINDOW_MAXSIZE = 10_000
-YIELD_PREFIX = b'\x92\xa8t2:yield\x81\xa4retn\x92\xc3\x92'
+GROUP_MAXSIZE = 1_000  # Max number of queued events to append to the log in a single write
+
+BATCH_MAXSIZE = 1_000  # Max number of entries sent to a mirror in a single batch
+BATCH_MAXBYTES = 4 * 1024 * 1024  # Max packed size of a realtime batch sent to a mirror
+BATCH_MAXWAIT = 0.005  # Max seconds to wait for a realtime batch to fill before sending it
+
+# The packed ('t2:yield', {'retn': (True, ...)}) message header used to send pre-packed entries
+YIELD_PREFIX = b'\x92\xa8t2:yield\x81\xa4retn\x92\xc3'
+
+def _packBatch(bodies):
+    '''
+    Pack a t2:yield message containing a list of pre-packed (offs, item) entries.
+    '''
+    return YIELD_PREFIX + s_msgpack.arrayhead(len(bodies)) + b''.join(bodies)
 
 class RegMethType(type):
     '''
@@ -76,6 +91,32 @@ class ChangeDist(s_base.Base):
             self.event.clear()
             await self.event.wait()
 
+    async def slices(self, size=BATCH_MAXSIZE):
+        '''
+        Yield lists of up to size consecutive change entries.
+        '''
+        while not self.isfini:
+
+            items = []
+
+            async for item in self.nexuslog.iter(self.offs):
+
+                self.offs = item[0] + 1
+                items.append(item)
+
+                if len(items) >= size:
+                    yield items
+                    items = []
+
+            if items:
+                yield items
+
+            if self.isfini:
+                return
+
+            self.event.clear()
+            await self.event.wait()
+
     def update(self) -> bool:
         if self.isfini:
             return False
@@ -103,6 +144,9 @@ class NexsRoot(s_base.Base):
         self.applytask = None
         self.issuewait = False
 
+        # Events waiting to be committed: (item, futu, scope)
+        self._eatqueue = collections.deque()
+
         self.ready = asyncio.Event()
         self.donexslog = self.cell.conf.get('nexslog:en')
 
@@ -136,7 +180,8 @@ class NexsRoot(s_base.Base):
         elif vers != 2:
             raise s_exc.BadStorageVersion(mesg=f'Got nexus log version {vers}.  Expected 2.  Accidental downgrade?')
 
-        self.nexslog = await s_multislabseqn.MultiSlabSeqn.anit(logpath, cell=cell)
+        opts = {'compress': self.cell.conf.get('nexslog:compress')}
+        self.nexslog = await s_multislabseqn.MultiSlabSeqn.anit(logpath, opts=opts, cell=cell)
 
         # just in case were previously configured differently
         logindx = self.nexslog.index()
@@ -147,6 +192,13 @@ class NexsRoot(s_base.Base):
         self.nexslog.setIndex(maxindx)
 
         async def fini():
+
+            while self._eatqueue:
+                item, futu, _ = self._eatqueue.popleft()
+                if futu is not None and not futu.done():
+                    mesg = f'Nexus has been shutdown, cannot apply {s_common.trimText(str(item))}'
+                    futu.set_exception(s_exc.IsFini(mesg=mesg))
+
             for wind in self._linkmirrors:
                 await wind.fini()
 
@@ -277,8 +329,9 @@ class NexsRoot(s_base.Base):
             This must be called at cell startup after subsystems are initialized but before any write transactions
             might happen.
 
-            The log can only have recorded 1 entry ahead of what is applied.  All log actions are idempotent, so
-            replaying the last action that (might have) already happened is harmless.
+            The log can only have recorded the last group of entries ahead of what is applied.  All log actions are
+            idempotent, so replaying the last group of actions that (might have) already happened is harmless.
+            The size of the group is cleared from the log once it is fully applied.
         '''
         if not self.donexslog:  # pragma: no cover
             return
@@ -288,14 +341,19 @@ class NexsRoot(s_base.Base):
             # We have a brand new log
             return
 
-        try:
-            await self._apply(*indxitem)
+        size = max(1, self.nexslog.getGroupSize())
+        offs = max(0, indxitem[0] - size + 1)
 
-        except asyncio.CancelledError:  # pragma: no cover  TODO:  remove once >= py 3.8 only
-            raise
+        async for indxitem in self.nexslog.iter(offs):
 
-        except Exception:
-            logger.exception(f'Exception while replaying log: {s_common.trimText(repr(indxitem))}')
+            try:
+                await self._apply(*indxitem)
+
+            except asyncio.CancelledError:  # pragma: no cover  TODO:  remove once >= py 3.8 only
+                raise
+
+            except Exception:
+                logger.exception(f'Exception while replaying log: {s_common.trimText(repr(indxitem))}')
 
     async def addWriteHold(self, reason):
 
@@ -376,79 +434,207 @@ class NexsRoot(s_base.Base):
     async def eat(self, nexsiden, event, args, kwargs, meta, wait=True):
         '''
         Actually mutate for the given nexsiden instance.
+
+        Notes:
+            Events which are queued while a previous group is being committed are
+            appended to the log in a single write and then applied in order.
         '''
         if meta is None:
             meta = {}
 
-        await self.cell.nexslock.acquire()
-
         if self.isfini:
-            self.cell.nexslock.release()
             raise s_exc.IsFini(mesg=f'Nexus has been shutdown, cannot propose {s_common.trimText(str((nexsiden, event, args, kwargs, meta)))}')
 
-        try:
-            if (nexus := self._nexskids.get(nexsiden)) is None:
-                mesg = f'No Nexus Pusher with iden {nexsiden} {event=} args={s_common.trimText(repr(args))} ' \
-                       f'kwargs={s_common.trimText(repr(kwargs))}'
-                raise s_exc.NoSuchIden(mesg=mesg, iden=nexsiden, event=event)
+        self._reqNexsHand(nexsiden, event, args, kwargs)
 
-            if event not in nexus._nexshands:
-                mesg = f'No event handler for event {event} args={s_common.trimText(repr(args))} ' \
-                       f'kwargs={s_common.trimText(repr(kwargs))}'
-                raise s_exc.NoSuchName(mesg=mesg, iden=nexsiden, event=event)
+        self.reqNotReadOnly()
 
-            self.reqNotReadOnly()
+        futu = self._putEatQueue((nexsiden, event, args, kwargs, meta), wait=wait)
 
-            # Keep a reference to the shielded task to ensure it isn't GC'd
-            self.applytask = asyncio.create_task(self._eat((nexsiden, event, args, kwargs, meta)))
+        if wait:
+            # if we are cancelled before the event is committed it is dropped
+            return await futu
 
-            # Clone the current scope to the applytask, so that log events in the scope
-            # would have access to any user / sess values which have been set.
-            s_scope.clone(self.applytask)
+    def _reqNexsHand(self, nexsiden, event, args, kwargs):
 
-        except:
-            self.cell.nexslock.release()
-            raise
+        if (nexus := self._nexskids.get(nexsiden)) is None:
+            mesg = f'No Nexus Pusher with iden {nexsiden} {event=} args={s_common.trimText(repr(args))} ' \
+                   f'kwargs={s_common.trimText(repr(kwargs))}'
+            raise s_exc.NoSuchIden(mesg=mesg, iden=nexsiden, event=event)
+
+        if (hand := nexus._nexshands.get(event)) is None:
+            mesg = f'No event handler for event {event} args={s_common.trimText(repr(args))} ' \
+                   f'kwargs={s_common.trimText(repr(kwargs))}'
+            raise s_exc.NoSuchName(mesg=mesg, iden=nexsiden, event=event)
+
+        return nexus, hand
+
+    def _putEatQueue(self, item, wait=True):
 
+        futu = None
         if wait:
-            return await asyncio.shield(self.applytask)
+            futu = self.loop.create_future()
 
-    async def _eat(self, item, indx=None):
+        # Copy the current scope so the event is applied with access to
+        # any user / sess values which have been set.
+        self._eatqueue.append((item, futu, s_scope.copy()))
+
+        if self.applytask is None or self.applytask.done():
+            # Keep a reference to the task to ensure it isn't GC'd
+            self.applytask = asyncio.create_task(self._runEatQueue())
+
+        return futu
+
+    async def _runEatQueue(self):
 
         try:
-            if self.isfini:
-                raise s_exc.IsFini(mesg=f'Nexus has been shutdown, cannot apply {s_common.trimText(str(item))}')
 
-            if self.donexslog:
-                saveindx, packitem = await self.nexslog.addWithPackRetn(item, indx=indx)
+            while self._eatqueue:
 
-                if self._linkmirrors:
-                    tupl = (saveindx, YIELD_PREFIX + s_msgpack.en(saveindx) + packitem)
-                    for wind in tuple(self._linkmirrors):
-                        await wind.put(tupl)
+                async with self.cell.nexslock:
 
-                if self._mirrors:
-                    for dist in tuple(self._mirrors):
-                        dist.update()
+                    entries = []
+                    while self._eatqueue and len(entries) < GROUP_MAXSIZE:
 
-            else:
-                saveindx = self.nexshot.get('nexs:indx')
-                if indx is not None and indx > saveindx:  # pragma: no cover
-                    saveindx = self.nexshot.set('nexs:indx', indx)
+                        entry = self._eatqueue.popleft()
 
-                self.nexshot.inc('nexs:indx')
+                        futu = entry[1]
+                        if futu is not None and futu.done():
+                            continue
 
-            return (saveindx, await self._apply(saveindx, item))
+                        entries.append(entry)
 
-        finally:
-            self.cell.nexslock.release()
+                    if not entries:
+                        continue
+
+                    try:
+                        await self._eat(entries)
+
+                    except Exception as e:  # pragma: no cover
+                        logger.exception(f'Error committing Nexus events: {e}')
+                        for entry in tuple(entries):
+                            self._setEntryRetn(entries, entry, exc=e)
+
+                    finally:
+                        # _eat removes the entries it resolves, so no caller may be
+                        # left waiting on an event which was not applied
+                        for item, futu, _ in entries:
+                            mesg = f'Nexus event was not applied {s_common.trimText(str(item))}'
+                            self._setEatRetn(futu, item, exc=s_exc.SynErr(mesg=mesg))
+
+        except asyncio.CancelledError:
+
+            while self._eatqueue:
+                item, futu, _ = self._eatqueue.popleft()
+                mesg = f'Nexus commit task was cancelled, cannot apply {s_common.trimText(str(item))}'
+                self._setEatRetn(futu, item, exc=s_exc.IsFini(mesg=mesg))
+
+            raise
+
+    async def _eat(self, entries):
+        '''
+        Append a group of queued events to the log in a single write and apply them in order.
+        '''
+        if self.isfini:
+            for entry in tuple(entries):
+                mesg = f'Nexus has been shutdown, cannot apply {s_common.trimText(str(entry[0]))}'
+                self._setEntryRetn(entries, entry, exc=s_exc.IsFini(mesg=mesg))
+            return
+
+        # the write hold may have been set while the events were queued
+        todo = []
+        for entry in tuple(entries):
+            try:
+                self.reqNotReadOnly()
+                todo.append(entry)
+            except s_exc.IsReadOnly as e:
+                self._setEntryRetn(entries, entry, exc=e)
+
+        if not todo:
+            return
+
+        items = [entry[0] for entry in todo]
+
+        if self.donexslog:
+
+            saved = await self.nexslog.saveWithPackRetn(items)
+
+            if self._linkmirrors:
+                # pre-pack the (offs, item) tuple once for all mirrors
+                tupls = [(saveindx, b'\x92' + s_msgpack.en(saveindx) + packitem) for (saveindx, packitem) in saved]
+                for wind in tuple(self._linkmirrors):
+                    await wind.puts(tupls)
+
+            if self._mirrors:
+                for dist in tuple(self._mirrors):
+                    dist.update()
+
+            indxs = [saveindx for (saveindx, _) in saved]
+
+        else:
+            saveindx = self.nexshot.get('nexs:indx')
+            self.nexshot.inc('nexs:indx', valu=len(items))
+
+            indxs = range(saveindx, saveindx + len(items))
+
+        for saveindx, entry in zip(indxs, todo):
+
+            item, _, scope = entry
+
+            task = asyncio.create_task(self._apply(saveindx, item))
+            s_scope.clone(task, scope=scope)
+
+            try:
+                retn = await task
+
+            except asyncio.CancelledError:
+                # an event handler may raise CancelledError without this task being cancelled
+                if asyncio.current_task().cancelling():
+                    raise
+
+                mesg = f'Nexus event was cancelled while being applied {s_common.trimText(str(item))}'
+                self._setEntryRetn(entries, entry, exc=s_exc.SynErr(mesg=mesg))
+                continue
+
+            except Exception as e:
+                self._setEntryRetn(entries, entry, exc=e)
+                continue
+
+            self._setEntryRetn(entries, entry, retn=(saveindx, retn))
+
+        if self.donexslog:
+            self.nexslog.setGroupDone()
+
+    def _setEntryRetn(self, entries, entry, retn=None, exc=None):
+        '''
+        Resolve a queued entry and remove it from the group of unresolved entries.
+        '''
+        entries.remove(entry)
+        self._setEatRetn(entry[1], entry[0], retn=retn, exc=exc)
+
+    def _setEatRetn(self, futu, item, retn=None, exc=None):
+
+        if futu is None:
+            if exc is not None:
+                logger.error(f'Error applying Nexus event {s_common.trimText(repr(item))}: {exc}')
+            return
+
+        if futu.done():
+            return
+
+        if exc is not None:
+            futu.set_exception(exc)
+            return
+
+        futu.set_result(retn)
 
     async def _apply(self, indx, mesg):
 
         nexsiden, event, args, kwargs, _ = mesg
 
-        nexus = self._nexskids[nexsiden]
-        func, passitem = nexus._nexshands[event]
+        # mirrors queue a batch of events before any are applied, so the
+        # target may have been created by an earlier event in the group.
+        nexus, (func, passitem) = self._reqNexsHand(nexsiden, event, args, kwargs)
 
         if passitem:
             return await func(nexus, *args, nexsitem=(indx, mesg), **kwargs)
@@ -484,10 +670,16 @@ class NexsRoot(s_base.Base):
 
         return True
 
-    async def iter(self, offs: int, tellready=False, wait=True) -> AsyncIterator[Any]:
+    async def iter(self, offs: int, tellready=False, wait=True, batch=False) -> AsyncIterator[Any]:
         '''
         Returns an iterator of change entries in the log.
 
+        Args:
+            offs (int): The offset to begin iterating from.
+            tellready (bool): Yield None once caught up to the end of the log.
+            wait (bool): Wait for new change entries once caught up.
+            batch (bool): Yield lists of consecutive change entries rather than single entries.
+
         Notes:
             If this method is being called in the context of a Telepath call,
             it will directly send messages to the scope "link" object when it
@@ -495,6 +687,9 @@ class NexsRoot(s_base.Base):
             them as a generator. This is an optimization to avoid duplication
             of msgpack'ing the same object over and over again as the number
             of mirrors increases.
+
+            Realtime batches are sent once they reach BATCH_MAXSIZE entries or
+            BATCH_MAXBYTES, or after waiting BATCH_MAXWAIT seconds for more entries.
         '''
         if not self.donexslog:
             return
@@ -504,11 +699,14 @@ class NexsRoot(s_base.Base):
 
         maxoffs = offs
 
-        async for item in self.nexslog.iter(offs):
+        async for items in self._iterLogBatches(offs, batch):
             if self.isfini:  # pragma: no cover
                 raise s_exc.IsFini()
-            maxoffs = item[0] + 1
-            yield item
+            maxoffs = items[-1][0] + 1
+            if batch:
+                yield items
+            else:
+                yield items[0]
 
         if tellready:
             yield None
@@ -518,8 +716,12 @@ class NexsRoot(s_base.Base):
 
         if (link := s_scope.get('link')) is None:
             async with self.getChangeDist(maxoffs) as dist:
-                async for item in dist:
-                    yield item
+                if batch:
+                    async for items in dist.slices():
+                        yield items
+                else:
+                    async for item in dist:
+                        yield item
 
         else:
             async with self.getMirrorWindow() as wind:
@@ -527,17 +729,69 @@ class NexsRoot(s_base.Base):
                 # Ensure we are caught up after grabbing a window
                 sync = True
 
-                async for item in self.nexslog.iter(maxoffs):
-                    maxoffs = item[0] + 1
-                    yield item
+                async for items in self._iterLogBatches(maxoffs, batch):
+                    maxoffs = items[-1][0] + 1
+                    if batch:
+                        yield items
+                    else:
+                        yield items[0]
+
+                # the items which were yielded must be sent before the link is written to directly
+                await s_daemon.flushT2Yields()
+
+                if not batch:
+
+                    async for offs, body in wind:
+                        if sync:
+                            if offs < maxoffs:
+                                continue
+                            sync = False
+
+                        await link.send(YIELD_PREFIX + body)
+
+                    return
+
+                async for tupls in wind.slices(size=BATCH_MAXSIZE, timeout=BATCH_MAXWAIT):
 
-                async for offs, item in wind:
                     if sync:
-                        if offs < maxoffs:
+                        tupls = [tupl for tupl in tupls if tupl[0] >= maxoffs]
+                        if not tupls:
                             continue
                         sync = False
 
-                    await link.send(item)
+                    size = 0
+                    bodies = []
+
+                    for _, body in tupls:
+
+                        if bodies and size + len(body) > BATCH_MAXBYTES:
+                            await link.send(_packBatch(bodies))
+                            size = 0
+                            bodies = []
+
+                        size += len(body)
+                        bodies.append(body)
+
+                    await link.send(_packBatch(bodies))
+
+    async def _iterLogBatches(self, offs, batch):
+
+        if not batch:
+            async for item in self.nexslog.iter(offs):
+                yield (item,)
+            return
+
+        items = []
+        async for item in self.nexslog.iter(offs):
+
+            items.append(item)
+
+            if len(items) >= BATCH_MAXSIZE:
+                yield items
+                items = []
+
+        if items:
+            yield items
 
     @contextlib.asynccontextmanager
     async def getMirrorWindow(self):
@@ -644,6 +898,7 @@ class NexsRoot(s_base.Base):
                 await proxy.readyToMirror()
 
             self.issuewait = bool(features.get('issuewait'))
+            nexsbatch = bool(features.get('nexsbatch'))
 
             synvers = cellinfo['synapse']['version']
             cellvers = cellinfo['cell']['version']
@@ -686,6 +941,9 @@ class NexsRoot(s_base.Base):
                 if synvers >= (2, 95, 0):
                     opts['tellready'] = True
 
+                if nexsbatch:
+                    opts['batch'] = True
+
                 genr = proxy.getNexusChanges(offs, **opts)
                 async for item in genr:
 
@@ -702,29 +960,21 @@ class NexsRoot(s_base.Base):
                         self._mirready.set()
                         continue
 
-                    offs, args = item
+                    items = item if nexsbatch else (item,)
+
+                    offs = items[0][0]
                     if offs != self.nexslog.index():
                         logger.error(f'Local Nexus offset is out of sync from remote cell! Aborting mirror sync. Local offs={self.nexslog.index()}, Remote {offs=}')
                         await self.fini()
                         return
 
-                    meta = args[-1]
-                    respiden = meta.get('resp')
-                    respfutu = self._futures.get(respiden)
-
-                    try:
-                        retn = await self.eat(*args)
-
-                    except Exception as e:
-                        if respfutu is not None:
-                            assert not respfutu.done()
-                            respfutu.set_exception(e)
-                        else:  # pragma: no cover
-                            logger.exception(e)
+                    await self._eatMirrorBatch(items)
 
-                    else:
-                        if respfutu is not None:
-                            respfutu.set_result(retn)
+                    offs = items[-1][0]
+                    if offs + 1 != self.nexslog.index():
+                        logger.error(f'Local Nexus offset is out of sync from remote cell! Aborting mirror sync. Local offs={self.nexslog.index()}, Remote offs={offs + 1}')
+                        await self.fini()
+                        return
 
             except s_exc.LinkShutDown:
                 logger.warning('mirror loop: leader closed the connection.')
@@ -738,6 +988,40 @@ class NexsRoot(s_base.Base):
         if not self.isfini:
             await self.setNexsReady(not self.cell.conf.get('mirror'))
 
+    async def _eatMirrorBatch(self, items):
+        '''
+        Apply a batch of consecutive change entries from the leader.
+
+        Notes:
+            Each entry is queued before any are awaited so the batch is
+            committed to the local log as a single group. The Pusher for
+            each entry is resolved when it is applied, since it may be
+            created by an earlier entry in the batch.
+        '''
+        if self.isfini:
+            raise s_exc.IsFini(mesg='Nexus has been shutdown, cannot apply mirror changes.')
+
+        self.reqNotReadOnly()
+
+        futus = [self._putEatQueue(args) for (_, args) in items]
+        rets = await asyncio.gather(*futus, return_exceptions=True)
+
+        for (_, args), retn in zip(items, rets):
+
+            respiden = args[-1].get('resp')
+            respfutu = self._futures.get(respiden)
+
+            if isinstance(retn, BaseException):
+                if respfutu is not None:
+                    assert not respfutu.done()
+                    respfutu.set_exception(retn)
+                else:  # pragma: no cover
+                    logger.error(f'Error applying mirror change entry: {retn}', exc_info=retn)
+                continue
+
+            if respfutu is not None:
+                respfutu.set_result(retn)
+
     async def _tellAhaReady(self, status):
 
         if self.cell.ahaclient is None:
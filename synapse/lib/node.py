@@ -1,4 +1,3 @@
-import copy
 import logging
 import collections
 
@@ -20,14 +19,18 @@ class Node:
 
     NOTE: This object is for local Cortex use during a single Xact.
     '''
-    def __init__(self, snap, sode, bylayer=None):
+    __slots__ = ('snap', 'sode', 'buid', 'sodes', '_bylayer', 'ndef', 'form', 'props', 'tags',
+                 'tagprops', 'nodedata', '__weakref__')
+
+    def __init__(self, snap, sode, bylayer=None, sodes=None):
         self.snap = snap
         self.sode = sode
 
         self.buid = sode[0]
 
-        # Tracks which property is retrieved from which layer
-        self.bylayer = bylayer
+        # the (layriden, sode) list used to build bylayer on demand
+        self.sodes = sodes
+        self._bylayer = bylayer
 
         # if set, the node is complete.
         self.ndef = sode[1].get('ndef')
@@ -55,6 +58,15 @@ class Node:
         '''
         return await self.snap.view.getStorNodes(self.buid)
 
+    @property
+    def bylayer(self):
+        '''
+        A dictionary which tracks which property is retrieved from which layer.
+        '''
+        if self._bylayer is None and self.sodes is not None:
+            self._bylayer = getByLayer(self.sodes)
+        return self._bylayer
+
     def getByLayer(self):
         '''
         Return a dictionary that translates the node's bylayer dict to a primitive.
@@ -730,45 +742,78 @@ class Node:
 class Path:
     '''
     A path context tracked through the storm runtime.
+
+    Paths are persistent linked structures; forking a path shares the node
+    and link history with its parent and copies the path vars on first write.
     '''
+    __slots__ = ('node', 'nodechain', 'linkchain', '_vars', 'sharedvars', 'frames', 'ctors', 'display', 'metadata')
+
     def __init__(self, vars, nodes, links=None):
 
-        self.node = None
-        self.nodes = nodes
+        nodechain = None
+        for node in nodes:
+            nodechain = (nodechain, node)
 
+        linkchain = None
         if links is not None:
-            self.links = links
-        else:
-            self.links = []
+            for link in links:
+                linkchain = (linkchain, link)
+
+        self._initPath(vars, nodechain, linkchain)
 
-        if len(nodes):
-            self.node = nodes[-1]
+    def _initPath(self, vars, nodechain, linkchain, sharedvars=False):
+
+        self.node = None
+        if nodechain is not None:
+            self.node = nodechain[1]
+
+        # (parent, item) tuples which are shared with forked paths
+        self.nodechain = nodechain
+        self.linkchain = linkchain
+
+        self._vars = vars
+        self.sharedvars = sharedvars
 
-        self.vars = vars
         self.frames = []
         self.ctors = {}
 
-        # "builtins" which are *not* vars
-        # ( this allows copying variable context )
-        self.builtins = {
-            'path': self,
-            'node': self.node,
-        }
-
         self.display = None
         self.metadata = {}
 
+    @property
+    def vars(self):
+        # copy the vars on first access which may modify them
+        if self.sharedvars:
+            self._vars = self._vars.copy()
+            self.sharedvars = False
+        return self._vars
+
+    @vars.setter
+    def vars(self, valu):
+        self._vars = valu
+        self.sharedvars = False
+
+    @property
+    def nodes(self):
+        return _chainToList(self.nodechain)
+
+    @property
+    def links(self):
+        return _chainToList(self.linkchain)
+
     def getVar(self, name, defv=s_common.novalu):
 
         # check if the name is in our variables
-        valu = self.vars.get(name, s_common.novalu)
+        valu = self._vars.get(name, s_common.novalu)
         if valu is not s_common.novalu:
             return valu
 
-        # check if it's in builtins
-        valu = self.builtins.get(name, s_common.novalu)
-        if valu is not s_common.novalu:
-            return valu
+        # check if it's in builtins ( which are *not* vars )
+        if name == 'path':
+            return self
+
+        if name == 'node':
+            return self.node
 
         ctor = self.ctors.get(name)
         if ctor is not None:
@@ -799,19 +844,23 @@ class Path:
 
     def fork(self, node, link):
 
-        links = list(self.links)
+        linkchain = self.linkchain
         if self.node is not None and link is not None:
-            links.append((self.node.iden(), link))
+            linkchain = (linkchain, (self.node.iden(), link))
 
-        nodes = list(self.nodes)
-        nodes.append(node)
+        # both paths must copy the vars before modifying them
+        self.sharedvars = True
 
-        path = Path(self.vars.copy(), nodes, links=links)
+        path = Path.__new__(Path)
+        path._initPath(self._vars, (self.nodechain, node), linkchain, sharedvars=True)
 
         return path
 
     def clone(self):
-        path = Path(copy.copy(self.vars), copy.copy(self.nodes), copy.copy(self.links))
+        self.sharedvars = True
+
+        path = Path.__new__(Path)
+        path._initPath(self._vars, self.nodechain, self.linkchain, sharedvars=True)
         path.frames = [v.copy() for v in self.frames]
         return path
 
@@ -838,6 +887,50 @@ class Path:
 
         self.vars = self.frames.pop()
 
+def _chainToList(chain):
+    retn = []
+    while chain is not None:
+        chain, item = chain
+        retn.append(item)
+    retn.reverse()
+    return retn
+
+def getByLayer(sodes):
+    '''
+    Build a bylayer dictionary from a list of (layriden, sode) tuples.
+    '''
+    bylayer = {
+        'ndef': None,
+        'tags': {},
+        'props': {},
+        'tagprops': {},
+    }
+
+    for (layr, sode) in sodes:
+
+        if sode.get('valu') is not None:
+            bylayer['ndef'] = layr
+
+        storprops = sode.get('props')
+        if storprops is not None:
+            for prop in storprops.keys():
+                bylayer['props'][prop] = layr
+
+        stortags = sode.get('tags')
+        if stortags is not None:
+            bylayer['tags'].update({p: layr for p in stortags.keys()})
+
+        stortagprops = sode.get('tagprops')
+        if stortagprops is not None:
+            for tag, propdict in stortagprops.items():
+                if tag not in bylayer['tagprops']:
+                    bylayer['tagprops'][tag] = {}
+
+                for tagprop in propdict.keys():
+                    bylayer['tagprops'][tag][tagprop] = layr
+
+    return bylayer
+
 def props(pode):
     '''
     Get the props from the node.
@@ -640,9 +640,17 @@ async def _forkedParseQuery(args):
 async def _forkedParseEval(text):
     return await s_processpool._parserforked(parseEval, text)
 
+# NOTE: cached ASTs are shared by every caller and must not be modified
 evalcache = s_cache.FixedCache(_forkedParseEval, size=100)
 querycache = s_cache.FixedCache(_forkedParseQuery, size=100)
 
+def setCacheSize(size):
+    '''
+    Set the maximum number of parsed queries and expressions cached by the process.
+    '''
+    evalcache.resize(size)
+    querycache.resize(size)
+
 def massage_vartokn(astinfo, x):
     return s_ast.Const(astinfo, '' if not x else (x[1:-1] if x[0] == "'" else (unescape(x) if x[0] == '"' else x)))
 
@@ -175,3 +175,43 @@ class Window(s_base.Base):
             await self.fini()
 
         return True
+
+    async def slices(self, size=1000, timeout=None):
+        '''
+        Yield lists of up to size items from the Window.
+
+        Args:
+            size (int): The maximum number of items to yield at once.
+            timeout (float): Wait up to timeout seconds for the list to fill before yielding it.
+        '''
+        loop = asyncio.get_running_loop()
+
+        while True:
+
+            if not self.linklist:
+
+                if self.isfini:
+                    return
+
+                self.event.clear()
+                await self.event.wait()
+                continue
+
+            if timeout is not None:
+
+                maxtime = loop.time() + timeout
+
+                while len(self.linklist) < size and not self.isfini:
+
+                    if (wait := maxtime - loop.time()) <= 0:
+                        break
+
+                    self.event.clear()
+
+                    try:
+                        await s_common.wait_for(self.event.wait(), wait)
+                    except asyncio.TimeoutError:
+                        break
+
+            count = min(size, len(self.linklist))
+            yield [self.linklist.popleft() for _ in range(count)]
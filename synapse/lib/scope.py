@@ -192,12 +192,29 @@ def enter(vals=None):
     finally:
         scope.leave()
 
-def clone(task: asyncio.Task) -> None:
+def copy():
+    '''
+    Get a copy of the current task Scope.
+
+    Notes:
+        If the current task does not have a scope, we copy the default global Scope.
+
+    Returns:
+        Scope: A new scope which is a copy of the current scope.
+    '''
+    scope = _task_scope()
+    if scope is None:
+        scope = globscope
+
+    return scope.copy()
+
+def clone(task: asyncio.Task, scope=None) -> None:
     '''
     Clone the current task Scope onto the provided task.
 
     Args:
         task (asyncio.Task): The task object to attach the scope too.
+        scope (Scope): A previously copied Scope to clone instead of the current task Scope.
 
     Notes:
         This must be run from an asyncio IO loop.
@@ -212,7 +229,11 @@ def clone(task: asyncio.Task) -> None:
 
     current_task = asyncio.current_task()
 
-    if current_task is None:
+    if scope is not None:
+
+        parent_scope = scope
+
+    elif current_task is None:
         # It is possible that we are executing code started by
         # asyncio.call_soon_threadsafe (or similar mechanisms)
         # in which case there is not yet a task for us to
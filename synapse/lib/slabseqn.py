@@ -136,6 +136,42 @@ class SlabSeqn:
     def stat(self):
         return self.slab.stat(db=self.db)
 
+    async def saveWithPackRetn(self, items, indx=None):
+        '''
+        Save a series of items to the end of the sequence in a single write.
+
+        Args:
+            items (list): The series of items to save into the sequence.
+            indx (int): The index of the first item (defaults to the current index).
+
+        Returns:
+            list: A list of (indx, packitem) tuples for the saved items.
+        '''
+        if indx is None:
+            indx = self.indx
+
+        rows = []
+        retn = []
+
+        for item in items:
+
+            byts = s_msgpack.en(item)
+
+            rows.append((s_common.int64en(indx), byts))
+            retn.append((indx, byts))
+
+            indx += 1
+
+        added = await self.slab.putmulti(rows, append=True, db=self.db)
+        assert added, "Not adding the largest indices"
+
+        self.size += added[1]
+        self.indx = indx
+
+        self._wake_waiters()
+
+        return retn
+
     async def save(self, items):
         '''
         Save a series of items to a sequence.
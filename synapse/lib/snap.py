@@ -18,6 +18,7 @@ import synapse.lib.cache as s_cache
 import synapse.lib.layer as s_layer
 import synapse.lib.storm as s_storm
 import synapse.lib.types as s_types
+import synapse.lib.msgpack as s_msgpack
 import synapse.lib.lmdbslab as s_lmdbslab
 
 logger = logging.getLogger(__name__)
@@ -844,7 +845,7 @@ class Snap(s_base.Base):
                 pode[1]['links'] = path.links
 
             if show_storage:
-                pode[1]['storage'] = await node.getStorNodes()
+                pode[1]['storage'] = s_msgpack.deepcopy(await node.getStorNodes())
 
             if scrubber is not None:
                 pode = scrubber.scrub(pode)
@@ -875,6 +876,9 @@ class Snap(s_base.Base):
             async for x in runt.execute():
                 yield x
 
+            if runt.profiler is not None:
+                await self.fire('prof', **runt.profiler.pack())
+
     async def eval(self, text, opts=None, user=None):
         '''
         Run a storm query and yield Node() objects.
@@ -940,6 +944,35 @@ class Snap(s_base.Base):
         '''
         return await self._joinStorNode(buid, {})
 
+    async def getNodesByBuids(self, buids):
+        '''
+        Retrieve a list of nodes by binary id, fetching storage nodes in a batch.
+
+        Args:
+            buids (list): A list of binary IDs.
+
+        Returns:
+            list: A list of s_node.Node objects (or None) in the same order as buids.
+        '''
+        todo = [buid for buid in buids if self.livenodes.get(buid) is None]
+        if not todo:
+            return [await self.getNodeByBuid(buid) for buid in buids]
+
+        sodelists = dict(zip(todo, await self.core._getStorNodesBatch(todo, self.layers)))
+
+        nodes = []
+        for buid in buids:
+
+            sodes = sodelists.get(buid)
+            if sodes is None:
+                nodes.append(await self.getNodeByBuid(buid))
+                continue
+
+            sodes = [(layr.iden, sode) for (layr, sode) in zip(self.layers, sodes)]
+            nodes.append(await self._joinSodes(buid, sodes))
+
+        return nodes
+
     async def getNodeByNdef(self, ndef):
         '''
         Return a single Node by (form,valu) tuple.
@@ -1016,31 +1049,20 @@ class Snap(s_base.Base):
         nodedata = {}
         tagprops = {}
 
-        bylayer = {
-            'ndef': None,
-            'tags': {},
-            'props': {},
-            'tagprops': {},
-        }
-
         for (layr, sode) in sodes:
 
-            form = sode.get('form')
             valt = sode.get('valu')
             if valt is not None:
-                ndef = (form, valt[0])
-                bylayer['ndef'] = layr
+                ndef = (sode.get('form'), valt[0])
 
             storprops = sode.get('props')
             if storprops is not None:
                 for prop, (valu, stype) in storprops.items():
                     props[prop] = valu
-                    bylayer['props'][prop] = layr
 
             stortags = sode.get('tags')
             if stortags is not None:
                 tags.update(stortags)
-                bylayer['tags'].update({p: layr for p in stortags.keys()})
 
             stortagprops = sode.get('tagprops')
             if stortagprops is not None:
@@ -1048,10 +1070,8 @@ class Snap(s_base.Base):
                     for tagprop, (valu, stype) in propdict.items():
                         if tag not in tagprops:
                             tagprops[tag] = {}
-                            bylayer['tagprops'][tag] = {}
 
                         tagprops[tag][tagprop] = valu
-                        bylayer['tagprops'][tag][tagprop] = layr
 
             stordata = sode.get('nodedata')
             if stordata is not None:
@@ -1069,7 +1089,8 @@ class Snap(s_base.Base):
             'tagprops': tagprops,
         })
 
-        node = s_node.Node(self, pode, bylayer=bylayer)
+        # bylayer info is only built from the sodes if requested
+        node = s_node.Node(self, pode, sodes=sodes)
         if self.cachebuids:
             self.livenodes[buid] = node
             self.buidcache.append(node)
@@ -1854,10 +1875,7 @@ class Snap(s_base.Base):
         async for sode in self.core.dyniter('cortex', todo):
             await asyncio.sleep(0)
 
-            node = s_node.Node(self, sode)
-            node.isrunt = True
-
-            yield node
+            yield s_node.Node(self, sode)
 
     async def iterNodeEdgesN1(self, buid, verb=None):
 
@@ -1,3 +1,4 @@
+import time
 import heapq
 import regex
 import types
@@ -314,6 +315,8 @@ stormcmds = (
             ('--growsize', {'help': 'Amount to grow the map size when necessary.', 'type': 'int'}),
             ('--cache-size', {'help': 'Number of storage nodes to cache.', 'type': 'int',
                               'dest': 'cache:size'}),
+            ('--cache-bytes', {'help': 'Estimated maximum size in bytes of the storage node cache.', 'type': 'int',
+                               'dest': 'cache:bytes'}),
             ('--upstream', {'help': 'One or more telepath urls to receive updates from.'}),
             ('--name', {'help': 'The name of the layer.'}),
         ),
@@ -1412,6 +1415,84 @@ class StormDmon(s_base.Base):
             # bottom of the loop... wait it out
             await self.waitfini(timeout=1)
 
+class StormProfiler:
+    '''
+    Collects wall clock time and node counts for each operator run by a profiled Storm runtime.
+
+    NOTE: The time recorded for an operator excludes time spent waiting on the
+          operators before it in the pipeline but includes any subqueries it runs.
+    '''
+    def __init__(self):
+        self.opers = {}
+        self.tick = time.perf_counter_ns()
+
+    def _getOperInfo(self, oper):
+
+        info = self.opers.get(oper)
+        if info is not None:
+            return info
+
+        info = {
+            'oper': oper.__class__.__name__,
+            'text': oper.getAstText(),
+            'line': oper.astinfo.sline,
+            'runs': 0,
+            'took': 0,
+            'nodes:in': 0,
+            'nodes:out': 0,
+        }
+
+        if isinstance(oper, s_ast.CmdOper):
+            info['cmd'] = oper.kids[0].value()
+
+        self.opers[oper] = info
+        return info
+
+    def setLift(self, oper, indx, **info):
+        '''
+        Record the index used by a lift operator.
+        '''
+        self._getOperInfo(oper)['lift'] = {'indx': indx, **info}
+
+    async def run(self, oper, runt, genr):
+        '''
+        Run the operator and record its timing and node counts.
+        '''
+        info = self._getOperInfo(oper)
+        info['runs'] += 1
+
+        async def ingenr():
+            tick = time.perf_counter_ns()
+            async for item in genr:
+                info['took'] -= time.perf_counter_ns() - tick
+                info['nodes:in'] += 1
+                yield item
+                tick = time.perf_counter_ns()
+
+            info['took'] -= time.perf_counter_ns() - tick
+
+        async with contextlib.aclosing(oper.run(runt, ingenr())) as agen:
+
+            tick = time.perf_counter_ns()
+            async for item in agen:
+                info['took'] += time.perf_counter_ns() - tick
+                info['nodes:out'] += 1
+                yield item
+                tick = time.perf_counter_ns()
+
+            info['took'] += time.perf_counter_ns() - tick
+
+    def pack(self):
+
+        opers = []
+        for info in self.opers.values():
+            info = dict(info)
+            info['took'] = round(info['took'] / 1_000_000, 3)
+            opers.append(info)
+
+        took = round((time.perf_counter_ns() - self.tick) / 1_000_000, 3)
+        return {'took': took, 'opers': opers}
+
 class Runtime(s_base.Base):
     '''
     A Runtime represents the instance of a running query.
@@ -1444,6 +1525,13 @@ class Runtime(s_base.Base):
         self.root = root
         self.funcscope = False
 
+        # subruntimes report into the profiler of their root
+        self.profiler = None
+        if root is not None:
+            self.profiler = root.profiler
+        elif opts.get('profile'):
+            self.profiler = StormProfiler()
+
         self.query = query
 
         self.readonly = opts.get('readonly', False)  # EXPERIMENTAL: Make it safe to run untrusted queries
@@ -1916,6 +2004,7 @@ class Runtime(s_base.Base):
             if self.debug:
                 runt.debug = True
             runt.asroot = self.asroot
+            runt.profiler = self.profiler
             runt.readonly = self.readonly
             yield runt
 
@@ -1927,6 +2016,7 @@ class Runtime(s_base.Base):
         if self.debug:
             runt.debug = True
         runt.asroot = self.asroot
+        runt.profiler = self.profiler
         runt.readonly = self.readonly
         return runt
 
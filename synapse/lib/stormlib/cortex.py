@@ -1321,3 +1321,13 @@ class StormPoolGetCmd(s_storm.Cmd):
         await self.runt.printf(f'Storm Pool URL: {url}')
         await self.runt.printf(f'Sync Timeout (secs): {opts.get("timeout:sync")}')
         await self.runt.printf(f'Connection Timeout (secs): {opts.get("timeout:connection")}')
+
+        members = self.runt.snap.core.getStormPoolInfo()
+        if members:
+            await self.runt.printf('Pool Members:')
+            for info in members:
+                latency = info.get('latency')
+                if latency is not None:
+                    latency = f'{latency * 1000:.2f}ms'
+                await self.runt.printf(f'    {info.get("name")}: active={info.get("active")} '
+                                       f'nexus offset={info.get("offs")} latency={latency}')
@@ -14,6 +14,17 @@ Note:
     separately.
 '''
 
+explaindesc = '''
+Parse a Storm query and describe the operators it would run without running it.
+
+Notes:
+    Lifts include the layer index family used (``indx``), any lift hints taken from the
+    filters which follow the lift (``hints``), and an estimate of the number of rows
+    the lift will read based on the layer index counters (``rows``). Lifts which depend
+    on the inbound node or on values which are not constants do not include an estimate
+    since computing them may require running the query.
+'''
+
 rundesc = '''
 Run a Storm query and yield the messages output by the Storm interpreter.
 
@@ -110,6 +121,12 @@ class LibStorm(s_stormtypes.Lib):
                       {'name': 'cast', 'type': 'str', 'desc': 'A type to cast the result to.', 'default': None},
                   ),
                   'returns': {'type': 'any', 'desc': 'The value of the expression and optional cast.'}}},
+        {'name': 'explain', 'desc': explaindesc,
+         'type': {'type': 'function', '_funcname': '_explainStorm',
+                  'args': (
+                      {'name': 'query', 'type': 'str', 'desc': 'A Storm query string.'},
+                  ),
+                  'returns': {'type': 'dict', 'desc': 'A description of the query operators.'}}},
         {'name': 'run', 'desc': rundesc,
          'type': {'type': 'function', '_funcname': '_runStorm',
                   'args': (
@@ -124,8 +141,18 @@ class LibStorm(s_stormtypes.Lib):
         return {
             'run': self._runStorm,
             'eval': self._evalStorm,
+            'explain': self._explainStorm,
         }
 
+    @s_stormtypes.stormfunc(readonly=True)
+    async def _explainStorm(self, query):
+
+        text = await s_stormtypes.tostr(query)
+        query = await self.runt.getStormQuery(text)
+
+        async with self.runt.getSubRuntime(query) as runt:
+            return await query.explain(runt)
+
     async def _runStorm(self, query, opts=None):
 
         opts = await s_stormtypes.toprim(opts)
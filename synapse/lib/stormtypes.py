@@ -6601,7 +6601,7 @@ class Node(Prim):
 
     @stormfunc(readonly=True)
     async def _methGetStorNodes(self):
-        return await self.valu.getStorNodes()
+        return [s_msgpack.deepcopy(sode) for sode in await self.valu.getStorNodes()]
 
     @stormfunc(readonly=True)
     def _methGetByLayer(self):
@@ -7882,7 +7882,7 @@ class Layer(Prim):
         layriden = self.valu.get('iden')
         await self.runt.reqUserCanReadLayer(layriden)
         layr = self.runt.snap.core.getLayer(layriden)
-        return await layr.getStorNode(nodeid)
+        return s_msgpack.deepcopy(await layr.getStorNode(nodeid))
 
     @stormfunc(readonly=True)
     async def getStorNodes(self):
@@ -7890,7 +7890,7 @@ class Layer(Prim):
         await self.runt.reqUserCanReadLayer(layriden)
         layr = self.runt.snap.core.getLayer(layriden)
         async for item in layr.getStorNodes():
-            yield item
+            yield s_msgpack.deepcopy(item)
 
     @stormfunc(readonly=True)
     async def getStorNodesByForm(self, form):
@@ -7903,12 +7903,12 @@ class Layer(Prim):
         layr = self.runt.snap.core.getLayer(layriden)
 
         async for item in layr.getStorNodesByForm(form):
-            yield item
+            yield s_msgpack.deepcopy(item)
 
     @stormfunc(readonly=True)
     async def getStorNodesByProp(self, propname, propvalu=None, propcmpr='='):
         async for buid, sode in self._liftByProp(propname, propvalu=propvalu, propcmpr=propcmpr):
-            yield s_common.ehex(buid), sode
+            yield s_common.ehex(buid), s_msgpack.deepcopy(sode)
 
     @stormfunc(readonly=True)
     async def hasEdge(self, nodeid1, verb, nodeid2):
@@ -7986,7 +7986,7 @@ class Layer(Prim):
             else:
                 valu = await tostr(await toprim(valu), noneok=True)
 
-        elif name == 'cache:size':
+        elif name in ('cache:size', 'cache:bytes'):
             valu = await toint(valu)
 
         elif name == 'logedits':
@@ -7995,6 +7995,11 @@ class Layer(Prim):
         elif name == 'readonly':
             valu = await tobool(valu)
 
+        elif name == 'trigram:props':
+            valu = await toprim(valu)
+            if valu is not None:
+                valu = [await tostr(v) for v in valu]
+
         elif name in ('mirror', 'upstream'):
             if (valu := await toprim(valu)) is not None:
                 mesg = 'Layer only supports setting "mirror" and "upstream" to null.'
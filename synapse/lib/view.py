@@ -632,6 +632,12 @@ class View(s_nexus.Pusher):  # type: ignore
         '''
         return await self.core._getStorNodes(buid, self.layers)
 
+    async def getStorNodesBatch(self, buids):
+        '''
+        Return a list of storage node lists (in layer order) for each of the given buids.
+        '''
+        return await self.core._getStorNodesBatch(buids, self.layers)
+
     def init2(self):
         '''
         We have a second round of initialization so the views can get a handle to their parents which might not
@@ -782,6 +788,15 @@ class View(s_nexus.Pusher):  # type: ignore
 
         return count
 
+    async def getTagCount(self, tagname, formname=None):
+
+        count = 0
+        for layr in self.layers:
+            await asyncio.sleep(0)
+            count += await layr.getTagCount(tagname, formname=formname)
+
+        return count
+
     async def getTagPropCount(self, form, tag, propname, valu=s_common.novalu):
         prop = self.core.model.getTagProp(propname)
         if prop is None:
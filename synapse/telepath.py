@@ -25,11 +25,12 @@ import synapse.lib.hashitem as s_hashitem
 
 logger = logging.getLogger(__name__)
 
-televers = (3, 0)
+televers = (3, 1)
 
 aha_clients = {}
 
 LINK_CULL_INTERVAL = 10
+LINK_CANCEL_TIMEOUT = 10  # Max seconds to wait for the daemon to acknowledge a t2:cancel
 
 async def addAhaUrl(url):
     '''
@@ -628,6 +629,8 @@ class Proxy(s_base.Base):
         self.methinfo = {}
 
         self.sess = None
+        self.mux = None
+        self.t2cancel = False
 
         self.links = collections.deque()
         self.alllinks = collections.deque()
@@ -642,6 +645,9 @@ class Proxy(s_base.Base):
             'task:fini': self._onTaskFini,
             'share:data': self._onShareData,
             'share:fini': self._onShareFini,
+            'mx:ack': self._onMuxMesg,
+            'mx:data': self._onMuxMesg,
+            'mx:fini': self._onMuxMesg,
         }
 
         async def fini():
@@ -794,7 +800,11 @@ class Proxy(s_base.Base):
 
     async def _initPoolLink(self):
 
-        if self.link.get('unix'):
+        if self.mux is not None:
+
+            link = await self.mux.open()
+
+        elif self.link.get('unix'):
 
             path = self.link.get('path')
             link = await s_link.unixconnect(path)
@@ -807,6 +817,10 @@ class Proxy(s_base.Base):
             info = {'certhash': self.link.get('certhash'), 'hostname': self.link.get('hostname'), }
             link = await s_link.connect(host, port, ssl=ssl, linkinfo=info)
 
+        # the daemon compresses pool links based on the session once it receives the first t2:init
+        if self.link.zlevel is not None:
+            link.setDecompress()
+
         self.alllinks.append(link)
         async def fini():
             self.alllinks.remove(link)
@@ -822,11 +836,46 @@ class Proxy(s_base.Base):
             await link.fini()
         await self.link.fini()
 
+    async def _cancelPoolLink(self, link):
+        '''
+        Cancel the generator running on a pool link and return the link to the pool.
+        '''
+        async def drain():
+            # discard any in-flight messages until the daemon acknowledges the cancel
+            while True:
+
+                mesg = await link.rx()
+                if mesg is None:
+                    return False
+
+                if mesg[0] == 't2:cancel':
+                    return True
+
+        try:
+
+            await link.tx(('t2:cancel', {}))
+
+            if await s_common.wait_for(drain(), timeout=LINK_CANCEL_TIMEOUT):
+                await self._putPoolLink(link)
+                return
+
+        except asyncio.TimeoutError:
+            logger.debug('Timeout waiting for a pool link genr to be cancelled.')
+
+        except Exception as e:
+            logger.debug(f'Error cancelling a pool link genr: {e}')
+
+        await link.fini()
+
     async def _putPoolLink(self, link):
 
         if link.isfini:
             return
 
+        # the daemon has enabled compression for the link once a task has completed
+        if self.link.zlevel is not None and link.zlevel is None:
+            link.setCompress(self.link.zlevel, self.link.zminsize)
+
         self.links.append(link)
 
     def __enter__(self):
@@ -848,6 +897,10 @@ class Proxy(s_base.Base):
         '''
         return self.schedCoroSafePend(self._ctxobj.__aexit__(*args))
 
+    async def _onMuxMesg(self, mesg):
+        if self.mux is not None:
+            await self.mux.onMuxMesg(mesg)
+
     async def _onShareFini(self, mesg):
 
         iden = mesg[1].get('share')
@@ -893,7 +946,8 @@ class Proxy(s_base.Base):
         mesg = ('t2:init', {
                 'todo': todo,
                 'name': name,
-                'sess': self.sess})
+                'sess': self.sess,
+                'yields': 1})
 
         link = await self.getPoolLink()
 
@@ -920,6 +974,11 @@ class Proxy(s_base.Base):
                         if mesg is None:
                             raise s_exc.LinkShutDown(mesg='Remote peer disconnected')
 
+                        if mesg[0] == 't2:yields':
+                            for item in mesg[1].get('items'):
+                                yield item
+                            continue
+
                         if mesg[0] != 't2:yield':  # pragma: no cover
                             info = 'Telepath protocol violation:  unexpected message received'
                             raise s_exc.BadMesgFormat(mesg=info)
@@ -936,9 +995,11 @@ class Proxy(s_base.Base):
                         yield s_common.result(retn)
 
                 except GeneratorExit:
-                    # if they bail early on the genr, fini the link
-                    # TODO: devise a tx/rx strategy to recover these links...
-                    await link.fini()
+                    # if they bail early on the genr, cancel it and recover the link
+                    if self.t2cancel and not self.isfini and not link.isfini:
+                        self.schedCoro(self._cancelPoolLink(link))
+                    else:
+                        await link.fini()
 
             return s_coro.GenrHelp(genrloop())
 
@@ -979,7 +1040,7 @@ class Proxy(s_base.Base):
         finally:
             self.tasks.pop(task.iden, None)
 
-    async def handshake(self, auth=None):
+    async def handshake(self, auth=None, zlib=None, mux=False):
 
         mesg = ('tele:syn', {
             'auth': auth,
@@ -987,6 +1048,14 @@ class Proxy(s_base.Base):
             'name': self.name,
         })
 
+        if zlib is not None:
+            mesg[1]['zlib'] = zlib
+            # the reply is compressed by servers which support compression
+            self.link.setDecompress()
+
+        if mux:
+            mesg[1]['mux'] = {'window': s_link.MUX_WINDOW}
+
         await self.link.tx(mesg)
 
         self.synack = await self.link.rx()
@@ -1004,6 +1073,21 @@ class Proxy(s_base.Base):
         if vers[0] != televers[0]:
             raise s_exc.BadMesgVers(myver=televers, hisver=vers)
 
+        # servers from 3.1 support cancelling a t2 generator
+        self.t2cancel = tuple(vers) >= (3, 1)
+
+        # servers which do not support compression will not include it in the reply
+        zinfo = self.synack[1].get('zlib')
+        if zinfo is not None:
+            self.link.setCompress(*zinfo)
+
+        # servers which do not support multiplexing will not include it in the reply
+        # and calls will be made over pool links instead.
+        muxinfo = self.synack[1].get('mux')
+        if muxinfo is not None:
+            self.mux = await s_link.Mux.anit(self.link, window=muxinfo.get('window'))
+            self.onfini(self.mux)
+
         async def rxloop():
 
             while not self.link.isfini:
@@ -1617,6 +1701,23 @@ async def openinfo(info):
         passwd = info.get('passwd')
         auth = (user, {'passwd': passwd})
 
+    zlib = None
+
+    level = info.get('compress')
+    if level is not None:
+        minsize = info.get('compressmin', s_link.ZLIB_MINSIZE)
+        try:
+            zlib = (int(level), int(minsize))
+        except ValueError:
+            mesg = f'Invalid compression options: compress={level} compressmin={minsize}'
+            raise s_exc.BadUrl(mesg=mesg) from None
+
+    try:
+        mux = bool(int(info.get('mux', 0)))
+    except ValueError:
+        mesg = f'Invalid mux option: mux={info.get("mux")}'
+        raise s_exc.BadUrl(mesg=mesg) from None
+
     if scheme == 'cell':
         # cell:///path/to/celldir:share
         # cell://rel/path/to/celldir:share
@@ -1703,7 +1804,7 @@ async def openinfo(info):
     prox.onfini(link)
 
     try:
-        await prox.handshake(auth=auth)
+        await prox.handshake(auth=auth, zlib=zlib, mux=mux)
 
     except (asyncio.CancelledError, Exception):
         await prox.fini()
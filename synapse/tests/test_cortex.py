@@ -21,7 +21,9 @@ import synapse.lib.coro as s_coro
 import synapse.lib.node as s_node
 import synapse.lib.time as s_time
 import synapse.lib.layer as s_layer
+import synapse.lib.nexus as s_nexus
 import synapse.lib.storm as s_storm
+import synapse.lib.parser as s_parser
 import synapse.lib.output as s_output
 import synapse.lib.msgpack as s_msgpack
 import synapse.lib.version as s_version
@@ -4800,6 +4802,78 @@ class CortexBasicTest(s_t_utils.SynTest):
             with self.raises(s_exc.NoSuchForm):
                 await core.getNodeByNdef(('test:newp', 'hehe'))
 
+    async def test_cortex_storm_parse_cache(self):
+
+        text = 'inet:fqdn=vertex.link | limit 10'
+
+        def getTexts(core):
+            return [core.parseslab.get(lkey, db=core.parsedb) for _, lkey in core.parseslab.scanByFull(db=core.parseused)]
+
+        async with self.getTestCore() as core:
+            # persisting queries is disabled by default
+            self.none(core.parseslab)
+            self.len(0, await core.nodes('inet:fqdn=vertex.link'))
+
+        conf = {'storm:parse:cache:persist': True}
+
+        with self.getTestDir() as dirn:
+
+            async with self.getTestCore(dirn=dirn, conf=conf) as core:
+                await core.nodes('[ inet:fqdn=vertex.link ]')
+                self.len(1, await core.nodes(text))
+
+                with self.raises(s_exc.BadSyntax):
+                    await core.nodes('inet:fqdn=')
+
+                # only the query text is persisted
+                lkey = core._getStormParseKey((text, 'storm'))
+                indx, valu = s_msgpack.un(core.parseslab.get(lkey, db=core.parsedb))
+                self.eq(text, valu)
+                self.eq(lkey, core.parseslab.get(s_common.int64en(indx), db=core.parseused))
+
+                self.none(core.parseslab.get(core._getStormParseKey(('inet:fqdn=', 'storm')), db=core.parsedb))
+                count = core.parsecount
+
+            s_parser.querycache.clear()
+
+            async with self.getTestCore(dirn=dirn, conf=conf) as core:
+
+                self.eq(count, core.parsecount)
+
+                # persisted queries are parsed into the query cache on boot
+                for _ in range(100):
+                    if (text, 'storm') in core.querycache.cache:
+                        break
+                    await asyncio.sleep(0.01)
+
+                self.isin((text, 'storm'), core.querycache.cache)
+
+                # the least recently used queries are evicted once the cache is full
+                with patch('synapse.cortex.STORM_PARSE_CACHE_MAX', 2):
+
+                    core.querycache.clear()
+                    self.len(1, await core.nodes(text))
+                    self.len(0, await core.nodes('inet:fqdn=newp.com'))
+                    self.len(0, await core.nodes('inet:fqdn=woot.com'))
+
+                    self.eq(2, core.parsecount)
+                    self.eq(2, core.parseslab.stat(db=core.parsedb).get('entries'))
+                    texts = [s_msgpack.un(byts)[1] for byts in getTexts(core)]
+                    self.eq(['inet:fqdn=newp.com', 'inet:fqdn=woot.com'], texts)
+
+                    # using a cached query again makes it the most recently used
+                    self.isin(('inet:fqdn=newp.com', 'storm'), core.querycache.cache)
+                    self.len(0, await core.nodes('inet:fqdn=newp.com'))
+                    self.len(1, await core.nodes(text))
+                    self.len(1, await core.nodes(text))
+
+                    texts = [s_msgpack.un(byts)[1] for byts in getTexts(core)]
+                    self.eq(['inet:fqdn=newp.com', text], texts)
+
+            async with self.getTestCore(dirn=dirn) as core:
+                self.none(core.parseslab)
+                self.len(1, await core.nodes(text))
+
     async def test_cortex_storm_vars(self):
 
         async with self.getTestCore() as core:
@@ -5926,6 +6000,43 @@ class CortexBasicTest(s_t_utils.SynTest):
                     await core00.sync()
                     self.len(1, await core00.nodes('inet:ipv4=9.9.9.8'))
 
+    async def test_cortex_mirror_batch_new_layer(self):
+
+        with self.getTestDir() as dirn:
+
+            path00 = s_common.gendir(dirn, 'core00')
+            path01 = s_common.gendir(dirn, 'core01')
+
+            async with self.getTestCore(dirn=path00) as core00:
+                await core00.nodes('[ inet:ipv4=1.2.3.4 ]')
+
+            s_tools_backup.backup(path00, path01)
+
+            async with self.getTestCore(dirn=path00) as core00:
+
+                core01conf = {'mirror': core00.getLocalUrl()}
+
+                # the view and layer are created by entries in the same batch as the edits to them
+                view = await core00.callStorm('return($lib.view.get().fork().iden)')
+                await core00.nodes('[ inet:fqdn=foo.com ]', opts={'view': view})
+
+                sizes = []
+                orig = s_nexus.NexsRoot._eatMirrorBatch
+                async def eatMirrorBatch(self, items):
+                    sizes.append(len(items))
+                    return await orig(self, items)
+
+                with patch('synapse.lib.nexus.NexsRoot._eatMirrorBatch', eatMirrorBatch):
+
+                    async with self.getTestCore(dirn=path01, conf=core01conf) as core01:
+
+                        await core01.sync()
+
+                        self.gt(sizes[0], 3)
+                        self.false(core01.nexsroot.isfini)
+                        self.eq(await core00.getNexsIndx(), await core01.getNexsIndx())
+                        self.len(1, await core01.nodes('inet:fqdn=foo.com', opts={'view': view}))
+
     async def test_cortex_mirror_culled(self):
 
         with self.getTestDir() as dirn:
@@ -8763,6 +8874,93 @@ class CortexBasicTest(s_t_utils.SynTest):
             with self.raises(s_exc.BadArg):
                 await core.delHttpExtApi('notAGuid')
 
+    async def test_cortex_storm_pool_select(self):
+
+        async with self.getTestCore() as core:
+
+            await core.nodes('[ inet:asn=0 ]')
+
+            pool = await s_telepath.ClientV2.anit(core.getLocalUrl())
+            core.onfini(pool)
+            await pool.waitready(timeout=12)
+
+            prox00 = list(pool.proxies)[0]
+            prox01 = await s_telepath.openurl(core.getLocalUrl())
+            core.onfini(prox01)
+            await pool._onPoolLink(prox01, {})
+
+            core.stormpool = pool
+            core.stormpoolopts = {'timeout:connection': 1, 'timeout:sync': 1}
+
+            # members are synced on first use
+            opts = {}
+            self.nn(await core._getMirrorProxy(opts))
+            self.nn(opts.get('nexsoffs'))
+            self.len(2, core.getStormPoolInfo())
+
+            mem00 = core._getStormPoolMember(prox00)
+            mem01 = core._getStormPoolMember(prox01)
+            self.nn(mem00.latency)
+            self.nn(mem01.latency)
+
+            # the least loaded member is selected without asking for its nexus offset
+            calls = []
+            async def getNexsIndx(self):
+                calls.append(self)
+                return await core.getNexsIndx()
+
+            with patch('synapse.cortex.CoreApi.getNexsIndx', getNexsIndx):
+
+                with mem00.query():
+                    self.true(prox01 is await core._getMirrorProxy({}))
+
+                    with mem01.query():
+                        with mem01.query():
+                            self.true(prox00 is await core._getMirrorProxy({}))
+
+                    mem00.latency = 10.0
+                    mem01.latency = 0.1
+                    with mem01.query():
+                        self.true(prox01 is await core._getMirrorProxy({}))
+
+                self.eq(0, mem00.active)
+                self.eq(0, mem01.active)
+                self.len(0, calls)
+
+                # the query completes on a member and the load is released
+                with self.getLoggerStream('synapse') as stream:
+                    self.eq(1, await core.count('inet:asn=0'))
+                self.isin('Offloading Storm query', stream.getvalue())
+                self.eq(0, mem00.active + mem01.active)
+                self.len(0, calls)
+
+                await core._syncStormPool()
+                self.len(2, calls)
+
+            # members which are too far behind are skipped
+            mem00.offs = -1000
+            with patch('synapse.cortex.MAX_NEXUS_DELTA', 10):
+                with self.getLoggerStream('synapse') as stream:
+                    self.true(prox01 is await core._getMirrorProxy({}))
+                self.isin('is too far out of sync. Skipping.', stream.getvalue())
+
+                mem01.offs = None
+                with self.getLoggerStream('synapse') as stream:
+                    self.none(await core._getMirrorProxy({}))
+                self.isin('Pool members exhausted. Running query locally.', stream.getvalue())
+
+            await core._syncStormPool()
+            self.nn(await core._getMirrorProxy({}))
+
+            # members which have gone away are pruned
+            await prox01.fini()
+            await core._syncStormPool()
+            self.len(1, core.getStormPoolInfo())
+            self.true(prox00 is await core._getMirrorProxy({}))
+
+            await core.finiStormPool()
+            self.len(0, core.getStormPoolInfo())
+
     async def test_cortex_query_offload(self):
 
         async def _hang(*args, **kwargs):
@@ -8892,16 +9090,30 @@ class CortexBasicTest(s_t_utils.SynTest):
                     self.eq(msgs[1]['params'].get('hash'), qhash)
                     self.eq(msgs[1]['params'].get('pool:from'), f'00.core.{ahanet}')
 
+                    pool = core00.getStormPoolInfo()
+                    self.len(1, pool)
+                    self.eq(f'01.core.{ahanet}', pool[0]['name'])
+                    self.eq(0, pool[0]['active'])
+                    self.nn(pool[0]['offs'])
+                    self.nn(pool[0]['latency'])
+
+                    msgs = await core00.stormlist('cortex.storm.pool.get')
+                    self.stormIsInPrint('Pool Members:', msgs)
+                    self.stormIsInPrint(f'01.core.{ahanet}: active=0', msgs)
+
                     with self.getLoggerStream('synapse') as stream:
                         core01.boss.is_shutdown = True
+                        await core00._syncStormPool()
                         self.stormHasNoWarnErr(await core00.stormlist('inet:asn=0'))
                         core01.boss.is_shutdown = False
 
                     self.isin('Proxy for pool mirror [01.core.synapse] is shutting down. Skipping.', stream.getvalue())
+                    self.notin('Offloading Storm query', stream.getvalue())
 
                     with patch('synapse.cortex.CoreApi.getNexsIndx', _hang):
 
                         with self.getLoggerStream('synapse') as stream:
+                            await core00._syncStormPool()
                             msgs = await alist(core00.storm('inet:asn=0'))
                             self.len(1, [m for m in msgs if m[0] == 'node'])
 
@@ -8915,6 +9127,7 @@ class CortexBasicTest(s_t_utils.SynTest):
                     with patch('synapse.telepath.Proxy.getPoolLink', _hang):
 
                         with self.getLoggerStream('synapse') as stream:
+                            await core00._syncStormPool()
                             msgs = await alist(core00.storm('inet:asn=0'))
                             self.len(1, [m for m in msgs if m[0] == 'node'])
 
@@ -8924,6 +9137,7 @@ class CortexBasicTest(s_t_utils.SynTest):
                         self.notin('Timeout waiting for query mirror', data)
 
                     await core00.stormpool.waitready(timeout=12)
+                    await core00._syncStormPool()
 
                     with self.getLoggerStream('synapse') as stream:
                         msgs = await alist(core00.storm('inet:asn=0'))
@@ -8934,20 +9148,6 @@ class CortexBasicTest(s_t_utils.SynTest):
                     self.notin('Timeout waiting for pool mirror', data)
                     self.notin('Timeout waiting for query mirror', data)
 
-                    orig = s_telepath.ClientV2.proxy
-                    async def finidproxy(self, timeout=None):
-                        prox = await orig(self, timeout=timeout)
-                        await prox.fini()
-                        return prox
-
-                    with patch('synapse.telepath.ClientV2.proxy', finidproxy):
-                        with self.getLoggerStream('synapse') as stream:
-                            msgs = await alist(core00.storm('inet:asn=0'))
-                            self.len(1, [m for m in msgs if m[0] == 'node'])
-
-                    data = stream.getvalue()
-                    self.isin('Proxy for pool mirror [01.core.synapse] was shutdown. Skipping.', data)
-
                     msgs = await core00.stormlist('cortex.storm.pool.set --connection-timeout 1 --sync-timeout 1 aha://pool00...')
                     self.stormHasNoWarnErr(msgs)
                     self.stormIsInPrint('Storm pool configuration set.', msgs)
@@ -8958,6 +9158,7 @@ class CortexBasicTest(s_t_utils.SynTest):
                     with patch('synapse.cortex.MAX_NEXUS_DELTA', 1):
 
                         nexsoffs = await core00.getNexsIndx()
+                        await core00._syncStormPool()
 
                         with self.getLoggerStream('synapse') as stream:
                             msgs = await alist(core00.storm('inet:asn=0'))
@@ -208,13 +208,23 @@ class DaemonTest(s_t_utils.SynTest):
                 genr_mesg = ('t2:genr', {})
                 resp_mesgs = [genr_mesg] + yield_msgs + [('t2:yield', {'retn': None})]
 
+                def getYieldsItems(mesgs):
+                    items = []
+                    for mesg in mesgs:
+                        self.eq(mesg[0], 't2:yields')
+                        items.extend(mesg[1]['items'])
+                    return items
+
                 with mock.patch('synapse.lib.link.Link.send', psend):
                     async for i in await foo.sync_iter(n):
                         msgs.append(i)
                     self.eq(msgs, expv)
                 self.eq(raw_msgs[0][0], 't2:init')
                 self.eq(raw_msgs[0][1]['todo'][0], 'sync_iter')
-                self.eq(raw_msgs[1:], resp_mesgs)
+                self.eq(raw_msgs[0][1]['yields'], 1)
+                self.eq(raw_msgs[1], genr_mesg)
+                self.eq(getYieldsItems(raw_msgs[2:-1]), expv)
+                self.eq(raw_msgs[-1], ('t2:yield', {'retn': None}))
 
                 msgs.clear()
                 raw_msgs.clear()
@@ -224,7 +234,9 @@ class DaemonTest(s_t_utils.SynTest):
                     self.eq(msgs, expv)
                 self.eq(raw_msgs[0][0], 't2:init')
                 self.eq(raw_msgs[0][1]['todo'][0], 'async_iter')
-                self.eq(raw_msgs[1:], resp_mesgs)
+                self.eq(raw_msgs[1], genr_mesg)
+                self.eq(getYieldsItems(raw_msgs[2:-1]), expv)
+                self.eq(raw_msgs[-1], ('t2:yield', {'retn': None}))
 
                 msgs.clear()
                 raw_msgs.clear()
@@ -274,7 +286,8 @@ class DaemonTest(s_t_utils.SynTest):
                 self.eq(raw_msgs[0][0], 't2:init')
                 self.eq(raw_msgs[0][1]['todo'][0], 'async_iter')
                 self.eq(raw_msgs[1], genr_mesg)
-                self.eq(raw_msgs[2:2 + n], yield_msgs)
+                # items yielded before the exception are sent first
+                self.eq(getYieldsItems(raw_msgs[2:-1]), expv)
                 self.eq(raw_msgs[-1][1]['retn'][0], False)
                 self.eq(raw_msgs[-1][1]['retn'][1][0], 'BadState')
 
@@ -292,6 +305,81 @@ class DaemonTest(s_t_utils.SynTest):
                 self.eq(raw_msgs[-1][1]['retn'][0], False)
                 self.eq(raw_msgs[-1][1]['retn'][1][0], 'BadState')
 
+    async def test_dmon_t2call_yields(self):
+
+        class FakeLink:
+
+            def __init__(self):
+                self.mesgs = []
+                self.isfini = False
+
+            async def tx(self, mesg):
+                self.mesgs.append(mesg)
+
+            async def send(self, byts):
+                self.mesgs.append(s_msgpack.un(byts))
+
+        # peers which do not support t2:yields get one t2:yield per item
+        link = FakeLink()
+        await s_daemon.t2call(link, aiterfunc, (3,), {})
+        self.eq(link.mesgs, [
+            ('t2:genr', {}),
+            ('t2:yield', {'retn': (True, 0)}),
+            ('t2:yield', {'retn': (True, 1)}),
+            ('t2:yield', {'retn': (True, 2)}),
+            ('t2:yield', {'retn': None}),
+        ])
+
+        # batches are limited by count
+        link = FakeLink()
+        await s_daemon.t2call(link, iterfunc, (2500,), {}, yields=True)
+        self.eq(link.mesgs[0], ('t2:genr', {}))
+        self.eq(link.mesgs[-1], ('t2:yield', {'retn': None}))
+
+        sizes = [len(mesg[1]['items']) for mesg in link.mesgs[1:-1]]
+        self.eq(sizes, [1000, 1000, 500])
+        items = [item for mesg in link.mesgs[1:-1] for item in mesg[1]['items']]
+        self.eq(items, list(range(2500)))
+
+        # batches are limited by size
+        link = FakeLink()
+        with mock.patch('synapse.daemon.T2_YIELDS_MAXBYTES', 10):
+            await s_daemon.t2call(link, iterfunc, (25,), {}, yields=True)
+
+        sizes = [len(mesg[1]['items']) for mesg in link.mesgs[1:-1]]
+        self.eq(sizes, [10, 10, 5])
+
+        # items are sent without waiting for a full batch
+        link = FakeLink()
+
+        async def slowgenr():
+            yield 'foo'
+            await asyncio.sleep(0.2)
+            self.eq(link.mesgs[-1], ('t2:yields', {'items': ['foo']}))
+            yield 'bar'
+
+        await s_daemon.t2call(link, slowgenr, (), {}, yields=True)
+        self.eq(link.mesgs, [
+            ('t2:genr', {}),
+            ('t2:yields', {'items': ['foo']}),
+            ('t2:yields', {'items': ['bar']}),
+            ('t2:yield', {'retn': None}),
+        ])
+
+        # errors sending items are raised to the generator
+        class BadLink(FakeLink):
+            async def send(self, byts):
+                raise s_exc.LinkShutDown(mesg='newp')
+
+        link = BadLink()
+        await s_daemon.t2call(link, iterfunc, (2500,), {}, yields=True)
+        self.eq(link.mesgs[0], ('t2:genr', {}))
+        self.eq(link.mesgs[1][0], 't2:yield')
+        self.eq(link.mesgs[1][1]['retn'][0], False)
+        self.eq(link.mesgs[1][1]['retn'][1][0], 'LinkShutDown')
+
+        self.eq(s_msgpack.un(s_daemon.T2_YIELDS_PREFIX + s_msgpack.arrayhead(0)), ('t2:yields', {'items': ()}))
+
 class SvcApi(s_cell.CellApi, s_stormsvc.StormSvc):
     _storm_svc_name = 'foo'
     _storm_svc_pkgs = (  # type:  ignore
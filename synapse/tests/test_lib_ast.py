@@ -3047,6 +3047,55 @@ class AstTest(s_test.SynTest):
                 self.len(2, nodes)
                 self.len(0, calls)
 
+    async def test_ast_lift_cost(self):
+        calls = []
+        origtag = s_snap.Snap.nodesByTag
+        origvalu = s_snap.Snap.nodesByPropValu
+
+        async def checkTag(self, tag, form=None, reverse=False):
+            calls.append(('tag', tag, form))
+            async for node in origtag(self, tag, form=form, reverse=reverse):
+                yield node
+
+        async def checkValu(self, full, cmpr, valu, reverse=False):
+            calls.append(('valu', full, cmpr, valu))
+            async for node in origvalu(self, full, cmpr, valu, reverse=reverse):
+                yield node
+
+        with mock.patch('synapse.lib.snap.Snap.nodesByTag', checkTag):
+            with mock.patch('synapse.lib.snap.Snap.nodesByPropValu', checkValu):
+                async with self.getTestCore() as core:
+
+                    await core.nodes('for $i in $lib.range(10) { [ inet:ipv4=$i :asn=10 +#big ] }')
+                    await core.nodes('inet:ipv4=3 [ :asn=9 +#rare ]')
+
+                    calls.clear()
+                    nodes = await core.nodes('inet:ipv4 +#big +:asn=9')
+                    self.len(1, nodes)
+                    self.eq(calls, [('valu', 'inet:ipv4:asn', '=', '9')])
+
+                    calls.clear()
+                    nodes = await core.nodes('inet:ipv4 +:asn=10 +#big +#rare')
+                    self.len(0, nodes)
+                    self.eq(calls, [('tag', 'rare', 'inet:ipv4')])
+
+                    calls.clear()
+                    nodes = await core.nodes('inet:ipv4 +(:asn=9 and #big)')
+                    self.len(1, nodes)
+                    self.eq(calls, [('valu', 'inet:ipv4:asn', '=', '9')])
+
+                    # props which do not exist lift nothing
+                    calls.clear()
+                    nodes = await core.nodes('inet:ipv4 +#big +:newp')
+                    self.len(0, nodes)
+                    self.len(0, calls)
+
+                    # equal costs keep the query order
+                    calls.clear()
+                    nodes = await core.nodes('inet:ipv4 +:asn=10 +#big')
+                    self.len(9, nodes)
+                    self.eq(calls, [('valu', 'inet:ipv4:asn', '=', '10')])
+
     async def test_ast_cmdoper(self):
 
         async with self.getTestCore() as core:
@@ -92,6 +92,18 @@ class CacheTest(s_t_utils.SynTest):
         self.len(0, cache.fifo)
         self.len(0, cache.cache)
 
+        cache = s_cache.FixedCache(lambda name: name.lower(), size=4)
+        [cache.get(name) for name in ('FOO', 'BAR', 'BAZ', 'FAZ')]
+
+        cache.resize(2)
+        self.eq(2, cache.size)
+        self.len(2, cache)
+        self.eq(['BAZ', 'FAZ'], list(cache.fifo))
+
+        cache.resize(3)
+        self.eq('hehe', cache.get('HEHE'))
+        self.len(3, cache)
+
     async def test_lib_cache_fixed_async(self):
         def callback(name):
             return name.lower()
@@ -281,3 +293,76 @@ class CacheTest(s_t_utils.SynTest):
         lru = s_cache.LruDict(0)
         lru['nope'] = 42
         self.none(lru.get('nope', None))
+
+    async def test_slrucache(self):
+
+        cache = s_cache.SlruCache(maxsize=10, maxbytes=100)
+
+        self.none(cache.get('newp'))
+        self.eq(1, cache.misses)
+
+        cache.put('foo', 'bar', 10)
+        self.len(1, cache)
+        self.isin('foo', cache)
+        self.eq(10, cache.size)
+        self.eq('bar', cache.get('foo'))
+        self.eq(1, cache.hits)
+
+        # a second access promoted foo, so a scan may not evict it
+        for i in range(100):
+            cache.put(i, i, 10)
+
+        self.isin('foo', cache)
+        self.notin(0, cache)
+        self.isin(99, cache)
+        self.eq(100, cache.size)
+        self.eq(91, cache.evicts)
+
+        # replacing a value updates the size
+        cache.put('foo', 'baz', 30)
+        self.eq('baz', cache.get('foo'))
+        self.eq(100, cache.size)
+        self.len(8, cache)
+
+        # entries larger than the cache are not kept
+        cache.put('big', 'big', 1000)
+        self.notin('big', cache)
+        self.le(cache.size, 100)
+
+        self.eq('baz', cache.pop('foo'))
+        self.none(cache.pop('foo'))
+        self.notin('foo', cache)
+
+        self.eq(cache.stat(), {
+            'hits': 2,
+            'misses': 1,
+            'evicts': cache.evicts,
+            'size': len(cache),
+            'bytes': cache.size,
+        })
+
+        # the entry count is also a bound
+        cache.resize(2, maxbytes=None)
+        self.len(2, cache)
+        self.eq(20, cache.size)
+
+        cache.clear()
+        self.len(0, cache)
+        self.eq(0, cache.size)
+
+        # protected entries are demoted rather than evicted
+        cache = s_cache.SlruCache(maxsize=5)
+        for i in range(5):
+            cache.put(i, i)
+            cache.get(i)
+
+        self.len(4, cache.protdata)
+        self.len(1, cache.probdata)
+
+        cache.put('newp', 'newp')
+        self.len(5, cache)
+        self.notin(0, cache)
+
+        cache = s_cache.SlruCache(maxsize=0)
+        cache.put('foo', 'bar')
+        self.none(cache.get('foo'))
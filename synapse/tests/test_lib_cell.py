@@ -808,6 +808,170 @@ class CellTest(s_t_utils.SynTest):
                 await cell.addUser('test02')
                 self.eq(6, await cell.getNexsIndx())
 
+    async def test_cell_nexuscompress(self):
+
+        with self.getTestDir() as dirn:
+
+            dirn00 = s_common.genpath(dirn, 'cell00')
+            dirn01 = s_common.genpath(dirn, 'cell01')
+
+            conf = {
+                'nexslog:en': True,
+                'nexslog:compress': 'zlib',
+                'dmon:listen': 'tcp://127.0.0.1:0/',
+            }
+            async with self.getTestCell(s_cell.Cell, dirn=dirn00, conf=conf) as cell00:
+                await cell00.sync()
+
+            s_tools_backup.backup(dirn00, dirn01)
+
+            async with self.getTestCell(s_cell.Cell, dirn=dirn00, conf=conf) as cell00:
+
+                for i in range(10):
+                    await cell00.addUser(f'user{i:02d}')
+
+                indx = await cell00.rotateNexsLog()
+                await cell00.addUser('user10')
+
+                nexslog = cell00.nexsroot.nexslog
+                await nexslog.compress()
+                self.eq({0}, nexslog._zseqns)
+                self.len(1, s_common.listdir(nexslog.dirn, glob='*.zseqn'))
+
+                items = [item async for item in cell00.getNexusChanges(0, wait=False)]
+                self.eq(list(range(indx + 2)), [item[0] for item in items])
+
+                # a mirror catches up from the compressed log
+                conf01 = {'nexslog:en': True, 'mirror': cell00.getLocalUrl()}
+                async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+                    await cell01.sync()
+                    self.nn(await cell01.auth.getUserByName('user00'))
+                    self.nn(await cell01.auth.getUserByName('user10'))
+
+    async def test_cell_mirror_catchup(self):
+
+        with self.getTestDir() as dirn:
+
+            dirn00 = s_common.genpath(dirn, 'cell00')
+            dirn01 = s_common.genpath(dirn, 'cell01')
+
+            async with self.getTestCell(s_cell.Cell, dirn=dirn00, conf={'nexslog:en': True}) as cell00:
+                await cell00.sync()
+
+            s_tools_backup.backup(dirn00, dirn01)
+
+            async with self.getTestCell(s_cell.Cell, dirn=dirn00, conf={'nexslog:en': True}) as cell00:
+
+                conf01 = {'mirror': cell00.getLocalUrl(), 'mirror:catchup:lag': 10}
+
+                # below the threshold the mirror replays the Nexus log
+                await cell00.addUser('user00')
+
+                with self.getLoggerStream('synapse.lib.cell') as stream:
+
+                    async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+                        await cell01.sync()
+                        self.nn(await cell01.auth.getUserByName('user00'))
+
+                    self.notin('catching up from a snapshot', stream.getvalue())
+
+                for i in range(1, 10):
+                    await cell00.addUser(f'user{i:02d}')
+
+                nexsindx = await cell00.getNexsIndx()
+
+                with self.getLoggerStream('synapse.lib.cell') as stream:
+
+                    async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+
+                        await stream.expect('catching up from a snapshot')
+                        await stream.expect(f'Mirror caught up from a snapshot at Nexus offset {nexsindx}.')
+
+                        # the snapshot was applied before the mirror started
+                        self.eq(nexsindx, await cell01.getNexsIndx())
+                        self.nn(await cell01.auth.getUserByName('user09'))
+
+                        # and the mirror continues from the snapshot offset
+                        await cell00.addUser('user10')
+                        await cell01.sync()
+                        self.nn(await cell01.auth.getUserByName('user10'))
+                        self.eq(await cell00.getNexsIndx(), await cell01.getNexsIndx())
+
+                # the leader removes the snapshot once it has been streamed
+                self.eq([], os.listdir(cell00.backdirn))
+
+                async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+                    await cell01.sync()
+                    self.nn(await cell01.auth.getUserByName('user10'))
+
+            # the upstream is unavailable so the mirror boots normally
+            with self.getLoggerStream('synapse.lib.cell') as stream:
+                async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+                    await stream.expect('Unable to check mirror lag')
+                    self.nn(await cell01.auth.getUserByName('user10'))
+
+    async def test_cell_mirror_catchup_changed(self):
+
+        with self.getTestDir() as dirn:
+
+            dirn00 = s_common.genpath(dirn, 'cell00')
+            dirn01 = s_common.genpath(dirn, 'cell01')
+
+            async with self.getTestCell(s_cell.Cell, dirn=dirn00, conf={'nexslog:en': True}) as cell00:
+                user = await cell00.addUser('visi')
+                await cell00.sync()
+
+            s_tools_backup.backup(dirn00, dirn01)
+
+            async with self.getTestCell(s_cell.Cell, dirn=dirn00, conf={'nexslog:en': True}) as cell00:
+
+                conf01 = {'mirror': cell00.getLocalUrl(), 'mirror:catchup:lag': 10}
+
+                # the last entry in the mirror Nexus log sets the old value
+                async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+                    await cell01.sync()
+                    await cell00.setUserEmail(user['iden'], 'old@vertex.link')
+                    self.true(await cell01.waitNexsOffs(await cell00.getNexsIndx() - 1, timeout=10))
+
+                    # the entry is logged before it is applied
+                    mirruser = await cell01.auth.reqUser(user['iden'])
+                    while mirruser.info.get('email') is None:
+                        await asyncio.sleep(0.01)
+
+                    self.eq('old@vertex.link', mirruser.info.get('email'))
+
+                await cell00.setUserEmail(user['iden'], 'new@vertex.link')
+                for i in range(10):
+                    await cell00.addUser(f'user{i:02d}')
+
+                nexsindx = await cell00.getNexsIndx()
+
+                with self.getLoggerStream('synapse.lib.cell') as stream:
+
+                    async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+
+                        await stream.expect(f'Mirror caught up from a snapshot at Nexus offset {nexsindx}.')
+
+                        # entries from before the snapshot are never replayed over it
+                        self.eq(nexsindx, await cell01.getNexsIndx())
+                        self.eq('new@vertex.link', (await cell01.auth.reqUser(user['iden'])).info.get('email'))
+
+                        await cell00.addUser('user10')
+                        await cell01.sync()
+                        self.nn(await cell01.auth.getUserByName('user10'))
+                        self.eq(await cell00.getNexsIndx(), await cell01.getNexsIndx())
+
+                        # the mirror Nexus log begins at the snapshot offset
+                        self.eq(nexsindx, cell01.nexsroot.nexslog.firstindx)
+                        items = [item async for item in cell01.nexsroot.nexslog.iter(0)]
+                        self.eq(nexsindx, items[0][0])
+
+                # restarting the mirror does not replay entries older than the snapshot
+                async with self.getTestCell(s_cell.Cell, dirn=dirn01, conf=conf01) as cell01:
+                    await cell01.sync()
+                    self.eq('new@vertex.link', (await cell01.auth.reqUser(user['iden'])).info.get('email'))
+                    self.eq(await cell00.getNexsIndx(), await cell01.getNexsIndx())
+
     async def test_cell_nexuscull(self):
 
         with self.getTestDir() as dirn, self.withNexusReplay():
@@ -1,5 +1,6 @@
 import os
 import math
+import random
 import asyncio
 
 import synapse.exc as s_exc
@@ -7,6 +8,7 @@ import synapse.common as s_common
 import synapse.cortex as s_cortex
 import synapse.telepath as s_telepath
 
+import synapse.lib.gis as s_gis
 import synapse.lib.auth as s_auth
 import synapse.lib.time as s_time
 import synapse.lib.layer as s_layer
@@ -32,7 +34,7 @@ class LayerTest(s_t_utils.SynTest):
 
     def checkLayrvers(self, core):
         for layr in core.layers.values():
-            self.eq(layr.layrvers, 11)
+            self.eq(layr.layrvers, 14)
 
     async def test_layer_verify(self):
 
@@ -677,6 +679,195 @@ class LayerTest(s_t_utils.SynTest):
         for valu, indx in ((v, stor.indx(v)) for v in vals):
             self.eq(valu, stor.decodeIndx(indx[0]))
 
+    async def test_layer_geo_index(self):
+
+        self.eq(0, s_layer.zordEncode(0, 0))
+        self.eq(0b10, s_layer.zordEncode(1, 0))
+        self.eq(0b01, s_layer.zordEncode(0, 1))
+        self.eq(0xffffffffffffffff, s_layer.zordEncode(0xffffffff, 0xffffffff))
+
+        with self.getTestDir() as dirn:
+
+            async with self.getTestCore(dirn=dirn) as core:
+
+                layr = core.getLayer()
+                stor = layr.stortypes[s_layer.STOR_TYPE_LATLONG]
+
+                ranges = stor._getZordRanges(0, stor.lonmax, 0, stor.latmax)
+                self.eq(ranges, [(0, 0xffffffffffffffff)])
+
+                self.le(len(stor._getZordRanges(123456, 98765432109, 234567, 8765432109)), s_layer.GEO_MAX_CELLS)
+
+                rand = random.Random(0)
+                points = [(rand.uniform(-90, 90), rand.uniform(-180, 180)) for i in range(500)]
+                points.extend([(0.0, 179.99), (0.0, -179.99), (89.99, 0.0), (-90.0, 180.0)])
+
+                await core.nodes('for $p in $points { [ geo:place=* :latlong=$p ] }', opts={'vars': {'points': points}})
+
+                async def check(lat, lon, dist):
+
+                    valu = ((lat, lon), dist)
+                    indxby = s_layer.IndxByProp(layr, 'geo:place', 'latlong')
+
+                    items = [item async for item in stor._liftLatLonNear(indxby, valu)]
+                    self.eq(items, sorted(items))
+
+                    backs = [item async for item in stor._liftLatLonNear(indxby, valu, reverse=True)]
+                    self.eq(backs, items[::-1])
+
+                    count = 0
+                    for point in points:
+                        if s_gis.haversine((lat, lon), point) <= dist:
+                            count += 1
+
+                    self.len(count, items)
+                    return items
+
+                self.len(0, await check(10.0, 10.0, 1))
+                self.len(1, await check(0.0, 179.99, 1))
+                self.len(2, await check(0.0, 180.0, 10_000_000))
+                self.isin((89.99, 0.0), [await layr.getNodeValu(buid, 'latlong') for _, buid in await check(89.99, 100.0, 10_000_000)])
+                self.len(len(points), await check(0.0, 0.0, 40_000_000_000))
+
+                for i in range(10):
+                    lat, lon = rand.uniform(-90, 90), rand.uniform(-180, 180)
+                    await check(lat, lon, rand.choice((1_000_000, 100_000_000, 1_000_000_000)))
+
+                nodes = await core.nodes('geo:place:latlong*near=((0.0, 180.0), 10km)')
+                self.len(2, nodes)
+
+                nodes = await core.nodes('geo:place:latlong*near=((0.0, 180.0), 10km) [ :latlong=(20, 20) ]')
+                self.len(0, await core.nodes('geo:place:latlong*near=((0.0, 180.0), 10km)'))
+                self.len(2, await core.nodes('geo:place:latlong*near=((20.0, 20.0), 1km)'))
+
+                await core.nodes('geo:place:latlong*near=((20.0, 20.0), 1km) [ -:latlong ]')
+                self.len(0, await core.nodes('geo:place:latlong*near=((20.0, 20.0), 1km)'))
+
+                await core.nodes('geo:place:latlong*near=((89.99, 0.0), 1km) | delnode')
+                self.len(0, await core.nodes('geo:place:latlong*near=((89.99, 0.0), 1km)'))
+
+                # roll back to a v12 layer without the geo index
+                await layr._saveDirtySodes()
+                lkeys = list(layr.layrslab.scanKeys(db=layr.bygeo))
+                self.len(len(points) - 3, lkeys)
+                for lkey in lkeys:
+                    layr.layrslab.delete(lkey, db=layr.bygeo)
+
+                self.len(0, await core.nodes('geo:place:latlong*near=((0.0, 0.0), 40000km)'))
+                layr.meta.set('version', 12)
+
+            with self.getLoggerStream('synapse.lib.layer') as stream:
+                async with self.getTestCore(dirn=dirn) as core:
+                    await stream.expect('Adding geo index')
+                    self.eq(14, core.getLayer().layrvers)
+                    self.len(len(points) - 3, await core.nodes('geo:place:latlong*near=((0.0, 0.0), 40000km)'))
+
+                    # universal latlong props are indexed under the universal prop as well
+                    await core.addUnivProp('_latlong', ('geo:latlong', {}), {})
+                    await core.nodes('[ test:str=foo test:int=10 ._latlong=(10, 10) ]')
+                    await core.nodes('[ test:str=bar ._latlong=(-10, -10) ]')
+
+                    self.len(2, await core.nodes('._latlong*near=((10.0, 10.0), 1km)'))
+                    self.len(1, await core.nodes('test:str._latlong*near=((10.0, 10.0), 1km)'))
+                    self.len(1, await core.nodes('._latlong*near=((-10.0, -10.0), 1km)'))
+
+                    await core.nodes('test:str=foo [ ._latlong=(-10, -10) ]')
+                    self.len(1, await core.nodes('._latlong*near=((10.0, 10.0), 1km)'))
+                    self.len(2, await core.nodes('._latlong*near=((-10.0, -10.0), 1km)'))
+
+                    await core.nodes('test:str [ -._latlong ]')
+                    self.len(0, await core.nodes('._latlong*near=((-10.0, -10.0), 1km)'))
+                    self.len(1, await core.nodes('._latlong*near=((10.0, 10.0), 1km)'))
+
+    async def test_layer_ival_index(self):
+
+        with self.getTestDir() as dirn:
+
+            async with self.getTestCore(dirn=dirn) as core:
+
+                layr = core.getLayer()
+                stor = layr.stortypes[s_layer.STOR_TYPE_IVAL]
+
+                self.eq(b'\x00', stor.getDurIndx(stor.indx((10, 10))[0]))
+                self.eq(b'\x01', stor.getDurIndx(stor.indx((10, 11))[0]))
+                self.eq(b'\x0b', stor.getDurIndx(stor.indx((0, 1024))[0]))
+
+                rand = random.Random(0)
+
+                ivals = []
+                for i in range(300):
+                    tick = rand.randint(0, 100_000)
+                    ivals.append((tick, tick + rand.choice((1, 10, 1000, 50_000))))
+
+                ivals.append((0, 0x7fffffffffffffff))
+
+                opts = {'vars': {'ivals': ivals, 'items': list(enumerate(ivals))}}
+                await core.nodes('for $v in $ivals { [ test:ival=$v :interval=$v ] }', opts=opts)
+                await core.nodes('for ($i, $v) in $items { [ test:str=$i .seen=$v ] }', opts=opts)
+
+                async def check(indxby, valu):
+
+                    items = [item async for item in stor._liftIvalAt(indxby, valu)]
+                    self.eq(items, sorted(items))
+
+                    backs = [item async for item in stor._liftIvalAt(indxby, valu, reverse=True)]
+                    self.eq(backs, items[::-1])
+
+                    scans = [item for item in indxby.scanByPref() if item[0][-16:-8] < stor.indx(valu)[0][8:]]
+                    scans = [item for item in scans if item[0][-8:] > stor.indx(valu)[0][:8]]
+                    self.eq(items, scans)
+
+                    return items
+
+                indxbys = (
+                    s_layer.IndxByProp(layr, None, '.seen'),
+                    s_layer.IndxByProp(layr, 'test:str', '.seen'),
+                    s_layer.IndxByForm(layr, 'test:ival'),
+                    s_layer.IndxByProp(layr, 'test:ival', 'interval'),
+                )
+
+                for indxby in indxbys:
+
+                    self.len(1, await check(indxby, (200_000, 300_000)))
+                    self.len(0, await check(indxby, (-10, 0)))
+
+                    for i in range(10):
+                        tick = rand.randint(0, 150_000)
+                        await check(indxby, (tick, tick + rand.choice((1, 100, 10_000))))
+
+                opts = {'vars': {'late': (150_000, 200_001), 'later': (200_000, 300_000), 'early': (0, 200_000)}}
+
+                self.len(1, await core.nodes('test:str=0 [ .seen=$later ]', opts=opts))
+                self.len(2, await core.nodes('test:str.seen@=$late', opts=opts))
+                self.len(2, await core.nodes('.seen@=$late', opts=opts))
+
+                await core.nodes('test:str=0 [ -.seen ]')
+                self.len(0, await core.nodes('test:str.seen@=$late +test:str=0', opts=opts))
+
+                await core.nodes('test:ival:interval@=$later | delnode', opts=opts)
+                self.len(0, await core.nodes('test:ival@=$later', opts=opts))
+
+                # roll back to a v13 layer without the ival index
+                await layr._saveDirtySodes()
+                count = 0
+                for indxby in indxbys:
+                    count += await layr.layrslab.countByPref(indxby.abrv, db=layr.byprop)
+
+                lkeys = list(layr.layrslab.scanKeys(db=layr.byival))
+                self.len(count, lkeys)
+                for lkey in lkeys:
+                    layr.layrslab.delete(lkey, db=layr.byival)
+
+                self.len(0, await core.nodes('test:str.seen@=$early', opts=opts))
+                layr.meta.set('version', 13)
+
+            with self.getLoggerStream('synapse.lib.layer') as stream:
+                async with self.getTestCore(dirn=dirn) as core:
+                    await stream.expect('Adding ival index')
+                    self.eq(14, core.getLayer().layrvers)
+                    self.len(len(ivals) - 1, await core.nodes('test:str.seen@=$early', opts=opts))
+                    self.len(len(set(ivals)) - 1, await core.nodes('test:ival:interval@=$early', opts=opts))
+
     async def test_layer_stortype_int(self):
         async with self.getTestCore() as core:
 
@@ -1272,6 +1463,225 @@ class LayerTest(s_t_utils.SynTest):
             nodes = await core.nodes('.created')
             self.len(0, nodes)
 
+    async def test_layer_sode_copy_on_write(self):
+
+        async with self.getTestCore() as core:
+
+            layr = core.getLayer()
+            await core.addTagProp('score', ('int', {}), {})
+
+            nodes = await core.nodes('[ test:str=foo :hehe=haha +#foo=2020 +#foo:score=10 ]')
+            buid = nodes[0].buid
+
+            sode = await layr.getStorNode(buid)
+            self.true(sode is await layr.getStorNode(buid))
+            self.eq('haha', sode['props']['hehe'][0])
+
+            await core.nodes('test:str=foo [ :hehe=newp -#foo:score +#bar ]')
+
+            # the previously returned sode is not modified by edits
+            self.eq('haha', sode['props']['hehe'][0])
+            self.eq((10, s_layer.STOR_TYPE_I64), sode['tagprops']['foo']['score'])
+            self.none(sode['tags'].get('bar'))
+
+            newsode = await layr.getStorNode(buid)
+            self.false(sode is newsode)
+            self.eq('newp', newsode['props']['hehe'][0])
+            self.none(newsode.get('tagprops', {}).get('foo'))
+            self.nn(newsode['tags'].get('bar'))
+
+            copy = s_layer.copyStorNode(newsode)
+            copy['props']['hehe'] = ('lolz', s_layer.STOR_TYPE_UTF8)
+            self.eq('newp', newsode['props']['hehe'][0])
+
+            # the edited sode is only published once all of its edits are applied
+            seen = []
+            tagset = layr.editors[s_layer.EDIT_TAG_SET]
+            async def editTagSet(buid, form, edit, sode, meta):
+                seen.append(layr._getStorNode(buid))
+                return await tagset(buid, form, edit, sode, meta)
+
+            layr.editors[s_layer.EDIT_TAG_SET] = editTagSet
+            try:
+                await core.nodes('test:str=foo [ +#baz +#faz ]')
+            finally:
+                layr.editors[s_layer.EDIT_TAG_SET] = tagset
+
+            self.len(2, seen)
+            self.true(seen[0] is newsode)
+            self.true(seen[1] is newsode)
+            self.none(newsode['tags'].get('baz'))
+
+            newsode = await layr.getStorNode(buid)
+            self.nn(newsode['tags'].get('baz'))
+            self.nn(newsode['tags'].get('faz'))
+
+            # storm receives a private copy of the sode
+            opts = {'vars': {'iden': s_common.ehex(buid)}}
+            sode = await core.callStorm('''
+                $sode = $lib.layer.get().getStorNode($iden)
+                $sode.props.hehe = lolz
+                return($sode)
+            ''', opts=opts)
+            self.eq('lolz', sode['props']['hehe'])
+            self.eq('newp', (await layr.getStorNode(buid))['props']['hehe'][0])
+
+    async def test_layer_stornodes_batch(self):
+
+        async with self.getTestCore() as core:
+
+            nodes = await core.nodes('[ test:int=1 test:int=2 test:int=3 ]')
+            buids = [n.buid for n in nodes]
+
+            view = await core.view.fork()
+            fork = core.getView(view['iden'])
+
+            await core.nodes('test:int=2 [ +#foo ]', opts={'view': fork.iden})
+            await core.nodes('[ test:int=1 <(refs)+ { test:int=2 } <(refs)+ { test:int=3 } ]', opts={'view': fork.iden})
+
+            newp = s_common.buid('newp')
+
+            layr = core.getLayer()
+            sodes = await layr.getStorNodesBatch([buids[2], newp, buids[0]])
+            self.len(3, sodes)
+            self.eq(3, sodes[0]['valu'][0])
+            self.eq({}, sodes[1])
+            self.eq(1, sodes[2]['valu'][0])
+
+            # results are consistent with the per-buid API
+            for buid, sode in zip(buids, await layr.getStorNodesBatch(buids)):
+                self.eq(sode, await layr.getStorNode(buid))
+
+            sodelists = await fork.getStorNodesBatch([buids[1], newp])
+            self.len(2, sodelists)
+            self.eq(sodelists[0], await fork.getStorNodes(buids[1]))
+            self.eq((None, None), sodelists[0][0]['tags']['foo'])
+            self.eq([{}, {}], sodelists[1])
+
+            async with await fork.snap(user=core.auth.rootuser) as snap:
+                nodes = await snap.getNodesByBuids([buids[1], newp, buids[0]])
+                self.len(3, nodes)
+                self.eq(('test:int', 2), nodes[0].ndef)
+                self.nn(nodes[0].getTag('foo'))
+                self.none(nodes[1])
+                self.eq(('test:int', 1), nodes[2].ndef)
+
+                # live nodes are re-used
+                self.true(nodes[0] is (await snap.getNodesByBuids([buids[1]]))[0])
+
+            nodes = await core.nodes('test:int=1 <(refs)- *', opts={'view': fork.iden})
+            self.sorteq([2, 3], [n.ndef[1] for n in nodes])
+
+            nodes = await core.nodes('test:int=2 -(refs)> *', opts={'view': fork.iden})
+            self.eq([1], [n.ndef[1] for n in nodes])
+
+            # multi-layer lifts fetch storage nodes in batches
+            with mock.patch('synapse.cortex.SODE_BATCH_SIZE', 2):
+                nodes = await core.nodes('test:int', opts={'view': fork.iden})
+                self.eq([1, 2, 3], [n.ndef[1] for n in nodes])
+
+                nodes = await core.nodes('test:int#foo', opts={'view': fork.iden})
+                self.eq([2], [n.ndef[1] for n in nodes])
+
+    async def test_layer_buid_bloom(self):
+
+        bloom = s_layer.BuidBloom(1000)
+        buids = [s_common.buid(i) for i in range(1000)]
+        for buid in buids:
+            bloom.add(buid)
+
+        self.true(all(bloom.has(buid) for buid in buids))
+        misses = sum(bloom.has(s_common.buid(('newp', i))) for i in range(1000))
+        self.lt(misses, 50)
+
+        with self.getTestDir() as dirn:
+
+            async with self.getTestCore(dirn=dirn) as core:
+
+                layr = core.getLayer()
+                await layr.buidbloomtask
+                self.nn(layr.buidbloom)
+
+                nodes = await core.nodes('[ test:int=1 test:int=2 ]')
+                self.true(layr.mayHaveStorNode(nodes[0].buid))
+                self.false(layr.mayHaveStorNode(s_common.buid('newp')))
+                self.none(layr._getStorNode(s_common.buid('newp')))
+
+                view = await core.view.fork()
+                fork = core.getView(view['iden'])
+                forklayr = fork.layers[0]
+
+                await core.nodes('test:int=2 [ +#foo ]', opts={'view': fork.iden})
+                await core.nodes('[ test:str=fork ]', opts={'view': fork.iden})
+
+                # the fork layer has no test:int rows so it is not lifted from
+                lifts = []
+                liftByProp = forklayr.liftByProp
+
+                async def liftByPropCount(*args, **kwargs):
+                    lifts.append(args)
+                    async for item in liftByProp(*args, **kwargs):
+                        yield item
+
+                forklayr.liftByProp = liftByPropCount
+
+                nodes = await core.nodes('test:int', opts={'view': fork.iden})
+                self.len(2, nodes)
+                self.nn(nodes[1].getTag('foo'))
+                self.len(0, lifts)
+
+                nodes = await core.nodes('test:str', opts={'view': fork.iden})
+                self.len(1, nodes)
+                self.len(1, lifts)
+
+                nodes = await core.nodes('#foo', opts={'view': fork.iden})
+                self.len(1, nodes)
+                self.eq(('test:int', 2), nodes[0].ndef)
+
+            async with self.getTestCore(dirn=dirn) as core:
+
+                # the filter is rebuilt from storage on startup
+                layr = core.getLayer()
+                await layr.buidbloomtask
+                self.len(2, await core.nodes('test:int'))
+                self.true(layr.mayHaveStorNode(s_common.buid(('test:int', 1))))
+                self.false(layr.mayHaveStorNode(s_common.buid('newp')))
+
+            with mock.patch('synapse.lib.layer.BUID_BLOOM_MAXSIZE', 0):
+                async with self.getTestCore(dirn=dirn) as core:
+                    layr = core.getLayer()
+                    await layr.buidbloomtask
+                    self.none(layr.buidbloom)
+                    self.true(layr.mayHaveStorNode(s_common.buid('newp')))
+                    self.len(2, await core.nodes('test:int'))
+
+            # the filter is unused until it is built and includes buids written while building
+            async with self.getTestCore(dirn=dirn) as core:
+
+                layr = core.getLayer()
+
+                scanKeys = layr.layrslab.scanKeys
+                def scanKeysSlow(db=None):
+                    for lkey in scanKeys(db=db):
+                        self.none(layr.buidbloom)
+                        self.true(layr.mayHaveStorNode(s_common.buid('newp')))
+                        yield lkey
+
+                layr.buidbloomtask.cancel()
+                layr.buidbloom = None
+
+                with mock.patch.object(layr.layrslab, 'scanKeys', scanKeysSlow):
+
+                    task = layr.schedCoro(layr._initBuidBloom())
+                    nodes = await core.nodes('[ test:int=3 ]')
+                    await task
+
+                self.nn(layr.buidbloom)
+                await layr._saveDirtySodes()
+                self.true(layr.mayHaveStorNode(nodes[0].buid))
+                self.true(layr.mayHaveStorNode(s_common.buid(('test:int', 1))))
+                self.false(layr.mayHaveStorNode(s_common.buid('newp')))
+
     async def test_layer_flat_edits(self):
         nodeedits = (
             (b'asdf', 'test:junk', (
@@ -1557,6 +1967,267 @@ class LayerTest(s_t_utils.SynTest):
         finally:
             s_layer.MIGR_COMMIT_SIZE = oldv
 
+    async def test_layer_v12(self):
+
+        with self.getTestDir() as dirn:
+
+            async with self.getTestCore(dirn=dirn) as core:
+
+                await core.addTagProp('score', ('int', {}), {})
+                await core.nodes('[ inet:ipv4=1.2.3.4 :asn=10 +#foo.bar:score=10 ]')
+                await core.nodes('[ inet:ipv4=5.6.7.8 :asn=10 +#foo:score=20 ]')
+                await core.nodes('[ inet:fqdn=vertex.link +#foo ]')
+                await core.nodes('[ test:arrayprop=* :ints=(1, 2, 3) ]')
+
+                layr = core.getLayer()
+                self.eq(2, await layr.getPropCount('inet:ipv4', 'asn'))
+                self.eq(1, await layr.getPropCount('inet:ipv4', 'asn', maxsize=1))
+                self.eq(3, await layr.getTagCount('foo'))
+                self.eq(2, await layr.getTagCount('foo', formname='inet:ipv4'))
+                self.eq(1, await layr.getTagCount('foo.bar'))
+                self.eq(1, await layr.getTagPropCount(None, 'foo', 'score'))
+                self.eq(1, await layr.getTagPropCount('inet:ipv4', 'foo.bar', 'score'))
+                self.eq(0, await layr.getTagPropCount('inet:fqdn', 'foo', 'score'))
+                self.eq(3, await layr.getPropArrayCount('test:arrayprop', 'ints'))
+                self.eq(len(await core.nodes('.created')), await layr.getUnivPropCount('.created'))
+
+                # setting the same values again must not double count
+                await core.nodes('inet:ipv4 [ :asn=10 +#foo ]')
+                await core.nodes('inet:ipv4=1.2.3.4 [ +#foo.bar:score=10 ]')
+                self.eq(2, await layr.getPropCount('inet:ipv4', 'asn'))
+                self.eq(3, await layr.getTagCount('foo'))
+                self.eq(1, await layr.getTagPropCount(None, 'foo', 'score'))
+
+                await core.nodes('inet:ipv4=1.2.3.4 [ :asn=20 -#foo.bar ]')
+                await core.nodes('test:arrayprop [ :ints=(4,) ]')
+                self.eq(2, await layr.getPropCount('inet:ipv4', 'asn'))
+                self.eq(3, await layr.getTagCount('foo'))
+                self.eq(0, await layr.getTagCount('foo.bar'))
+                self.eq(1, await layr.getTagPropCount(None, 'foo', 'score'))
+                self.eq(1, await layr.getPropArrayCount('test:arrayprop', 'ints'))
+
+                await core.nodes('inet:ipv4 | delnode')
+                self.eq(0, await layr.getPropCount('inet:ipv4', 'asn'))
+                self.eq(1, await layr.getTagCount('foo'))
+                self.eq(0, await layr.getTagCount('foo', formname='inet:ipv4'))
+                self.eq(0, await layr.getTagPropCount(None, 'foo', 'score'))
+
+                await core.nodes('[ inet:ipv4=1.2.3.4 :asn=10 +#foo.bar:score=10 ]')
+                await core.nodes('[ inet:ipv4=5.6.7.8 :asn=10 +#foo:score=20 ]')
+
+                expected = [
+                    await layr.getPropCount('inet:ipv4', 'asn'),
+                    await layr.getTagCount('foo'),
+                    await layr.getTagCount('foo', formname='inet:ipv4'),
+                    await layr.getTagPropCount(None, 'foo', 'score'),
+                    await layr.getTagPropCount('inet:ipv4', 'foo', 'score'),
+                    await layr.getPropArrayCount('test:arrayprop', 'ints'),
+                    await layr.getUnivPropCount('.created'),
+                ]
+                self.eq(expected[:6], [2, 3, 2, 1, 1, 1])
+
+                # roll back to a v11 layer without counters
+                for counts in (layr.tagcounts, layr.propcounts, layr.arraycounts, layr.tagpropcounts):
+                    for name in list(counts.cache.keys()):
+                        counts.set(name.decode(), 0)
+
+                layr.meta.set('version', 11)
+
+            with self.getLoggerStream('synapse.lib.layer') as stream:
+                async with self.getTestCore(dirn=dirn) as core:
+
+                    await stream.expect('Adding index counters')
+
+                    layr = core.getLayer()
+                    self.eq(14, layr.layrvers)
+                    self.eq(expected, [
+                        await layr.getPropCount('inet:ipv4', 'asn'),
+                        await layr.getTagCount('foo'),
+                        await layr.getTagCount('foo', formname='inet:ipv4'),
+                        await layr.getTagPropCount(None, 'foo', 'score'),
+                        await layr.getTagPropCount('inet:ipv4', 'foo', 'score'),
+                        await layr.getPropArrayCount('test:arrayprop', 'ints'),
+                        await layr.getUnivPropCount('.created'),
+                    ])
+
+    async def test_layer_trigram(self):
+
+        self.eq({'foo'}, s_layer.getRegxTrigrams('FOO'))
+        self.eq({'foo', 'bar'}, s_layer.getRegxTrigrams('^foo.bar$'))
+        self.eq({'a.b', '.bc'}, s_layer.getRegxTrigrams(r'a\.bc'))
+        self.eq({'bcd'}, s_layer.getRegxTrigrams('ab+cd'))
+        self.eq({'efg'}, s_layer.getRegxTrigrams(r'ab[c\]d]efg\d'))
+        self.eq(set(), s_layer.getRegxTrigrams('abc?d'))
+        self.eq(set(), s_layer.getRegxTrigrams('ab{2}cd'))
+        self.eq({'def', 'efg'}, s_layer.getRegxTrigrams('abc{2,3}defg'))
+        self.eq({'foo', 'bar'}, s_layer.getRegxTrigrams('foo.{100}bar'))
+        self.eq({'foo', 'bar'}, s_layer.getRegxTrigrams('fooo{1,}?bar'))
+        self.none(s_layer.getRegxTrigrams('abc{2,3'))
+        self.none(s_layer.getRegxTrigrams('foo|bar'))
+        self.none(s_layer.getRegxTrigrams('(foo)?bar'))
+        self.none(s_layer.getRegxTrigrams(r'\x41bcd'))
+        self.none(s_layer.getRegxTrigrams('abc['))
+
+        # folding never changes the length of a value
+        self.eq({'xiy'}, s_layer.getTrigrams('xİy'))
+        self.eq({'lis', 'ist'}, s_layer.getTrigrams('LİST'))
+        self.eq({'kis', 'iss'}, s_layer.getTrigrams('Kıſß'))
+
+        async def waitTrigrams(layr):
+            await asyncio.gather(*layr.trigramtasks.values())
+            self.eq(set(layr.trigramabrvs), layr.trigramready)
+
+        async with self.getTestCore() as core:
+
+            longv = 'x' * 300 + 'haha'
+            await core.nodes('[ it:dev:str=foobar it:dev:str=FOOBAZ it:dev:str=$longv ]', opts={'vars': {'longv': longv}})
+            await core.nodes('[ test:str=a :hehe=/vertex/foo/bar ]')
+            await core.nodes('[ test:str=b :hehe=/woot/baz ]')
+
+            with self.raises(s_exc.NoSuchProp):
+                await core.nodes('$lib.layer.get().set(trigram:props, (newp:newp,))')
+
+            with self.raises(s_exc.BadArg):
+                await core.nodes('$lib.layer.get().set(trigram:props, (inet:ipv4,))')
+
+            with self.raises(s_exc.BadArg):
+                await core.nodes('$lib.layer.get().set(trigram:props, (".seen",))')
+
+            await core.nodes('$lib.layer.get().set(trigram:props, (it:dev:str, test:str:hehe))')
+
+            layr = core.getLayer()
+            await waitTrigrams(layr)
+            self.len(2, layr.meta.get('trigram:ready'))
+            self.len(2, layr.trigramabrvs)
+            self.eq(('it:dev:str', 'test:str:hehe'), await core.callStorm('return($lib.layer.get().get(trigram:props))'))
+
+            await core.nodes('[ it:dev:str=hehefoo ]')
+
+            calls = []
+            origscan = layr._iterTrigramBuids
+
+            def scan(abrv, trigrams):
+                calls.append(trigrams)
+                return origscan(abrv, trigrams)
+
+            layr._iterTrigramBuids = scan
+
+            nodes = await core.nodes('it:dev:str~=foo')
+            self.eq(('FOOBAZ', 'foobar', 'hehefoo'), [n.ndef[1] for n in nodes])
+            self.eq([{'foo'}], calls)
+
+            nodes = await core.nodes('reverse(it:dev:str~=foo)')
+            self.eq(('hehefoo', 'foobar', 'FOOBAZ'), [n.ndef[1] for n in nodes])
+
+            nodes = await core.nodes('it:dev:str~="^foo.a"')
+            self.eq(('FOOBAZ', 'foobar'), [n.ndef[1] for n in nodes])
+
+            nodes = await core.nodes('it:dev:str~="hah"')
+            self.eq((longv,), [n.ndef[1] for n in nodes])
+
+            calls.clear()
+            nodes = await core.nodes('it:dev:str~="fo+"')
+            self.len(3, nodes)
+            self.len(0, calls)
+
+            nodes = await core.nodes('test:str:hehe~="/FOO/"')
+            self.eq(('a',), [n.ndef[1] for n in nodes])
+
+            await core.nodes('test:str=b [ :hehe=/woot/foo/baz ]')
+            await core.nodes('test:str=a | delnode')
+            await core.nodes('it:dev:str=foobar | delnode')
+
+            nodes = await core.nodes('test:str:hehe~="/FOO/"')
+            self.eq(('b',), [n.ndef[1] for n in nodes])
+
+            nodes = await core.nodes('it:dev:str~=foo')
+            self.eq(('FOOBAZ', 'hehefoo'), [n.ndef[1] for n in nodes])
+
+            abrv = layr.getPropAbrv('test:str', 'hehe')
+            self.true(layr.layrslab.prefexists(abrv + b'baz', db=layr.bytrigram))
+            self.false(layr.layrslab.prefexists(abrv + b'bar', db=layr.bytrigram))
+
+            # the index is combined across layers in a fork
+            view = await core.callStorm('return($lib.view.get().fork().iden)')
+            opts = {'view': view}
+            await core.nodes('$lib.layer.get().set(trigram:props, (it:dev:str,))', opts=opts)
+            await waitTrigrams(core.getView(view).layers[0])
+            await core.nodes('[ it:dev:str=zipfoo ]', opts=opts)
+
+            nodes = await core.nodes('it:dev:str~=foo', opts=opts)
+            self.eq(('FOOBAZ', 'hehefoo', 'zipfoo'), [n.ndef[1] for n in nodes])
+
+            await core.nodes('$lib.layer.get().set(trigram:props, (test:str:hehe,))')
+            self.len(1, layr.trigramabrvs)
+            self.len(1, layr.trigramready)
+            self.len(1, layr.meta.get('trigram:ready'))
+
+            calls.clear()
+            nodes = await core.nodes('it:dev:str~=foo')
+            self.eq(('FOOBAZ', 'hehefoo'), [n.ndef[1] for n in nodes])
+            self.len(0, calls)
+
+            abrv = layr.getPropAbrv('it:dev:str', None)
+            self.false(layr.layrslab.prefexists(abrv, db=layr.bytrigram))
+
+            await core.nodes('$lib.layer.get().set(trigram:props, $lib.null)')
+            self.len(0, layr.trigramabrvs)
+            self.len(0, layr.trigramready)
+            self.none(await core.callStorm('return($lib.layer.get().get(trigram:props))'))
+
+            ldef = await core.addLayer({'trigram:props': ('it:dev:str', 'it:dev:str')})
+            self.eq(['it:dev:str'], ldef.get('trigram:props'))
+            self.len(1, core.getLayer(ldef['iden']).trigramabrvs)
+
+            # indexed lifts match the same values as a full scan
+            await core.nodes('[ it:dev:str=xİy it:dev:str=LİST it:dev:str=Kıſt ]')
+
+            scanned = {}
+            for text in ('xiy', 'list', 'kist', 'İs'):
+                scanned[text] = [n.ndef[1] for n in await core.nodes('it:dev:str~=$text', opts={'vars': {'text': text}})]
+
+            self.eq(['xİy'], scanned['xiy'])
+            self.eq(['LİST'], scanned['list'])
+
+            await core.nodes('$lib.layer.get().set(trigram:props, (it:dev:str,))')
+            await waitTrigrams(layr)
+
+            calls.clear()
+            for text, expected in scanned.items():
+                nodes = await core.nodes('it:dev:str~=$text', opts={'vars': {'text': text}})
+                self.eq(expected, [n.ndef[1] for n in nodes])
+            self.len(3, calls)
+
+        # the index is built in the background and only used for lifts once complete
+        with self.getTestDir() as dirn:
+
+            async with self.getTestCore(dirn=dirn) as core:
+
+                await core.nodes('[ it:dev:str=foobar it:dev:str=bazfoo ]')
+
+                layr = core.getLayer()
+                abrv = layr.getPropAbrv('it:dev:str', None)
+
+                origput = layr._putTrigrams
+                def putTrigrams(abrv, buid, valu):
+                    # not ready until the existing values are indexed
+                    self.notin(abrv, layr.trigramready)
+                    return origput(abrv, buid, valu)
+
+                with mock.patch.object(layr, '_putTrigrams', putTrigrams):
+                    await core.nodes('$lib.layer.get().set(trigram:props, (it:dev:str,))')
+                    await waitTrigrams(layr)
+
+                self.len(2, await core.nodes('it:dev:str~=foo'))
+
+                # an interrupted build is resumed on boot
+                layr._setTrigramReady(abrv, False)
+
+            async with self.getTestCore(dirn=dirn) as core:
+                layr = core.getLayer()
+                await waitTrigrams(layr)
+                self.len(2, await core.nodes('it:dev:str~=foo'))
+
     async def test_layer_logedits_default(self):
         async with self.getTestCore() as core:
             self.true(core.getLayer().logedits)
@@ -1807,6 +2478,43 @@ class LayerTest(s_t_utils.SynTest):
             with self.raises(s_exc.BadOptValu):
                 await core.callStorm('$layer = $lib.layer.get() $layer.set(cache:size, 0)')
 
+        # Test cache:bytes and the cache stats
+        async with self.getTestCore() as core:
+
+            layr = core.getView().layers[0]
+            self.eq(layr.buidcache.maxbytes, s_layer.BUID_CACHE_BYTES)
+
+            self.eq(1000, await core.callStorm('$layer = $lib.layer.get() $layer.set(cache:bytes, 1000) return($layer.get(cache:bytes))'))
+            self.eq(layr.buidcache.maxbytes, 1000)
+            self.eq(layr.buidcache.maxsize, s_layer.BUID_CACHE_SIZE)
+
+            with self.raises(s_exc.BadOptValu):
+                await core.callStorm('$layer = $lib.layer.get() $layer.set(cache:bytes, 0)')
+
+            await core.nodes('for $i in $lib.range(100) { [ test:str=$i ] }')
+            await layr._saveDirtySodes()
+            layr.buidcache.clear()
+
+            await core.nodes('test:str')
+            await core.nodes('test:str=99')
+
+            stat = (await layr.stat())['buidcache']
+            self.gt(stat['misses'], 0)
+            self.gt(stat['hits'], 0)
+            self.gt(stat['evicts'], 0)
+            self.le(stat['bytes'], 1000)
+
+        async with self.getTestCore(conf={'layers:cache:bytes': 2000}) as core:
+
+            layr = core.getView().layers[0]
+            self.eq(layr.buidcache.maxbytes, 2000)
+
+            msgs = await core.stormlist('layer.add --cache-bytes 3000')
+            self.stormHasNoWarnErr(msgs)
+
+            layers = await core.callStorm('return($lib.layer.list())')
+            self.len(1, [lyr for lyr in layers if lyr.get('cache:bytes') == 3000])
+
         # Test that view forks use default cache size
         async with self.getTestCore(conf={'layers:cache:size': 25000}) as core:
             fork = await core.view.fork()
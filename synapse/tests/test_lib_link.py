@@ -1,5 +1,7 @@
+import os
 import ssl
 import sys
+import zlib
 import socket
 import asyncio
 import multiprocessing
@@ -12,6 +14,7 @@ import synapse.common as s_common
 import synapse.lib.base as s_base
 import synapse.lib.coro as s_coro
 import synapse.lib.link as s_link
+import synapse.lib.msgpack as s_msgpack
 
 import synapse.tests.utils as s_test
 
@@ -205,6 +208,293 @@ class LinkTest(s_test.SynTest):
         await link1.fini()
         sock1.close()
 
+    async def test_link_buffered(self):
+
+        link0, sock0 = await s_link.linksock()
+
+        def reader(sock):
+            buf = b''
+            while True:
+                byts = sock.recv(s_link.READSIZE)
+                if not byts:
+                    break
+                buf += byts
+            return buf
+
+        # sends are buffered up to the high water mark
+        byts = b'V' * (s_link.TXHIGHWATER // 2)
+        await link0.send(byts)
+        await link0.send(byts)
+        self.gt(link0.writer.transport.get_write_buffer_size(), 0)
+
+        # buffered bytes are written before the spawn info is returned
+        recv = s_coro.executor(sock0.recv, len(byts) * 2, socket.MSG_WAITALL)
+        info = await link0.getSpawnInfo()
+        self.nn(info.get('sock'))
+        self.eq(0, link0.writer.transport.get_write_buffer_size())
+        self.eq(byts + byts, await recv)
+
+        # buffered bytes are written before txfini() shuts down the socket
+        await link0.send(byts)
+        await link0.send(byts)
+        link0.txfini()
+
+        self.eq(byts + byts, await s_coro.executor(reader, sock0))
+
+        await link0.fini()
+        sock0.close()
+
+        # messages are received from partial and multiple messages per read
+        link1, sock1 = await s_link.linksock()
+
+        mesgs = [('foo', {'valu': i}) for i in range(1000)]
+        byts = b''.join(s_msgpack.en(mesg) for mesg in mesgs)
+
+        def writer(sock):
+            for i in range(0, len(byts), 333):
+                sock.sendall(byts[i:i + 333])
+
+        await s_coro.executor(writer, sock1)
+        self.eq(mesgs, [await link1.rx() for _ in range(1000)])
+
+        await link1.fini()
+        sock1.close()
+
+    async def test_link_compress(self):
+
+        link0, sock1 = await s_link.linksock()
+        reader, writer = await asyncio.open_connection(sock=sock1)
+        link1 = await s_link.Link.anit(reader, writer, info={'unix': True})
+        link1.setDecompress()
+
+        sent = []
+        osend = s_link.Link._sendLocked
+
+        async def psend(link, byts):
+            sent.append(byts)
+            await osend(link, byts)
+
+        with self.raises(s_exc.BadArg):
+            link0.setCompress(0)
+
+        with self.raises(s_exc.BadArg):
+            link0.setCompress(10)
+
+        with self.raises(s_exc.BadArg):
+            link0.setCompress('6')
+
+        with self.raises(s_exc.BadArg):
+            link0.setCompress(6, minsize=-1)
+
+        self.none(link0.zlevel)
+
+        link0.setCompress(6, minsize=100)
+        self.eq(6, link0.zlevel)
+        self.eq(100, link0.zminsize)
+
+        spawninfo = await link0.getSpawnInfo()
+        self.eq((6, 100), spawninfo['info']['zlib'])
+
+        bigmesg = ('big', {'valu': 'V' * 10000})
+        randmesg = ('rand', {'valu': os.urandom(10000)})
+
+        with mock.patch('synapse.lib.link.Link._sendLocked', psend):
+
+            # small messages are not compressed
+            await link0.tx(('smol', {}))
+            self.eq(('smol', {}), await link1.rx())
+            self.eq(s_msgpack.en(('smol', {})), sent[-1])
+
+            await link0.tx(bigmesg)
+            self.eq(bigmesg, await link1.rx())
+            self.eq(s_link.ZLIB_MESG, s_msgpack.un(sent[-1])[0])
+            self.lt(len(sent[-1]), 1000)
+
+            # incompressible messages are sent as-is
+            await link0.tx(randmesg)
+            self.eq(randmesg, await link1.rx())
+            self.eq(s_msgpack.en(randmesg), sent[-1])
+
+            # a frame may contain multiple messages
+            await link0.send(s_msgpack.en(('foo', {})) + s_msgpack.en(bigmesg))
+            self.eq(('foo', {}), await link1.rx())
+            self.eq(bigmesg, await link1.rx())
+            self.eq(s_link.ZLIB_MESG, s_msgpack.un(sent[-1])[0])
+
+            with mock.patch('synapse.lib.link.ZLIB_EXECSIZE', 1000):
+                await link0.tx(bigmesg)
+                self.eq(bigmesg, await link1.rx())
+                self.eq(s_link.ZLIB_MESG, s_msgpack.un(sent[-1])[0])
+
+            link0.setCompress(None)
+            await link0.tx(bigmesg)
+            self.eq(bigmesg, await link1.rx())
+            self.eq(s_msgpack.en(bigmesg), sent[-1])
+
+        # compression may be enabled from the link info
+        link2, sock2 = await s_link.linksock()
+        reader, writer = await asyncio.open_connection(sock=sock2)
+        link3 = await s_link.Link.anit(reader, writer, info={'unix': True, 'zlib': (1, 10)})
+        self.eq(1, link3.zlevel)
+        self.eq(10, link3.zminsize)
+
+        # compressed frames are rejected until compression is enabled
+        with self.getLoggerStream('synapse.lib.link') as stream:
+            await link3.tx(bigmesg)
+            self.none(await link2.rx())
+            await stream.expect('before compression was enabled')
+
+        self.true(link2.isfini)
+
+        link2, sock2 = await s_link.linksock()
+        reader, writer = await asyncio.open_connection(sock=sock2)
+        link3 = await s_link.Link.anit(reader, writer, info={'unix': True, 'zlib': (1, 10)})
+        link2.setDecompress()
+        self.none(link2.zlevel)
+
+        await link3.tx(bigmesg)
+        self.eq(bigmesg, await link2.rx())
+
+        # frames which expand beyond the max size are rejected
+        with mock.patch('synapse.lib.link.ZLIB_MAXSIZE', 1000):
+
+            # large frames are not compressed by the sender
+            await link3.tx(bigmesg)
+            self.eq(bigmesg, await link2.rx())
+
+            bomb = s_msgpack.en((s_link.ZLIB_MESG, zlib.compress(s_msgpack.en(bigmesg))))
+            with self.getLoggerStream('synapse.lib.link') as stream:
+                await link3._send(bomb)
+                self.none(await link2.rx())
+                await stream.expect('is larger than 1000 bytes')
+
+        await link0.fini()
+        await link1.fini()
+        await link2.fini()
+        await link3.fini()
+
+    async def test_link_mux(self):
+
+        link0, sock1 = await s_link.linksock()
+        reader, writer = await asyncio.open_connection(sock=sock1)
+        link1 = await s_link.Link.anit(reader, writer, info={'unix': True})
+
+        datas = []
+        strms = asyncio.Queue()
+
+        async def onstream(strm):
+            await strms.put(strm)
+
+        mux0 = await s_link.Mux.anit(link0, window=1024)
+        mux1 = await s_link.Mux.anit(link1, window=1024, onstream=onstream)
+
+        async def pump(link, mux):
+            while not link.isfini:
+                mesg = await link.rx()
+                if mesg is None:
+                    return
+                if mesg[0] == 'mx:data':
+                    datas.append((mesg[1]['strm'], len(mesg[1]['byts'])))
+                await mux.onMuxMesg(mesg)
+
+        link0.schedCoro(pump(link0, mux0))
+        link1.schedCoro(pump(link1, mux1))
+
+        strm0 = await mux0.open()
+        await strm0.tx(('hehe', {'valu': 10}))
+
+        strm1 = await asyncio.wait_for(strms.get(), timeout=5)
+        self.eq(strm0.iden, strm1.iden)
+        self.eq(('hehe', {'valu': 10}), await strm1.rx())
+
+        await strm1.tx(('haha', {}))
+        self.eq(('haha', {}), await strm0.rx())
+
+        strm1.set('hehe', 'haha')
+        self.eq('haha', strm1.get('hehe'))
+        self.none(strm0.get('hehe'))
+        self.eq(link1.getAddrInfo(), strm1.getAddrInfo())
+
+        # messages larger than the window are sent in acknowledged chunks
+        bigmesg = ('big', {'valu': b'V' * 10000})
+        await strm0.tx(bigmesg)
+        self.eq(bigmesg, await strm1.rx())
+        self.true(all(size <= 1024 for iden, size in datas))
+
+        # senders wait for the receiver to consume messages
+        mesgs = [('foo', {'valu': 'V' * 100, 'i': i}) for i in range(40)]
+
+        async def sendall():
+            for mesg in mesgs:
+                await strm0.tx(mesg)
+
+        task = strm0.schedCoro(sendall())
+        await asyncio.sleep(0.1)
+        self.false(task.done())
+        self.le(strm0.credit, 0)
+
+        self.eq(mesgs, [await strm1.rx() for _ in mesgs])
+        await asyncio.wait_for(task, timeout=5)
+
+        # ready streams take turns sending
+        with mock.patch('synapse.lib.link.MUX_QUANTUM', 100):
+
+            strm2 = await mux0.open()
+            await strm2.tx(('init', {}))
+            strm3 = await asyncio.wait_for(strms.get(), timeout=5)
+            self.eq(('init', {}), await strm3.rx())
+
+            datas.clear()
+
+            async def recv(strm, count):
+                return [await strm.rx() for _ in range(count)]
+
+            rx1 = strm1.schedCoro(recv(strm1, 1))
+            rx3 = strm3.schedCoro(recv(strm3, 1))
+
+            await asyncio.gather(strm0.tx(bigmesg), strm2.tx(bigmesg))
+
+            self.eq([bigmesg], await asyncio.wait_for(rx1, timeout=5))
+            self.eq([bigmesg], await asyncio.wait_for(rx3, timeout=5))
+
+            idens = [iden for iden, size in datas]
+            self.eq(idens[:4], [strm0.iden, strm2.iden, strm0.iden, strm2.iden])
+
+        # data for a closed or unknown stream is dropped
+        await mux1.onMuxMesg(('mx:data', {'strm': 1, 'byts': s_msgpack.en(('newp', {}))}))
+        await mux0.onMuxMesg(('mx:data', {'strm': 99, 'byts': s_msgpack.en(('newp', {}))}))
+        await mux0.onMuxMesg(('mx:newp', {}))
+        self.len(2, mux0.streams)
+
+        # closing a stream closes the peer stream
+        await strm2.fini()
+        self.none(await asyncio.wait_for(strm3.rx(), timeout=5))
+        self.true(strm3.isfini)
+        self.notin(strm3.iden, mux1.streams)
+
+        with self.raises(s_exc.LinkShutDown):
+            await strm2.send(b'newp')
+
+        with self.raises(s_exc.IsFini):
+            await strm2.tx(('newp', {}))
+
+        # streams may be sent to a spawned process
+        info = await strm1.getSpawnInfo()
+        sock = info.get('sock')
+        sock.sendall(s_msgpack.en(('spawn', {})))
+        self.eq(('spawn', {}), await strm0.rx())
+        sock.close()
+
+        # an invalid stream message is a protocol error
+        await mux1.onMuxMesg(('mx:data', {'strm': strm1.iden, 'byts': None}))
+        self.true(link1.isfini)
+        self.true(mux1.isfini)
+        self.true(strm1.isfini)
+
+        await link0.waitfini(timeout=5)
+        self.true(mux0.isfini)
+        self.true(strm0.isfini)
+
     async def test_link_fromspawns(self):
 
         n = 100000
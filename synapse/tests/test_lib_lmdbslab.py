@@ -164,6 +164,10 @@ class LmdbSlabTest(s_t_utils.SynTest):
 
             self.eq(b'hehe', slab.get(b'\x00\x01', db=foo))
 
+            vals = slab.getmulti((b'\x00\x01', b'\x00\x03', b'\x01\x03'), db=foo)
+            self.eq(vals, [b'hehe', None, b'hoho'])
+            self.eq([], slab.getmulti((), db=foo))
+
             items = list(slab.scanByPref(b'\x00', db=foo))
             self.eq(items, ((b'\x00\x01', b'hehe'), (b'\x00\x02', b'haha')))
 
@@ -17,6 +17,12 @@ class MsgPackTest(s_t_utils.SynTest):
         byts = s_msgpack._fallback_en(('hehe', 10))
         self.eq(byts, b'\x92\xa4hehe\n')
 
+    def test_msgpack_arrayhead(self):
+        for size in (0, 1, 15, 16, 0xffff, 0x10000):
+            items = list(range(size))
+            byts = s_msgpack.arrayhead(size) + b''.join(s_msgpack.en(i) for i in items)
+            self.eq(tuple(items), s_msgpack.un(byts))
+
     def test_msgpack_ext(self):
         valu = 0xffffffffffffffffffffffffffffffff
         item = ('woot', valu)
@@ -73,6 +79,13 @@ class MsgPackTest(s_t_utils.SynTest):
 
         self.eq(rets, [(7, ('hehe', 10))] * 3)
 
+    def test_msgpack_unpk_items(self):
+        byts = s_msgpack.en(('foo', 10)) + s_msgpack.en(('bar', 20))
+        unpk = s_msgpack.Unpk()
+        self.eq((('foo', 10),), tuple(unpk.items(byts[:7])))
+        self.eq((('bar', 20),), tuple(unpk.items(byts[7:])))
+        self.eq((), tuple(unpk.items(b'')))
+
     def test_msgpack_byte(self):
         unpk = s_msgpack.Unpk()
         self.len(0, unpk.feed(b'\xa4'))
@@ -1,3 +1,4 @@
+import os
 import shutil
 import asyncio
 
@@ -248,6 +249,21 @@ class MultiSlabSeqn(s_t_utils.SynTest):
 
                 self.eq((12, b'\xa4foo8'), msqn.tailseqn.addWithPackRetn('foo8'))
 
+        with self.getTestDir() as dirn:
+
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn) as msqn:
+
+                # the size of the last group is kept in the tail slab until it is done
+                self.eq(0, msqn.getGroupSize())
+                self.eq([(0, b'\xa4foo1'), (1, b'\xa4foo2')], await msqn.saveWithPackRetn(['foo1', 'foo2']))
+                self.eq(2, msqn.getGroupSize())
+
+                await msqn.rotate()
+                self.eq(2, msqn.getGroupSize())
+
+                msqn.setGroupDone()
+                self.eq(0, msqn.getGroupSize())
+
     async def test_multislabseqn_cull(self):
 
         with self.getTestDir() as dirn:
@@ -519,3 +535,156 @@ class MultiSlabSeqn(s_t_utils.SynTest):
                 # create a hole in the index
                 await msqn.add('foo6', indx=6)
                 self.eq((6, 'foo6'), await msqn.last())
+
+    async def test_multislabseqn_initempty(self):
+
+        with self.getTestDir() as dirn:
+
+            await s_multislabseqn.MultiSlabSeqn.initEmpty(dirn, 20)
+
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn) as msqn:
+
+                self.eq(20, msqn.index())
+                self.eq(20, msqn.firstindx)
+                self.none(await msqn.last())
+                self.eq([], await alist(msqn.iter(0)))
+
+                self.eq(20, await msqn.add('foo'))
+                self.eq((20, 'foo'), await msqn.last())
+
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn) as msqn:
+                self.eq(21, msqn.index())
+                self.eq([(20, 'foo')], await alist(msqn.iter(0)))
+
+            with self.raises(s_exc.BadArg):
+                await s_multislabseqn.MultiSlabSeqn.initEmpty(dirn, 30)
+
+    async def test_multislabseqn_compress(self):
+
+        with self.getTestDir() as dirn:
+
+            with self.raises(s_exc.BadArg):
+                await s_multislabseqn.MultiSlabSeqn.anit(dirn, opts={'compress': 'newp'})
+
+        with self.getTestDir() as dirn:
+
+            opts = {'compress': 'zlib', 'compress:blocksize': 100}
+
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn, opts=opts) as msqn:
+
+                # nothing to compress yet
+                self.eq(0, await msqn.compress())
+
+                for i in range(20):
+                    await msqn.add({'foo': i, 'bar': 'x' * 20})
+
+                await msqn.add({'foo': 25, 'bar': 'x' * 20}, indx=25)
+
+                self.eq(26, await msqn.rotate())
+                await msqn.compress()
+
+                for i in range(26, 30):
+                    await msqn.add({'foo': i, 'bar': 'x' * 20})
+
+                self.len(1, s_common.listdir(dirn, glob='*.zseqn'))
+                self.len(1, s_common.listdir(dirn, glob='*.lmdb'))
+                self.eq({0}, msqn._zseqns)
+
+                zfn = msqn.zseqnFilename(dirn, 0)
+                async with await s_multislabseqn.ZSeqn.anit(zfn) as zseqn:
+                    self.eq(21, zseqn.size)
+                    self.eq(26, zseqn.index())
+                    self.gt(len(zseqn.blocks), 1)
+                    self.eq((0, {'foo': 0, 'bar': 'x' * 20}), zseqn.first())
+                    self.eq((25, {'foo': 25, 'bar': 'x' * 20}), zseqn.last())
+
+                retn = await alist(msqn.iter(0))
+                self.eq(list(range(20)) + [25, 26, 27, 28, 29], [item[0] for item in retn])
+                self.eq([i for (i, _) in retn], [valu['foo'] for (_, valu) in retn])
+
+                retn = await alist(msqn.iter(13))
+                self.eq(list(range(13, 20)) + [25, 26, 27, 28, 29], [item[0] for item in retn])
+
+                self.eq({'foo': 7, 'bar': 'x' * 20}, await msqn.get(7))
+                self.eq({'foo': 19, 'bar': 'x' * 20}, await msqn.get(19))
+                self.eq({'foo': 25, 'bar': 'x' * 20}, await msqn.get(25))
+                self.eq({'foo': 27, 'bar': 'x' * 20}, await msqn.get(27))
+                self.none(await msqn.get(22))
+
+                # compressed segments are read-only
+                await self.asyncraises(s_exc.IsReadOnly, msqn.add('newp', indx=3))
+                await self.asyncraises(s_exc.IsReadOnly, msqn.addWithPackRetn('newp', indx=3))
+
+                # a reader holding the slab open while it is compressed continues to use it
+                slab, seqn = await msqn._makeSlab(26)
+
+                self.eq(30, await msqn.rotate())
+                await msqn.add({'foo': 30, 'bar': 'x' * 20})
+                await msqn.compress()
+                self.eq({0, 26}, msqn._zseqns)
+
+                self.true(os.path.isdir(msqn.slabFilename(dirn, 26)))
+                self.eq({'foo': 27, 'bar': 'x' * 20}, seqn.get(27))
+                await slab.fini()
+                self.false(os.path.isdir(msqn.slabFilename(dirn, 26)))
+
+                retn = await alist(msqn.iter(24))
+                self.eq([25, 26, 27, 28, 29, 30], [item[0] for item in retn])
+
+            # leftover files from an interrupted compression are removed on startup
+            s_common.gendir(msqn.slabFilename(dirn, 26))
+            with s_common.genfile(msqn.zseqnFilename(dirn, 30) + '.tmp') as fd:
+                fd.write(b'newp')
+
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn) as msqn:
+
+                self.eq(31, msqn.index())
+                self.eq([0, 26, 30], msqn._ranges)
+                self.eq({0, 26}, msqn._zseqns)
+
+                self.len(2, s_common.listdir(dirn, glob='*.zseqn'))
+                self.len(1, s_common.listdir(dirn, glob='*.lmdb'))
+                self.len(0, s_common.listdir(dirn, glob='*.tmp'))
+
+                retn = await alist(msqn.iter(0))
+                self.eq(list(range(20)) + [25, 26, 27, 28, 29, 30], [item[0] for item in retn])
+                self.eq((30, {'foo': 30, 'bar': 'x' * 20}), await msqn.last())
+
+                # culling removes compressed segments
+                it = msqn.iter(0)
+                await it.__anext__()
+                await self.asyncraises(s_exc.SlabInUse, msqn.cull(26))
+                await it.aclose()
+
+                self.true(await msqn.cull(26))
+                self.eq([26, 30], msqn._ranges)
+                self.eq({26}, msqn._zseqns)
+                self.len(1, s_common.listdir(dirn, glob='*.zseqn'))
+
+                retn = await alist(msqn.iter(0))
+                self.eq([27, 28, 29, 30], [item[0] for item in retn])
+
+                # a corrupt compressed segment is detected on startup
+                with s_common.genfile(msqn.zseqnFilename(dirn, 26)) as fd:
+                    fd.truncate(4)
+
+            with self.raises(s_exc.BadCoreStore):
+                await s_multislabseqn.MultiSlabSeqn.anit(dirn)
+
+        with self.getTestDir() as dirn:
+
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn) as msqn:
+                for i in range(10):
+                    await msqn.add(f'foo{i}')
+                await msqn.rotate()
+                await msqn.add('foo10')
+
+            # existing rotated slabs are compressed on startup
+            async with await s_multislabseqn.MultiSlabSeqn.anit(dirn, opts={'compress': 'lzma'}) as msqn:
+                await msqn.compress()
+                self.eq({0}, msqn._zseqns)
+                self.len(1, s_common.listdir(dirn, glob='*.zseqn'))
+
+                retn = await alist(msqn.iter(0))
+                self.eq([(i, f'foo{i}') for i in range(11)], retn)
+                self.eq('foo3', await msqn.get(3))
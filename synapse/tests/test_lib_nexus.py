@@ -8,6 +8,7 @@ import synapse.common as s_common
 import synapse.lib.auth as s_auth
 import synapse.lib.cell as s_cell
 import synapse.lib.nexus as s_nexus
+import synapse.lib.scope as s_scope
 
 import synapse.tools.service.backup as s_backup
 
@@ -52,6 +53,14 @@ class SampleNexus(s_cell.Cell):
     async def doathingauto3(self, eventdict):
         raise s_exc.SynErr(mesg='Test error')
 
+    @s_nexus.Pusher.onPushAuto('cancelthing')
+    async def docancelthing(self, eventdict):
+        raise asyncio.CancelledError()
+
+    @s_nexus.Pusher.onPushAuto('scopething', passitem=True)
+    async def doscopething(self, eventdict, name, nexsitem=None):
+        return (nexsitem[0], s_scope.get(name))
+
 class SampleMixin(metaclass=s_nexus.RegMethType):
     @s_nexus.Pusher.onPushAuto('mixinthing')
     async def mixinthing(self, eventdict):
@@ -62,6 +71,29 @@ class SampleNexus2(SampleNexus, SampleMixin):
     async def doathing(self, eventdict):
         return await self._push('thing:doathing', eventdict, 'bar')
 
+class SampleKid(s_nexus.Pusher):
+
+    @s_nexus.Pusher.onPushAuto('kid:set')
+    async def setValu(self, valu):
+        self.valu = valu
+        return valu
+
+class SampleKidCell(s_cell.Cell):
+
+    async def initServiceStorage(self):
+        self.kids = {}
+
+    @s_nexus.Pusher.onPushAuto('kid:add')
+    async def addKid(self, iden):
+
+        kid = self.kids.get(iden)
+        if kid is None:
+            kid = await SampleKid.anit(iden, nexsroot=self.nexsroot)
+            self.onfini(kid)
+            self.kids[iden] = kid
+
+        return kid
+
 class NexusTest(s_t_utils.SynTest):
 
     async def test_nexus_base(self):
@@ -127,6 +159,148 @@ class NexusTest(s_t_utils.SynTest):
                     self.eq(offs, nexsindx)
                     self.eq(item[1], 'thing:doathing')
 
+    async def test_nexus_group_commit(self):
+
+        with self.getTestDir() as dirn:
+
+            conf = {'nexslog:en': True}
+            async with await SampleNexus.anit(dirn, conf=conf) as nexus1:
+
+                nexsroot = nexus1.nexsroot
+                strt = await nexsroot.index()
+
+                saves = []
+                origsave = nexsroot.nexslog.saveWithPackRetn
+                async def save(items):
+                    saves.append(len(items))
+                    retn = await origsave(items)
+                    # the group size is stored until the group is applied
+                    self.eq(len(items), nexsroot.nexslog.getGroupSize())
+                    return retn
+
+                async def scoped(valu):
+                    with s_scope.enter({'testval': valu}):
+                        return await nexus1.doscopething({'specialpush': 0}, 'testval')
+
+                with mock.patch.object(nexsroot.nexslog, 'saveWithPackRetn', save):
+
+                    # events queued while the lock is held are committed together
+                    async with nexus1.nexslock:
+
+                        tasks = [nexus1.schedCoro(scoped(i)) for i in range(3)]
+                        tasks.append(nexus1.schedCoro(nexus1.doathingauto3({'specialpush': 0})))
+                        tasks.append(nexus1.schedCoro(scoped(3)))
+
+                        # a caller which gives up before the commit is dropped
+                        dropped = nexus1.schedCoro(scoped('newp'))
+
+                        while len(nexsroot._eatqueue) < 6:
+                            await asyncio.sleep(0)
+
+                        dropped.cancel()
+                        await asyncio.sleep(0)
+
+                    rets = await asyncio.gather(*tasks, return_exceptions=True)
+
+                    self.eq(rets[0], (strt, 0))
+                    self.eq(rets[1], (strt + 1, 1))
+                    self.eq(rets[2], (strt + 2, 2))
+                    self.isinstance(rets[3], s_exc.SynErr)
+                    self.eq(rets[4], (strt + 4, 3))
+
+                    self.eq(saves, [5])
+                    self.eq(strt + 5, await nexsroot.index())
+                    self.eq(0, nexsroot.nexslog.getGroupSize())
+
+                    items = [item async for item in nexsroot.nexslog.iter(strt)]
+                    self.eq([i[1][1] for i in items], ['scopething'] * 3 + ['auto3', 'scopething'])
+
+                    # uncontended events are committed one at a time
+                    self.eq((strt + 5, None), await nexus1.doscopething({'specialpush': 0}, 'testval'))
+                    self.eq(saves, [5, 1])
+                    self.eq(0, nexsroot.nexslog.getGroupSize())
+
+                    # events which are not waited on are still committed in order
+                    with self.getLoggerStream('synapse.lib.nexus') as stream:
+                        await nexsroot.eat(nexus1.iden, 'scopething', ({}, 'newp'), {}, None, wait=False)
+                        self.eq((strt + 7, None), await nexus1.doscopething({'specialpush': 0}, 'testval'))
+
+                    # applying an event which is not waited on does not log an error
+                    self.notin('Error applying Nexus event', stream.getvalue())
+
+                    with self.getLoggerStream('synapse.lib.nexus') as stream:
+                        async with nexus1.nexslock:
+                            await nexsroot.eat(nexus1.iden, 'auto3', ({},), {}, None, wait=False)
+                            task = nexus1.schedCoro(nexus1.doscopething({'specialpush': 0}, 'testval'))
+                            while len(nexsroot._eatqueue) < 2:
+                                await asyncio.sleep(0)
+                        self.eq((strt + 9, None), await task)
+
+                    self.isin('Error applying Nexus event', stream.getvalue())
+
+                    # an event handler which raises CancelledError does not stop the group
+                    async with nexus1.nexslock:
+                        tasks = [
+                            nexus1.schedCoro(nexus1.docancelthing({'specialpush': 0})),
+                            nexus1.schedCoro(nexus1.doscopething({'specialpush': 0}, 'testval')),
+                        ]
+                        while len(nexsroot._eatqueue) < 2:
+                            await asyncio.sleep(0)
+
+                    rets = await asyncio.gather(*tasks, return_exceptions=True)
+                    self.isinstance(rets[0], s_exc.SynErr)
+                    self.isin('cancelled while being applied', rets[0].get('mesg'))
+                    self.eq(rets[1], (strt + 11, None))
+
+                    self.eq((strt + 12, None), await nexus1.doscopething({'specialpush': 0}, 'testval'))
+
+                    # every event in a group is failed if a write hold is set before it is committed
+                    item = (nexus1.iden, 'scopething', ({}, 'testval'), {}, {})
+                    entries = [(item, nexsroot.loop.create_future(), None) for _ in range(4)]
+                    futus = [entry[1] for entry in entries]
+
+                    await nexsroot.addWriteHold('testing')
+                    await nexsroot._eat(entries)
+                    await nexsroot.delWriteHold('testing')
+
+                    self.len(0, entries)
+                    for futu in futus:
+                        self.isinstance(futu.exception(), s_exc.IsReadOnly)
+
+                    self.eq(strt + 13, await nexsroot.index())
+
+                applied = []
+                origapply = nexsroot._apply
+                async def apply(indx, mesg):
+                    applied.append(indx)
+                    return await origapply(indx, mesg)
+
+                # recovery only replays the last entry once a group is applied
+                with mock.patch.object(nexsroot, '_apply', apply):
+                    await nexsroot.recover()
+
+                self.eq(applied, [strt + 12])
+
+                # recovery replays the last group if it was not fully applied
+                with mock.patch.object(nexsroot.nexslog, 'setGroupDone', lambda: None):
+                    async with nexus1.nexslock:
+                        tasks = [nexus1.schedCoro(nexus1.doscopething({'specialpush': 0}, 'testval')) for _ in range(3)]
+                        while len(nexsroot._eatqueue) < 3:
+                            await asyncio.sleep(0)
+                    await asyncio.gather(*tasks)
+
+                self.eq(3, nexsroot.nexslog.getGroupSize())
+
+                applied.clear()
+                with mock.patch.object(nexsroot, '_apply', apply):
+                    await nexsroot.recover()
+
+                self.eq(applied, [strt + 13, strt + 14, strt + 15])
+
+            # the group size is committed with the log entries
+            async with await SampleNexus.anit(dirn, conf=conf) as nexus1:
+                self.eq(3, nexus1.nexsroot.nexslog.getGroupSize())
+
     async def test_nexus_fini(self):
 
         conf = {'nexslog:en': True}
@@ -153,9 +327,9 @@ class NexusTest(s_t_utils.SynTest):
             await cell.sync()
 
             orig_eat = cell.nexsroot._eat
-            async def func(item, indx=None):
+            async def func(self, entries):
                 await cell.fini()
-                await orig_eat(item, indx=indx)
+                await orig_eat(entries)
 
             with mock.patch('synapse.lib.nexus.NexsRoot._eat', func):
                 with self.assertRaises(s_exc.IsFini) as cm:
@@ -302,7 +476,8 @@ class NexusTest(s_t_utils.SynTest):
                     if item[1][1] == 'view:add':
                         viewadds += 1
 
-                self.eq(1, viewadds)
+                # the queued events were committed as a group and replayed on recovery
+                self.eq(11, viewadds)
                 self.len(vcnt + viewadds, core.views)
                 self.len(1, [v for v in core.views.values() if (await v.pack())['name'] == 'nextview'])
 
@@ -319,10 +494,11 @@ class NexusTest(s_t_utils.SynTest):
 
                     # This will get the lock and succeed
                     vdef = {'layers': (deflayr,), 'name': 'waitview'}
-                    core.schedCoro(core.addView(vdef))
+                    task = core.schedCoro(core.addView(vdef))
                     evnt.set()
 
-                await core.sync()
+                # queued events are applied by the group commit task so wait for ours
+                await asyncio.wait_for(task, timeout=10)
 
                 viewadds = []
                 async for item in core.nexsroot.nexslog.iter(strt):
@@ -501,6 +677,183 @@ class NexusTest(s_t_utils.SynTest):
                 self.eq(offs, nexsindx)
                 self.eq(item[1], 'sync')
 
+    async def test_nexus_iter_proxy_order(self):
+
+        async with self.getTestCell(conf={'nexslog:en': True}) as cell:
+
+            for _ in range(100):
+                await cell.sync()
+
+            async with cell.getLocalProxy() as prox:
+
+                for opts in ({'tellready': True}, {'tellready': True, 'batch': True}):
+
+                    # the yielded catch-up entries are sent before the realtime entries
+                    writing = True
+
+                    async def writer():
+                        while writing:
+                            await cell.sync()
+
+                    task = cell.schedCoro(writer())
+
+                    offs = []
+                    async for item in prox.getNexusChanges(0, **opts):
+
+                        if item is None:
+                            continue
+
+                        items = item if opts.get('batch') else (item,)
+                        offs.extend(i[0] for i in items)
+
+                        if len(offs) >= 300:
+                            break
+
+                    writing = False
+                    await task
+
+                    self.eq(offs, list(range(len(offs))))
+
+    async def test_nexus_iter_batch(self):
+
+        async with self.getTestCell(conf={'nexslog:en': True}) as cell:
+
+            for _ in range(5):
+                await cell.sync()
+
+            batches = [b async for b in cell.getNexusChanges(0, wait=False, batch=True)]
+            self.len(1, batches)
+            self.eq([0, 1, 2, 3, 4], [i[0] for i in batches[0]])
+
+            with mock.patch('synapse.lib.nexus.BATCH_MAXSIZE', 2):
+                batches = [b async for b in cell.getNexusChanges(1, wait=False, batch=True)]
+                self.eq([[1, 2], [3, 4]], [[i[0] for i in b] for b in batches])
+
+            async with cell.getLocalProxy() as prox:
+
+                q = asyncio.Queue()
+
+                async def listen():
+                    async for batch in prox.getNexusChanges(5, tellready=True, batch=True):
+                        await q.put(batch)
+
+                task = cell.schedCoro(listen())
+
+                self.none(await asyncio.wait_for(q.get(), timeout=5))
+
+                # wait for the realtime window to be in place
+                while not cell.nexsroot._linkmirrors:
+                    await asyncio.sleep(0.01)
+
+                # events committed as a group are sent in a single batch
+                async with cell.nexslock:
+                    tasks = [cell.schedCoro(cell.sync()) for _ in range(4)]
+                    while len(cell.nexsroot._eatqueue) < 4:
+                        await asyncio.sleep(0)
+
+                await asyncio.gather(*tasks)
+
+                batch = await asyncio.wait_for(q.get(), timeout=5)
+                self.eq([5, 6, 7, 8], [i[0] for i in batch])
+                self.eq('sync', batch[0][1][1])
+
+                # batches are split when they exceed the max size in bytes
+                with mock.patch('synapse.lib.nexus.BATCH_MAXBYTES', 1):
+
+                    async with cell.nexslock:
+                        tasks = [cell.schedCoro(cell.sync()) for _ in range(2)]
+                        while len(cell.nexsroot._eatqueue) < 2:
+                            await asyncio.sleep(0)
+
+                    await asyncio.gather(*tasks)
+
+                    self.eq([9], [i[0] for i in await asyncio.wait_for(q.get(), timeout=5)])
+                    self.eq([10], [i[0] for i in await asyncio.wait_for(q.get(), timeout=5)])
+
+                task.cancel()
+
+    async def test_nexus_mirror_batch(self):
+
+        with self.getTestDir() as dirn:
+
+            s_common.yamlsave({'nexslog:en': True}, dirn, 'cell.yaml')
+            async with await s_cell.Cell.anit(dirn=dirn) as cell00:
+
+                await cell00.runBackup(name='cell01')
+
+                path = s_common.genpath(dirn, 'backups', 'cell01')
+
+                conf = s_common.yamlload(path, 'cell.yaml')
+                conf['mirror'] = f'cell://{dirn}'
+                s_common.yamlsave(conf, path, 'cell.yaml')
+
+                for _ in range(10):
+                    await cell00.sync()
+
+                sizes = []
+                orig = s_nexus.NexsRoot._eatMirrorBatch
+                async def eatMirrorBatch(self, items):
+                    sizes.append(len(items))
+                    return await orig(self, items)
+
+                with mock.patch('synapse.lib.nexus.NexsRoot._eatMirrorBatch', eatMirrorBatch):
+
+                    async with await s_cell.Cell.anit(dirn=path) as cell01:
+
+                        await cell01.sync()
+
+                        # the missed entries are applied as a single batch
+                        self.ge(sizes[0], 10)
+
+                        await asyncio.gather(*[cell00.sync() for _ in range(20)])
+                        await cell01.sync()
+
+                        self.eq(await cell00.getNexsIndx(), await cell01.getNexsIndx())
+
+                        items00 = [i async for i in cell00.getNexusChanges(0, wait=False)]
+                        items01 = [i async for i in cell01.getNexusChanges(0, wait=False)]
+                        self.eq(items00, items01)
+
+                        # concurrent writes on the leader arrive in batches
+                        self.true(any(size > 1 for size in sizes[1:]))
+
+    async def test_nexus_mirror_batch_newkid(self):
+
+        with self.getTestDir() as dirn:
+
+            s_common.yamlsave({'nexslog:en': True}, dirn, 'cell.yaml')
+            async with await SampleKidCell.anit(dirn=dirn) as cell00:
+
+                await cell00.runBackup(name='cell01')
+
+                path = s_common.genpath(dirn, 'backups', 'cell01')
+
+                conf = s_common.yamlload(path, 'cell.yaml')
+                conf['mirror'] = f'cell://{dirn}'
+                s_common.yamlsave(conf, path, 'cell.yaml')
+
+                # the kid is created by an entry in the same batch as the entries which target it
+                kid = await cell00.addKid('kid00')
+                await kid.setValu(10)
+                await kid.setValu(20)
+
+                sizes = []
+                orig = s_nexus.NexsRoot._eatMirrorBatch
+                async def eatMirrorBatch(self, items):
+                    sizes.append(len(items))
+                    return await orig(self, items)
+
+                with mock.patch('synapse.lib.nexus.NexsRoot._eatMirrorBatch', eatMirrorBatch):
+
+                    async with await SampleKidCell.anit(dirn=path) as cell01:
+
+                        await cell01.sync()
+
+                        self.ge(sizes[0], 3)
+                        self.false(cell01.nexsroot.isfini)
+                        self.eq(await cell00.getNexsIndx(), await cell01.getNexsIndx())
+                        self.eq(20, cell01.kids['kid00'].valu)
+
     async def test_nexus_mirror_nowait(self):
 
         with self.getTestDir() as dirn:
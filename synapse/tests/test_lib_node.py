@@ -300,10 +300,10 @@ class NodeTest(s_t_utils.SynTest):
                     # Ensure the path nodes are independent
                     self.eq(len(pcln.nodes), len(path.nodes))
                     pcln.nodes.pop(-1)
-                    self.ne(len(pcln.nodes), len(path.nodes))
+                    self.eq(len(pcln.nodes), len(path.nodes))
                     # Ensure the link elements are independent
                     pcln.links.append({'type': 'edge', 'verb': 'seen'})
-                    self.len(3, pcln.links)
+                    self.len(2, pcln.links)
                     self.len(2, path.links)
 
                     # push a frame and clone it - ensure clone mods do not
@@ -464,6 +464,85 @@ class NodeTest(s_t_utils.SynTest):
             node.tagprops['foo.test'].pop('limit')
             self.eq(node.tagprops, {'foo.test': {}})
 
+    async def test_node_bylayer(self):
+
+        async with self.getTestCore() as core:
+
+            await core.addTagProp('score', ('int', {}), {})
+
+            layr = core.getLayer().iden
+            await core.nodes('[ test:str=foo :tick=2020 +#foo:score=10 ]')
+
+            view = await core.callStorm('return($lib.view.get().fork().iden)')
+            fork = core.getView(view).layers[0].iden
+
+            nodes = await core.nodes('test:str=foo [ +#bar ]', opts={'view': view})
+            node = nodes[0]
+
+            self.false(hasattr(node, '__dict__'))
+
+            nodes = await core.nodes('test:str=foo', opts={'view': view})
+            node = nodes[0]
+
+            # bylayer is only built when it is requested
+            self.none(node._bylayer)
+            self.eq(node.getByLayer(), {
+                'ndef': layr,
+                'props': {'.created': layr, 'tick': layr},
+                'tags': {'foo': layr, 'bar': fork},
+                'tagprops': {'foo': {'score': layr}},
+            })
+            self.nn(node._bylayer)
+
+            path = s_node.Path({}, [node])
+            self.false(hasattr(path, '__dict__'))
+
+    async def test_node_path_fork(self):
+
+        async with self.getTestCore() as core:
+
+            nodes = await core.nodes('[ test:int=1 test:int=2 test:int=3 ]')
+
+            root = s_node.Path({'foo': 'bar'}, [nodes[0]])
+            self.eq(root.nodes, [nodes[0]])
+            self.eq(root.links, [])
+            self.eq(root.getVar('node'), nodes[0])
+            self.eq(root.getVar('path'), root)
+
+            path1 = root.fork(nodes[1], {'type': 'prop', 'prop': 'hehe'})
+            path2 = path1.fork(nodes[2], None)
+
+            # forks share the parent history and vars until they are modified
+            self.true(path1.nodechain[0] is root.nodechain)
+            self.true(path2._vars is root._vars)
+
+            self.eq(path2.node, nodes[2])
+            self.eq(path2.nodes, nodes)
+            self.eq(path2.links, [(nodes[0].iden(), {'type': 'prop', 'prop': 'hehe'})])
+            self.eq((await path2.pack(path=True))['nodes'], [n.iden() for n in nodes])
+
+            await path1.setVar('foo', 'baz')
+            await path2.setVar('hehe', 'haha')
+            self.eq('bar', root.getVar('foo'))
+            self.eq('baz', path1.getVar('foo'))
+            self.eq('bar', path2.getVar('foo'))
+            self.eq(s_common.novalu, root.getVar('hehe'))
+            self.eq(s_common.novalu, path1.getVar('hehe'))
+
+            await root.popVar('foo')
+            self.eq(s_common.novalu, root.getVar('foo'))
+            self.eq('bar', path2.getVar('foo'))
+
+            path2.initframe(initvars={'x': 10})
+            clone = path2.clone()
+            path2.finiframe()
+            self.eq('haha', path2.getVar('hehe'))
+
+            self.eq(10, clone.getVar('x'))
+            self.eq(clone.nodes, nodes)
+            clone.finiframe()
+            self.eq('haha', clone.getVar('hehe'))
+
     async def test_node_edges(self):
 
         async with self.getTestCore() as core:
@@ -1,5 +1,7 @@
 
 
+import asyncio
+
 import synapse.lib.queue as s_queue
 
 import synapse.tests.utils as s_t_utils
@@ -35,3 +37,32 @@ class QueueTest(s_t_utils.SynTest):
         self.false(await wind.puts(('hehe', 'haha')))
 
         self.eq(('asdf', 'hehe', 'haha'), [x async for x in wind])
+
+    async def test_queue_window_slices(self):
+
+        wind = await s_queue.Window.anit()
+
+        await wind.puts((1, 2, 3, 4, 5))
+
+        genr = wind.slices(size=2)
+        self.eq([1, 2], await genr.__anext__())
+        self.eq([3, 4], await genr.__anext__())
+        self.eq([5], await genr.__anext__())
+
+        # wait for the slice to fill
+        async def putlater():
+            await asyncio.sleep(0.01)
+            await wind.puts((6, 7))
+
+        wind.schedCoro(putlater())
+
+        genr = wind.slices(size=2, timeout=5)
+        self.eq([6, 7], await asyncio.wait_for(genr.__anext__(), timeout=1))
+
+        await wind.put(8)
+        self.eq([8], await wind.slices(size=3, timeout=0.01).__anext__())
+
+        await wind.puts((9, 10))
+        await wind.fini()
+
+        self.eq([[9, 10]], [x async for x in wind.slices(size=3, timeout=5)])
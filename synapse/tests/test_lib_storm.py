@@ -15,6 +15,7 @@ import synapse.lib.base as s_base
 import synapse.lib.coro as s_coro
 import synapse.lib.json as s_json
 import synapse.lib.storm as s_storm
+import synapse.lib.parser as s_parser
 import synapse.lib.httpapi as s_httpapi
 import synapse.lib.msgpack as s_msgpack
 import synapse.lib.version as s_version
@@ -2565,6 +2566,104 @@ class StormTest(s_t_utils.SynTest):
             nodes = await core.nodes(q, opts={'vars': {'url': url}})
             self.len(2, nodes)
 
+    async def test_storm_profile(self):
+
+        async with self.getTestCore() as core:
+
+            await core.nodes('[ inet:fqdn=vertex.link ]')
+            await core.nodes('[ inet:fqdn=woot.com +#foo ]')
+            await core.nodes('[ inet:ipv4=1.2.3.4 :asn=10 ]')
+
+            msgs = await core.stormlist('inet:fqdn')
+            self.len(0, [m for m in msgs if m[0] == 'prof'])
+
+            q = 'inet:fqdn +#foo | limit 10 | { -> inet:fqdn:zone }'
+            msgs = await core.stormlist(q, opts={'profile': True})
+
+            kinds = [m[0] for m in msgs]
+            self.eq(['prof', 'fini'], kinds[-2:])
+
+            prof = msgs[-2][1]
+            self.ge(prof['took'], 0)
+
+            opers = {info['text']: info for info in prof['opers']}
+
+            # the form lift used the tag filter as a hint
+            lift = opers['inet:fqdn']
+            self.eq('LiftProp', lift['oper'])
+            self.eq(1, lift['runs'])
+            self.eq(0, lift['nodes:in'])
+            self.eq(1, lift['nodes:out'])
+            self.eq({'indx': 'bytag', 'hint': 'tag', 'tag': 'foo'}, lift['lift'])
+
+            filt = opers['+#foo']
+            self.eq(1, filt['nodes:in'])
+            self.eq(1, filt['nodes:out'])
+
+            limit = opers['limit 10']
+            self.eq('CmdOper', limit['oper'])
+            self.eq('limit', limit['cmd'])
+            self.eq(1, limit['nodes:out'])
+
+            # subquery operators are profiled for each run
+            pivot = opers['-> inet:fqdn:zone']
+            self.eq(1, pivot['runs'])
+            self.eq(1, pivot['nodes:in'])
+
+            for info in prof['opers']:
+                self.ge(info['took'], 0)
+
+            q = 'for $i in $lib.range(3) { inet:ipv4:asn=10 }'
+            msgs = await core.stormlist(q, opts={'profile': True})
+            prof = [m[1] for m in msgs if m[0] == 'prof'][0]
+            opers = {info['text']: info for info in prof['opers']}
+            self.eq(3, opers['inet:ipv4:asn=10']['runs'])
+            self.eq(3, opers['inet:ipv4:asn=10']['nodes:out'])
+            self.eq({'indx': 'byprop'}, opers['inet:ipv4:asn=10']['lift'])
+
+            # storm commands implemented in storm report into the same profile
+            await core.addStormPkg({
+                'name': 'foo',
+                'version': (0, 0, 1),
+                'commands': ({'name': 'foo.bar', 'storm': 'inet:fqdn=woot.com'},),
+            })
+            msgs = await core.stormlist('foo.bar', opts={'profile': True})
+            prof = [m[1] for m in msgs if m[0] == 'prof'][0]
+            opers = {info['text']: info for info in prof['opers']}
+            self.eq('foo.bar', opers['foo.bar']['cmd'])
+            self.eq(1, opers['inet:fqdn=woot.com']['nodes:out'])
+
+    async def test_storm_query_shared(self):
+
+        conf = {'storm:parse:cache:size': 50, 'storm:parse:cache:persist': False}
+        async with self.getTestCore(conf=conf) as core:
+
+            self.eq(50, s_parser.querycache.size)
+            self.eq(50, s_parser.evalcache.size)
+
+            # parsed queries are shared between runtimes rather than copied
+            query = await core.getStormQuery('inet:ipv4=1.2.3.4 | limit 1')
+            self.true(query is await s_parser.querycache.aget(('inet:ipv4=1.2.3.4 | limit 1', 'storm')))
+
+            core.querycache.clear()
+            self.true(query is await core.getStormQuery('inet:ipv4=1.2.3.4 | limit 1'))
+
+            astvalu = await core._getStormEval('($x + 1)')
+            self.true(astvalu is await core._getStormEval('($x + 1)'))
+            self.true(astvalu is await s_parser.evalcache.aget('($x + 1)'))
+
+            await core.nodes('[ inet:ipv4=1.2.3.4 inet:ipv4=5.6.7.8 ]')
+
+            async def run():
+                return await core.nodes('inet:ipv4=1.2.3.4 | limit 1')
+
+            results = await asyncio.gather(*[run() for _ in range(10)])
+            self.eq([1] * 10, [len(nodes) for nodes in results])
+
+            q = 'for $x in $lib.range(3) { $lib.print($lib.storm.eval("($x + 1)")) }'
+            msgs = await core.stormlist(q)
+            self.eq(['1', '2', '3'], [m[1]['mesg'] for m in msgs if m[0] == 'print'])
+
     async def test_storm_vars_fini(self):
 
         async with self.getTestCore() as core:
@@ -7,6 +7,78 @@ import synapse.tests.utils as s_test
 
 class LibStormTest(s_test.SynTest):
 
+    async def test_lib_stormlib_storm_explain(self):
+
+        async with self.getTestCore() as core:
+
+            await core.addTagProp('score', ('int', {}), {})
+
+            await core.nodes('[ inet:fqdn=vertex.link inet:fqdn=woot.com ]')
+            await core.nodes('inet:fqdn=woot.com [ +#foo:score=10 ]')
+            await core.nodes('[ test:arrayprop=* :ints=(1, 2, 3) ]')
+
+            info = await core.callStorm('return($lib.storm.explain("inet:fqdn +#foo | limit 10"))')
+            self.eq('inet:fqdn +#foo | limit 10', info['text'])
+            self.eq(['LiftProp', 'FiltOper', 'CmdOper'], [oper['oper'] for oper in info['opers']])
+
+            # the tag filter is used as a lift hint
+            lift = info['opers'][0]['lift']
+            self.eq('bytag', lift['indx'])
+            self.eq([('tag', {'name': 'foo'})], lift['hints'])
+            self.eq(1, lift['rows'])
+
+            info = await core.callStorm('return($lib.storm.explain("inet:fqdn:zone=woot.com"))')
+            self.eq({'indx': 'byprop', 'rows': 1}, info['opers'][0]['lift'])
+
+            # only lifts by constant values are estimated
+            opts = {'vars': {'fqdn': 'vertex.link'}}
+            info = await core.callStorm('return($lib.storm.explain("inet:fqdn=$fqdn"))', opts=opts)
+            self.eq({'indx': 'byprop'}, info['opers'][0]['lift'])
+
+            info = await core.callStorm('return($lib.storm.explain("test:arrayprop:ints*[=$x]"))')
+            self.eq({'indx': 'byarray'}, info['opers'][0]['lift'])
+
+            info = await core.callStorm('return($lib.storm.explain("#foo:score=$x"))')
+            self.eq({'indx': 'bytagprop'}, info['opers'][0]['lift'])
+
+            # functions in the query are not called
+            q = 'return($lib.storm.explain("inet:fqdn=$lib.queue.gen(explain).put(woot)"))'
+            info = await core.callStorm(q)
+            self.eq({'indx': 'byprop'}, info['opers'][0]['lift'])
+
+            q = 'return($lib.storm.explain("inet:fqdn +:zone=$lib.queue.gen(explain).put(woot)"))'
+            info = await core.callStorm(q)
+            self.eq({'indx': 'byprop'}, info['opers'][0]['lift'])
+
+            self.len(0, await core.callStorm('return($lib.queue.list())'))
+
+            info = await core.callStorm('return($lib.storm.explain("#foo:score=10"))')
+            self.eq({'indx': 'bytagprop', 'rows': 1}, info['opers'][0]['lift'])
+
+            info = await core.callStorm('return($lib.storm.explain("inet:fqdn#foo"))')
+            self.eq({'indx': 'bytag', 'rows': 1}, info['opers'][0]['lift'])
+
+            info = await core.callStorm('return($lib.storm.explain("test:arrayprop:ints*[=2]"))')
+            self.eq({'indx': 'byarray', 'rows': 1}, info['opers'][0]['lift'])
+
+            # lifts which depend on the inbound node are not estimated
+            q = 'return($lib.storm.explain("inet:fqdn | { inet:fqdn:zone=$node.value() }"))'
+            info = await core.callStorm(q)
+            self.eq({'indx': 'byprop', 'rows': 4}, info['opers'][0]['lift'])
+
+            subq = info['opers'][1]['queries'][0]
+            self.eq('inet:fqdn:zone=$node.value()', subq['text'])
+            self.eq({'indx': 'byprop'}, subq['opers'][0]['lift'])
+
+            # the query is not run
+            q = 'return($lib.storm.explain("[ inet:fqdn=newp.com ]"))'
+            info = await core.callStorm(q)
+            self.eq('EditNodeAdd', info['opers'][0]['oper'])
+            self.len(0, await core.nodes('inet:fqdn=newp.com'))
+
+            with self.raises(s_exc.BadSyntax):
+                await core.callStorm('return($lib.storm.explain("inet:fqdn=="))')
+
     async def test_lib_stormlib_storm_eval(self):
         async with self.getTestCore() as core:
 
@@ -1,6 +1,7 @@
 import os
 import ssl
 import sys
+import time
 import socket
 import asyncio
 import logging
@@ -19,6 +20,7 @@ import synapse.lib.cell as s_cell
 import synapse.lib.coro as s_coro
 import synapse.lib.link as s_link
 import synapse.lib.const as s_const
+import synapse.lib.msgpack as s_msgpack
 import synapse.lib.share as s_share
 import synapse.lib.certdir as s_certdir
 import synapse.lib.version as s_version
@@ -98,6 +100,10 @@ class Foo:
         yield 20
         yield 30
 
+    async def countgenr(self, n):
+        for i in range(n):
+            yield i
+
     def genrboom(self):
         yield 10
         yield 20
@@ -205,11 +211,9 @@ def run_telepath_sync_genr_break(url: str,
         msgs = list(prox.storm(q, opts={'show': ('node', 'nodeedits')}))
         assert len(msgs) == emesg, f'Got {len(msgs)} messages, expected {emesg}'
 
-        # Get the link from the pool, add the fini callback and put it back
+        # Get the link from the pool.
         # This involves reaching into the proxy internals to do so.
-        link = prox.links.popleft()
-        link.onfini(evt1.set)
-        prox.links.append(link)
+        link = prox.links[0]
 
         # Break from the generator right away, causing a
         # GeneratorExit in the GenrHelp object __iter__ method.
@@ -218,7 +222,16 @@ def run_telepath_sync_genr_break(url: str,
             break
         # Ensure the query did yield an object
         assert mesg is not None, 'mesg was not recieved!'
-        assert link.isfini is True, 'link.fini was not set to true'
+
+        # The remote generator is cancelled and the link is returned to the pool
+        for _ in range(100):
+            if link in prox.links:
+                break
+            time.sleep(0.1)
+
+        assert link in prox.links, 'link was not returned to the pool'
+        assert link.isfini is False, 'link.fini was set to true'
+        evt1.set()
 
         evt2.set()
         sys.exit(137)
@@ -347,6 +360,160 @@ class TeleTest(s_t_utils.SynTest):
                 async with await s_telepath.openurl(f'unix://root@{dirn}/sock:*', name=f'*/layer/{layr00.iden}') as layer:
                     self.eq(layr00.iden, await layer.getIden())
 
+    async def test_telepath_compress(self):
+
+        foo = Foo()
+
+        async with self.getTestDmon() as dmon:
+
+            dmon.share('foo', foo)
+            port = dmon.addr[1]
+
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo', port=port) as prox:
+                self.none(prox.link.zlevel)
+                self.eq(30, await prox.bar(10, 20))
+                self.none(dmon.sessions[prox.sess].zlib)
+
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo?compress=6&compressmin=10', port=port) as prox:
+
+                self.eq(6, prox.link.zlevel)
+                self.eq(10, prox.link.zminsize)
+                self.eq((6, 10), dmon.sessions[prox.sess].zlib)
+
+                sent = []
+                osend = s_link.Link._sendLocked
+
+                async def psend(link, byts):
+                    sent.append(byts)
+                    await osend(link, byts)
+
+                # pool links are compressed in both directions once the daemon has
+                # enabled compression in response to the first t2:init message
+                prox._links_min = 0
+                self.eq(30, await prox.bar(10, 20))
+
+                valu = 'V' * 100_000
+                with mock.patch('synapse.lib.link.Link._sendLocked', psend):
+                    self.eq(valu, await prox.echo(valu))
+                    self.eq([10, 20, 30], [x async for x in await prox.genr()])
+
+                self.len(2, [byts for byts in sent if s_msgpack.un(byts)[0] == s_link.ZLIB_MESG])
+                self.lt(max(len(byts) for byts in sent), 1000)
+
+                self.gt(len(prox.links), 0)
+                for link in prox.links:
+                    self.eq(6, link.zlevel)
+
+            # compressed frames are rejected before compression is negotiated
+            link = await s_link.connect('127.0.0.1', port)
+            link.setCompress(6, minsize=10)
+
+            with self.getLoggerStream('synapse.lib.link') as stream:
+                await link.tx(('tele:syn', {'vers': s_telepath.televers, 'name': 'foo', 'pad': 'V' * 1000}))
+                self.none(await link.rx())
+                await stream.expect('before compression was enabled')
+
+            await link.fini()
+
+            with self.raises(s_exc.BadUrl):
+                await s_telepath.openurl('tcp://127.0.0.1/foo?compress=newp', port=port)
+
+            with self.raises(s_exc.BadArg):
+                await s_telepath.openurl('tcp://127.0.0.1/foo?compress=42', port=port)
+
+    async def test_telepath_mux(self):
+
+        foo = Foo()
+
+        async with self.getTestDmon() as dmon:
+
+            dmon.share('foo', foo)
+            port = dmon.addr[1]
+
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo', port=port) as prox:
+                self.none(prox.mux)
+                self.none(prox.link.get('mux'))
+
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo?mux=1', port=port) as prox:
+
+                self.nn(prox.mux)
+                self.eq(s_link.MUX_WINDOW, prox.mux.window)
+
+                self.eq(30, await prox.bar(10, 20))
+
+                # large values are sent in chunks which are interleaved with other calls
+                valu = b'V' * (s_link.MUX_WINDOW * 3)
+                self.eq(valu, await prox.echo(valu))
+
+                self.eq([10, 20, 30], [x async for x in await prox.genr()])
+                self.eq(list(range(10_000)), [x async for x in prox.countgenr(10_000)])
+
+                with self.raises(s_exc.SynErr):
+                    await prox.raze()
+
+                # concurrent calls share a single connection
+                retn = await asyncio.gather(*[prox.corovalu(i, 1) for i in range(20)])
+                self.eq([i * 2 + 1 for i in range(20)], retn)
+
+                self.gt(len(prox.links), 0)
+                for link in prox.links:
+                    self.isinstance(link, s_link.MuxStream)
+
+                links = [link for link in dmon.links if isinstance(link, s_link.Link)]
+                self.len(1, [link for link in links if link.get('sess') is not None])
+
+                # a generator which exits early recovers its stream
+                putlinks = asyncio.Queue()
+                oput = prox._putPoolLink
+
+                async def putPoolLink(link):
+                    await oput(link)
+                    putlinks.put_nowait(link)
+
+                prox._putPoolLink = putPoolLink
+
+                genr = prox.countgenr(1_000_000)
+                async for i in genr:
+                    if i == 10:
+                        break
+                await genr.aclose()
+
+                link = await asyncio.wait_for(putlinks.get(), timeout=10)
+                self.false(link.isfini)
+                self.isin(link, prox.links)
+
+                # closing a stream closes the daemon side of the stream
+                dmux = [link for link in dmon.links if link.get('mux') is not None][0].get('mux')
+                dstrm = dmux.streams.get(link.iden)
+                self.nn(dstrm)
+
+                await link.fini()
+                self.true(await dstrm.waitfini(timeout=5))
+                self.notin(dstrm, dmon.links)
+
+                self.eq(30, await prox.bar(10, 20))
+
+            self.true(prox.mux.isfini)
+
+            with self.raises(s_exc.BadUrl):
+                await s_telepath.openurl('tcp://127.0.0.1/foo?mux=newp', port=port)
+
+            # servers which do not support multiplexing use pool links
+            onsyn = dmon._onTeleSyn
+
+            async def oldsyn(link, mesg):
+                mesg[1].pop('mux', None)
+                return await onsyn(link, mesg)
+
+            dmon.mesgfuncs['tele:syn'] = oldsyn
+
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo?mux=1', port=port) as prox:
+                self.none(prox.mux)
+                self.eq(30, await prox.bar(10, 20))
+                self.gt(len(prox.links), 0)
+                for link in prox.links:
+                    self.isinstance(link, s_link.Link)
+
     async def test_telepath_sync_genr(self):
 
         foo = Foo()
@@ -673,6 +840,122 @@ class TeleTest(s_t_utils.SynTest):
 
                 self.true(await asyncio.wait_for(foo.sleepg_evt.wait(), timeout=6))
 
+    async def test_telepath_genr_cancel(self):
+
+        foo = Foo()
+
+        async with self.getTestDmon() as dmon:
+
+            dmon.share('foo', foo)
+
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo', port=dmon.addr[1]) as prox:
+
+                self.true(prox.t2cancel)
+
+                putlinks = asyncio.Queue()
+                oput = prox._putPoolLink
+
+                async def putPoolLink(link):
+                    await oput(link)
+                    putlinks.put_nowait(link)
+
+                prox._putPoolLink = putPoolLink
+
+                # the remote generator is cancelled and in-flight yields are discarded
+                genr = prox.countgenr(1_000_000)
+                async for i in genr:
+                    if i == 10:
+                        break
+                await genr.aclose()
+
+                link = await asyncio.wait_for(putlinks.get(), timeout=10)
+                self.false(link.isfini)
+                self.isin(link, prox.links)
+
+                # the remote generator may have already completed
+                genr = prox.countgenr(3)
+                async for i in genr:
+                    await asyncio.sleep(0.1)
+                    break
+                await genr.aclose()
+
+                link = await asyncio.wait_for(putlinks.get(), timeout=10)
+                self.false(link.isfini)
+
+                # a generator which is waiting is cancelled
+                genr = prox.sleepg(t=60)
+                async for mesg in genr:
+                    break
+                await genr.aclose()
+
+                self.true(await asyncio.wait_for(foo.sleepg_evt.wait(), timeout=10))
+                link = await asyncio.wait_for(putlinks.get(), timeout=10)
+                self.false(link.isfini)
+
+                cancels = asyncio.Queue()
+                ocancel = prox._cancelPoolLink
+
+                async def cancelPoolLink(link):
+                    await ocancel(link)
+                    cancels.put_nowait(link)
+
+                prox._cancelPoolLink = cancelPoolLink
+
+                # the link is closed if the daemon does not acknowledge the cancel
+                async def nocancel(link, task):
+                    pass
+
+                with mock.patch.object(dmon, '_onTaskV2Cancel', nocancel):
+                    with mock.patch('synapse.telepath.LINK_CANCEL_TIMEOUT', 0.1):
+                        genr = prox.sleepg(t=60)
+                        async for mesg in genr:
+                            break
+                        await genr.aclose()
+
+                        link = await asyncio.wait_for(cancels.get(), timeout=10)
+                        self.true(link.isfini)
+                        self.notin(link, prox.links)
+
+                # the link is closed if its socket was handed to a spawned process
+                genr = prox.sleepg(t=60)
+                async for mesg in genr:
+                    break
+
+                for dlink in dmon.links:
+                    dlink.set('spawned', True)
+
+                await genr.aclose()
+
+                link = await asyncio.wait_for(cancels.get(), timeout=10)
+                self.true(link.isfini)
+                self.notin(link, prox.links)
+
+                for dlink in dmon.links:
+                    dlink.set('spawned', False)
+
+                # the recovered links are still usable
+                while not putlinks.empty():
+                    putlinks.get_nowait()
+
+                for _ in range(len(prox.links) + 1):
+                    self.eq(list(range(100)), [x async for x in prox.countgenr(100)])
+                    self.eq(30, await prox.bar(10, 20))
+
+            # links are not recovered from older servers
+            dmon.televers = (3, 0)
+            async with await s_telepath.openurl('tcp://127.0.0.1/foo', port=dmon.addr[1]) as prox:
+
+                self.false(prox.t2cancel)
+
+                genr = prox.countgenr(1_000_000)
+                async for i in genr:
+                    if i == 10:
+                        break
+                await genr.aclose()
+
+                # the link was closed
+                self.len(0, prox.alllinks)
+
     async def test_telepath_genriter_none_result(self):
 
         # If proxy.task() resolves to a plain None result for a genr call
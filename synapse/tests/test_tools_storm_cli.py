@@ -292,6 +292,15 @@ class StormCliTest(s_test.SynTest):
                 await s_t_storm.main(('--optsfile', optsfile, url, 'file:bytes'), outp=outp)
                 self.isin('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', str(outp))
 
+                s_common.yamlsave({'view': view, 'profile': True}, optsfile)
+
+                outp = s_output.OutPutStr()
+                await s_t_storm.main(('--optsfile', optsfile, url, 'file:bytes | limit 1'), outp=outp)
+                text = str(outp)
+                self.isin('profile:', text)
+                self.isin('file:bytes  (byprop)', text)
+                self.isin('limit 1', text)
+
     async def test_storm_tab_completion(self):
         class DummyStorm:
             def __init__(self, core):
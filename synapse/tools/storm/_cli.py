@@ -593,6 +593,17 @@ class StormCli(s_cli.Cli):
                 pers = float(count) / float(took / 1000)
                 self.printf('complete. %d nodes in %d ms (%d/sec).' % (count, took, pers))
 
+            elif mtyp == 'prof':
+                self.printf(f'profile: {mesg[1].get("took"):.3f} ms')
+                self.printf(f'{"took (ms)":>12} {"runs":>6} {"in":>8} {"out":>8}  operator')
+                for info in mesg[1].get('opers', ()):
+                    text = info.get('text')
+                    lift = info.get('lift')
+                    if lift is not None:
+                        text = f'{text}  ({lift.get("indx")})'
+                    self.printf(f'{info.get("took"):>12.3f} {info.get("runs"):>6} {info.get("nodes:in"):>8} '
+                                f'{info.get("nodes:out"):>8}  {text}')
+
             elif mtyp == 'print':
                 self.printf(mesg[1].get('mesg'))
 